@@ -0,0 +1,42 @@
+"""Add the geocode_cache table
+
+Persistent store behind the in-memory geocoding cache. The app creates
+missing tables itself on startup (Base.metadata.create_all), so an existing
+table is skipped.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # No database to inspect when only emitting SQL (--sql)
+    if not op.get_context().as_sql and sa.inspect(op.get_bind()).has_table("geocode_cache"):
+        return
+    op.create_table(
+        "geocode_cache",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("address_key", sa.String(255), nullable=False),
+        sa.Column("place_id", sa.String(100), nullable=True),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+        sa.Column("formatted_address", sa.String(255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_geocode_cache_id", "geocode_cache", ["id"])
+    op.create_index("ix_geocode_cache_address_key", "geocode_cache", ["address_key"], unique=True)
+    op.create_index("ix_geocode_cache_place_id", "geocode_cache", ["place_id"])
+
+
+def downgrade():
+    op.drop_table("geocode_cache")
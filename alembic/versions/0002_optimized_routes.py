@@ -0,0 +1,50 @@
+"""Add the optimized_routes table and store route polylines as text
+
+Brings databases created before these model changes up to date. The app
+creates missing tables itself on startup (Base.metadata.create_all) but
+does not alter existing ones; a table that already exists is skipped.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # No database to inspect when only emitting SQL (--sql)
+    inspector = None if op.get_context().as_sql else sa.inspect(op.get_bind())
+
+    if inspector is None or inspector.has_table("routes"):
+        # Encoded polylines outgrow the old String(1000)
+        with op.batch_alter_table("routes") as batch:
+            batch.alter_column("optimized_route", type_=sa.Text(), existing_type=sa.String(1000), existing_nullable=True)
+
+    if inspector is None or not inspector.has_table("optimized_routes"):
+        op.create_table(
+            "optimized_routes",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("mission_id", sa.Integer(), sa.ForeignKey("missions.id"), nullable=False),
+            sa.Column("stop_set_hash", sa.String(64), nullable=False),
+            sa.Column("stop_order", sa.JSON(), nullable=False),
+            sa.Column("encoded_polyline", sa.Text(), nullable=False),
+            sa.Column("distance", sa.Float(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_optimized_routes_id", "optimized_routes", ["id"])
+        op.create_index("ix_optimized_routes_mission_id_stop_set_hash", "optimized_routes",
+                        ["mission_id", "stop_set_hash"], unique=True)
+
+
+def downgrade():
+    op.drop_table("optimized_routes")
+    with op.batch_alter_table("routes") as batch:
+        batch.alter_column("optimized_route", type_=sa.String(1000), existing_type=sa.Text(), existing_nullable=True)
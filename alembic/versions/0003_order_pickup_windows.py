@@ -0,0 +1,44 @@
+"""Add order pickup windows
+
+Brings databases created before these model changes up to date. The app
+creates missing tables itself on startup (Base.metadata.create_all) but
+does not alter existing ones; columns that already exist are skipped.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+NEW_COLUMNS = [
+    sa.Column("window_start", sa.DateTime(), nullable=True),
+    sa.Column("window_end", sa.DateTime(), nullable=True),
+    sa.Column("service_time_minutes", sa.Float(), nullable=True),
+]
+
+
+def upgrade():
+    # No database to inspect when only emitting SQL (--sql)
+    inspector = None if op.get_context().as_sql else sa.inspect(op.get_bind())
+    if inspector is not None and not inspector.has_table("orders"):
+        return
+    existing = set() if inspector is None else {column["name"] for column in inspector.get_columns("orders")}
+    missing = [column for column in NEW_COLUMNS if column.name not in existing]
+    if missing:
+        with op.batch_alter_table("orders") as batch:
+            for column in missing:
+                batch.add_column(column.copy())
+
+
+def downgrade():
+    with op.batch_alter_table("orders") as batch:
+        for column in reversed(NEW_COLUMNS):
+            batch.drop_column(column.name)
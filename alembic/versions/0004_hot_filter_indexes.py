@@ -0,0 +1,66 @@
+"""Composite indexes for the filtered and keyset-paginated queries
+
+Mirrors the __table_args__ indexes on the models. Indexes that create_all
+already built (databases created after this change) are skipped.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("orders", "ix_orders_created_at_id", ["created_at", "id"]),
+    ("orders", "ix_orders_status", ["status"]),
+    ("orders", "ix_orders_customer_id_created_at", ["customer_id", "created_at"]),
+    ("orders", "ix_orders_mission_id_status", ["mission_id", "status"]),
+    ("order_items", "ix_order_items_order_id", ["order_id"]),
+    ("notifications", "ix_notifications_recipient_id_created_at_id", ["recipient_id", "created_at", "id"]),
+    ("notifications", "ix_notifications_recipient_id_is_read_created_at", ["recipient_id", "is_read", "created_at"]),
+    ("audit_logs", "ix_audit_logs_timestamp_id", ["timestamp", "id"]),
+    ("audit_logs", "ix_audit_logs_user_id_timestamp", ["user_id", "timestamp"]),
+    ("audit_logs", "ix_audit_logs_action_timestamp", ["action", "timestamp"]),
+    ("mission_assignment_logs", "ix_mission_assignment_logs_timestamp_id", ["timestamp", "id"]),
+    ("mission_assignment_logs", "ix_mission_assignment_logs_driver_id_timestamp", ["driver_id", "timestamp"]),
+    ("mission_assignment_logs", "ix_mission_assignment_logs_mission_id_timestamp", ["mission_id", "timestamp"]),
+    ("users", "ix_users_created_at_id", ["created_at", "id"]),
+    ("users", "ix_users_role_created_at", ["role", "created_at"]),
+    ("items", "ix_items_created_at_id", ["created_at", "id"]),
+    ("items", "ix_items_type", ["type"]),
+    ("missions", "ix_missions_created_at_id", ["created_at", "id"]),
+    ("routes", "ix_routes_mission_id", ["mission_id"]),
+]
+
+
+def _index_is(table: str, name: str, present: bool) -> bool:
+    """
+    Whether index `name` exists on `table` (present=True), or is missing from
+    an existing `table` (present=False). Always true when only emitting SQL
+    (--sql), since there is no database to inspect.
+    """
+    if op.get_context().as_sql:
+        return True
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return False
+    return (name in {index["name"] for index in inspector.get_indexes(table)}) == present
+
+
+def upgrade():
+    for table, name, columns in INDEXES:
+        if _index_is(table, name, present=False):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for table, name, _ in reversed(INDEXES):
+        if _index_is(table, name, present=True):
+            op.drop_index(name, table_name=table)
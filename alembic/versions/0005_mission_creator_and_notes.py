@@ -0,0 +1,43 @@
+"""Add the creator and notes of a mission
+
+Brings databases created before these model changes up to date. The app
+creates missing tables itself on startup (Base.metadata.create_all) but
+does not alter existing ones; columns that already exist are skipped.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+NEW_COLUMNS = [
+    sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id", name="fk_missions_created_by_users"), nullable=True),
+    sa.Column("notes", sa.Text(), nullable=True),
+]
+
+
+def upgrade():
+    # No database to inspect when only emitting SQL (--sql)
+    inspector = None if op.get_context().as_sql else sa.inspect(op.get_bind())
+    if inspector is not None and not inspector.has_table("missions"):
+        return
+    existing = set() if inspector is None else {column["name"] for column in inspector.get_columns("missions")}
+    missing = [column for column in NEW_COLUMNS if column.name not in existing]
+    if missing:
+        with op.batch_alter_table("missions") as batch:
+            for column in missing:
+                batch.add_column(column.copy())
+
+
+def downgrade():
+    with op.batch_alter_table("missions") as batch:
+        for column in reversed(NEW_COLUMNS):
+            batch.drop_column(column.name)
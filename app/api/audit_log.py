@@ -11,7 +11,9 @@ from app.services.audit_log import (
     clear_audit_logs
 )
 from app.schemas.audit_log import AuditLogResponse
-from app.utils.dependencies import get_db, get_current_user
+from app.utils.dependencies import get_db, get_current_user, get_page_params
+from app.utils.pagination import PageParams
+from app.schemas.common import CursorPage
 from app.models.user import User, UserRole
 
 audit_log_router = APIRouter(
@@ -25,11 +27,11 @@ def log_action(user_id: int, action: str, details: str, db: Session = Depends(ge
     return create_audit_log(db=db, user_id=user_id, action=action, details=details)
 
 # Get all audit logs (Admin only)
-@audit_log_router.get("/", response_model=List[AuditLogResponse])
-def list_all_audit_logs(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@audit_log_router.get("/", response_model=CursorPage[AuditLogResponse])
+def list_all_audit_logs(page: PageParams = Depends(get_page_params), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can view audit logs")
-    return get_all_audit_logs(db=db, current_user=current_user)
+    return get_all_audit_logs(db=db, current_user=current_user, page=page)
 
 # Get audit logs by user ID (Admin only)
 @audit_log_router.get("/user/{user_id}", response_model=List[AuditLogResponse])
@@ -10,7 +10,9 @@ from app.services.item import (
     get_items_by_type
 )
 from app.schemas.item import ItemCreate, ItemUpdate, ItemResponse
-from app.utils.dependencies import get_db, get_current_user
+from app.utils.dependencies import get_db, get_current_user, get_page_params
+from app.utils.pagination import PageParams
+from app.schemas.common import CursorPage
 from app.models.user import User
 
 item_router = APIRouter(
@@ -34,9 +36,9 @@ def delete_existing_item(item_id: int, db: Session = Depends(get_db), current_us
     return delete_item(db=db, item_id=item_id, current_user=current_user)
 
 # Get all items (Public)
-@item_router.get("/", response_model=List[ItemResponse])
-def list_all_items(db: Session = Depends(get_db)):
-    return get_all_items(db=db)
+@item_router.get("/", response_model=CursorPage[ItemResponse])
+def list_all_items(page: PageParams = Depends(get_page_params), db: Session = Depends(get_db)):
+    return get_all_items(db=db, page=page)
 
 # Get a specific item by ID (Public)
 @item_router.get("/{item_id}", response_model=ItemResponse)
@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.services.mission import (
     create_mission,
     update_mission,
     delete_mission,
     mark_order_as_done,
-    list_all_missions,
-    get_mission
+    list_all_missions_async,
+    get_mission_async
 )
 from app.schemas.mission import MissionCreate, MissionUpdate, MissionResponse
-from app.utils.dependencies import get_db, get_current_user
+from app.utils.dependencies import get_db, get_async_db, get_current_user, get_current_user_async, get_page_params
+from app.utils.pagination import PageParams
+from app.schemas.common import CursorPage
 from app.models.user import User, UserRole
 
 mission_router = APIRouter(
@@ -47,13 +50,13 @@ def mark_order_complete(mission_id: int, order_id: int, db: Session = Depends(ge
     return mark_order_as_done(db=db, mission_id=mission_id, order_id=order_id, driver_id=current_user.id)
 
 # List all missions (Admin/Moderator)
-@mission_router.get("/", response_model=List[MissionResponse])
-def list_missions(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@mission_router.get("/", response_model=CursorPage[MissionResponse])
+async def list_missions(page: PageParams = Depends(get_page_params), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
     if current_user.role not in [UserRole.ADMIN, UserRole.MODERATOR]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins or moderators can view all missions")
-    return list_all_missions(db=db, current_user=current_user)
+    return await list_all_missions_async(db=db, current_user=current_user, page=page)
 
 # Get a specific mission by ID (Admin/Moderator/Driver)
 @mission_router.get("/{mission_id}", response_model=MissionResponse)
-def get_mission_details(mission_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return get_mission(db=db, mission_id=mission_id, current_user=current_user)
+async def get_mission_details(mission_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    return await get_mission_async(db=db, mission_id=mission_id, current_user=current_user)
@@ -16,7 +16,9 @@ from app.schemas.mission_assignment_log import (
     MissionAssignmentResponse,
     MissionAssignmentDelete
 )
-from app.utils.dependencies import get_db, get_current_user
+from app.utils.dependencies import get_db, get_current_user, get_page_params
+from app.utils.pagination import PageParams
+from app.schemas.common import CursorPage
 from app.models.user import User, UserRole
 
 mission_assignment_log_router = APIRouter(
@@ -32,11 +34,11 @@ def create_new_assignment_log(log_data: MissionAssignmentCreate, db: Session = D
     return create_assignment_log(db=db, log_data=log_data, assigned_by=current_user.id)
 
 # Get all mission assignment logs (Admin only)
-@mission_assignment_log_router.get("/", response_model=List[MissionAssignmentResponse])
-def list_all_assignment_logs(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@mission_assignment_log_router.get("/", response_model=CursorPage[MissionAssignmentResponse])
+def list_all_assignment_logs(page: PageParams = Depends(get_page_params), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can view assignment logs")
-    return get_all_assignment_logs(db=db, current_user=current_user)
+    return get_all_assignment_logs(db=db, current_user=current_user, page=page)
 
 # Get assignment logs by driver ID (Admin only)
 @mission_assignment_log_router.get("/driver/{driver_id}", response_model=List[MissionAssignmentResponse])
@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.services.notification import (
     create_notification,
-    list_notifications,
-    list_unread_notifications,
+    list_notifications_async,
+    list_unread_notifications_async,
     mark_notification_read,
     mark_all_notifications_read,
     remove_notification
 )
 from app.schemas.notification import NotificationResponse
-from app.utils.dependencies import get_db, get_current_user
+from app.utils.dependencies import get_db, get_async_db, get_current_user, get_current_user_async, get_page_params
+from app.utils.pagination import PageParams
+from app.schemas.common import CursorPage
 from app.models.user import User
 
 notification_router = APIRouter(
@@ -24,14 +27,14 @@ def send_notification(recipient_id: int, message: str, db: Session = Depends(get
     return create_notification(db=db, recipient_id=recipient_id, message=message)
 
 # Get all notifications for the current user
-@notification_router.get("/", response_model=List[NotificationResponse])
-def get_all_user_notifications(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return list_notifications(db=db, user_id=current_user.id)
+@notification_router.get("/", response_model=CursorPage[NotificationResponse])
+async def get_all_user_notifications(page: PageParams = Depends(get_page_params), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    return await list_notifications_async(db=db, user_id=current_user.id, page=page)
 
 # Get unread notifications for the current user
 @notification_router.get("/unread", response_model=List[NotificationResponse])
-def get_unread_user_notifications(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return list_unread_notifications(db=db, user_id=current_user.id)
+async def get_unread_user_notifications(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    return await list_unread_notifications_async(db=db, user_id=current_user.id)
 
 # Mark a specific notification as read
 @notification_router.patch("/{notification_id}/read", status_code=status.HTTP_200_OK)
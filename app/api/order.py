@@ -1,17 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.services.order import (
     create_order,
     update_order,
     cancel_order,
-    list_all_orders,
-    get_order,
+    list_all_orders_async,
+    get_order_async,
     confirm_order_items
 )
 from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse
-from app.schemas.order_item import OrderItemUpdate
-from app.utils.dependencies import get_db, get_current_user
+from app.schemas.order_item import OrderItemConfirm
+from app.utils.dependencies import get_db, get_async_db, get_current_user, get_current_user_async, get_page_params
+from app.utils.pagination import PageParams
+from app.schemas.common import CursorPage
 from app.models.user import User, UserRole
 
 order_router = APIRouter(
@@ -41,20 +44,20 @@ def cancel_existing_order(order_id: int, db: Session = Depends(get_db), current_
     return cancel_order(db=db, order_id=order_id, customer_id=current_user.id)
 
 # Get all orders (Admin/Moderator)
-@order_router.get("/", response_model=List[OrderResponse])
-def list_orders(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@order_router.get("/", response_model=CursorPage[OrderResponse])
+async def list_orders(page: PageParams = Depends(get_page_params), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
     if current_user.role not in [UserRole.ADMIN, UserRole.MODERATOR]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins or moderators can view all orders")
-    return list_all_orders(db=db, current_user=current_user)
+    return await list_all_orders_async(db=db, current_user=current_user, page=page)
 
 # Get a specific order by ID (Admin/Moderator/Customer)
 @order_router.get("/{order_id}", response_model=OrderResponse)
-def get_order_details(order_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return get_order(db=db, order_id=order_id, current_user=current_user)
+async def get_order_details(order_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    return await get_order_async(db=db, order_id=order_id, current_user=current_user)
 
 # Driver: Confirm collected items in an order
 @order_router.post("/{order_id}/confirm", status_code=status.HTTP_200_OK)
-def confirm_collected_order_items(order_id: int, collected_items: List[OrderItemUpdate], db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def confirm_collected_order_items(order_id: int, collected_items: List[OrderItemConfirm], db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.DRIVER:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only drivers can confirm collected items")
     return confirm_order_items(db=db, order_id=order_id, collected_items=collected_items, current_user=current_user)
@@ -8,7 +8,7 @@ from app.services.order_item import (
     get_order_items,
     confirm_collected_items
 )
-from app.schemas.order_item import OrderItemCreate, OrderItemUpdate, OrderItemResponse
+from app.schemas.order_item import OrderItemCreate, OrderItemUpdate, OrderItemConfirm, OrderItemResponse
 from app.utils.dependencies import get_db, get_current_user
 from app.models.user import User, UserRole
 
@@ -39,7 +39,7 @@ def list_order_items(order_id: int, db: Session = Depends(get_db)):
 
 # Driver: Confirm collected items during mission completion
 @order_item_router.post("/confirm/{order_id}", status_code=status.HTTP_200_OK)
-def confirm_collected_order_items(order_id: int, collected_items: List[OrderItemUpdate], db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def confirm_collected_order_items(order_id: int, collected_items: List[OrderItemConfirm], db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     # Ensure only drivers can confirm collected items
     if current_user.role != UserRole.DRIVER:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only drivers can confirm collected items")
@@ -1,64 +1,178 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Header, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Union
+import asyncio
+import json
+import numpy as np
 from app.services.routing import (
     calculate_optimal_route,
     get_distance_between_coords,
-    generate_route_map,
+    get_distances_between_coords,
+    get_distance_batch,
+    generate_route_map_async,
     optimize_order_groups,
     get_distance_matrix,
+    compute_distance_matrix,
     create_route,
     get_optimized_route,
-    optimize_load
+    optimize_load,
+    plan_fleet_routes,
+    plan_multi_depot_routes,
+    geocode_addresses,
+    get_geocode_cache_stats,
+    get_geo_client_stats,
+    get_matrix_cache_stats,
+    get_nearby_orders,
+    get_nearest_orders,
+    submit_optimization_job,
+    get_optimization_job,
+    cancel_optimization_job
 )
-from app.schemas.route import RouteCreate, RouteResponse
+from app.schemas.route import (
+    RouteCreate,
+    RouteResponse,
+    FleetRouteRequest,
+    MultiDepotRouteRequest,
+    FleetRoutingMode,
+    DistanceMethod,
+    DistanceBatchRequest,
+    DistanceBatchResponse,
+    LoadOptimizationMode,
+    OrderGroupingStrategy,
+    NearbyOrderResponse,
+    OptimizationJobCreate,
+    OptimizationJobResponse
+)
+from app.schemas.order import OrderStatus
 from app.utils.dependencies import get_db
 from app.models.user import User
+from app.utils.job_queue import FINISHED_JOB_STATUSES
+from app.utils.matrix_stream import (
+    BINARY_MATRIX_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    preferred_matrix_format,
+    as_little_endian_float32,
+    iter_matrix_bytes,
+    iter_matrix_ndjson
+)
+
+# Seconds between status checks while streaming a job
+JOB_STREAM_INTERVAL_SECONDS = 0.5
+
+# Bounds of the solver time budget accepted by the routing endpoints ("fast" ~50 ms, "thorough" ~5 s)
+MIN_SOLVER_TIME_MS = 10
+MAX_SOLVER_TIME_MS = 60000
 
 routing_router = APIRouter(
     prefix="/routes",
     tags=["Routes"]
 )
 
+# Report solver statistics in X-Solver-* response headers
+def set_solver_headers(response: Response, stats: Optional[dict]):
+    if not stats:
+        return
+    response.headers["X-Solver-Elapsed-Ms"] = f"{stats['elapsed_ms']:.1f}"
+    response.headers["X-Solver-Iterations"] = str(stats["iterations"])
+    response.headers["X-Solver-Timed-Out"] = str(stats["timed_out"]).lower()
+    response.headers["X-Solver-Objective"] = f"{stats['objective']:.6g}"
+    response.headers["X-Solver-Bound"] = f"{stats['bound']:.6g}"
+    response.headers["X-Solver-Gap"] = f"{stats['gap']:.4f}"
+
 # Calculate optimal route between locations
 @routing_router.post("/optimize", response_model=List[int])
-def calculate_route(locations: List[Tuple[float, float]]):
+def calculate_route(locations: List[Tuple[float, float]], response: Response,
+                    time_limit_ms: Optional[int] = Query(None, ge=MIN_SOLVER_TIME_MS, le=MAX_SOLVER_TIME_MS)):
     try:
-        return calculate_optimal_route(locations)
+        stats = {}
+        route = calculate_optimal_route(locations, time_limit_ms=time_limit_ms, stats=stats)
+        set_solver_headers(response, stats)
+        return route
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
-# Get the distance between two coordinates
-@routing_router.get("/distance", response_model=float)
-def get_distance(start: Tuple[float, float], end: Tuple[float, float]):
+# Get the distance between two coordinates, or between each of many (start, end) pairs
+@routing_router.get("/distance", response_model=Union[float, List[float]])
+def get_distance(start: Optional[Tuple[float, float]] = Body(None), end: Optional[Tuple[float, float]] = Body(None),
+                 pairs: Optional[List[Tuple[Tuple[float, float], Tuple[float, float]]]] = Body(None),
+                 method: DistanceMethod = DistanceMethod.GEODESIC):
+    if pairs is not None:
+        return get_distances_between_coords(pairs, method=method)
+    if start is None or end is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Provide start and end, or pairs")
     try:
-        return get_distance_between_coords(start, end)
+        return get_distance_between_coords(start, end, method=method)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+# Per-leg and total distance/duration for many pairs or a whole waypoint list in one round trip
+@routing_router.post("/distance/batch", response_model=DistanceBatchResponse)
+async def get_distance_batch_route(request: DistanceBatchRequest):
+    return await get_distance_batch(request)
+
 # Generate a route map URL using Google Maps API
+# Served on the event loop through the async geo client, so slow provider calls do not hold worker threads
 @routing_router.post("/map", response_model=dict)
-def create_route_map(start_coords: Tuple[float, float], end_coords: Tuple[float, float]):
-    try:
-        return generate_route_map(start_coords, end_coords)
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+async def create_route_map(start_coords: Tuple[float, float], end_coords: Tuple[float, float]):
+    return await generate_route_map_async(start_coords, end_coords)
 
 # Combine orders into optimal groups based on vehicle capacity
 @routing_router.post("/optimize-orders", response_model=List[List[Dict[str, float]]])
-def optimize_orders(orders: List[Dict[str, float]], max_capacity: float):
+def optimize_orders(orders: List[Dict[str, float]], max_capacity: float, response: Response,
+                    strategy: OrderGroupingStrategy = OrderGroupingStrategy.SEQUENTIAL,
+                    cell_size_km: Optional[float] = Query(None, gt=0),
+                    time_limit_ms: Optional[int] = Query(None, ge=MIN_SOLVER_TIME_MS, le=MAX_SOLVER_TIME_MS)):
     try:
-        return optimize_order_groups(orders, max_capacity)
+        stats = {}
+        groups = optimize_order_groups(orders, max_capacity, strategy=strategy, cell_size_km=cell_size_km,
+                                       time_limit_ms=time_limit_ms, stats=stats)
+        set_solver_headers(response, stats)
+        return groups
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+# Plan capacitated routes for the available fleet over all pending orders
+@routing_router.post("/optimize-orders/fleet", response_model=dict)
+def optimize_orders_for_fleet(request: FleetRouteRequest, response: Response,
+                              time_limit_ms: int = Query(1000, ge=MIN_SOLVER_TIME_MS, le=MAX_SOLVER_TIME_MS),
+                              mode: FleetRoutingMode = FleetRoutingMode.CAPACITY, db: Session = Depends(get_db)):
+    plan = plan_fleet_routes(db=db, request=request, time_limit_ms=time_limit_ms, mode=mode)
+    set_solver_headers(response, plan["stats"])
+    return plan
+
+# Split pending orders between several depots and plan each depot's routes in parallel
+@routing_router.post("/optimize-orders/multi-depot", response_model=dict)
+def optimize_orders_for_depots(request: MultiDepotRouteRequest,
+                               time_limit_ms: int = Query(1000, ge=MIN_SOLVER_TIME_MS, le=MAX_SOLVER_TIME_MS),
+                               db: Session = Depends(get_db)):
+    return plan_multi_depot_routes(db=db, request=request, time_limit_ms=time_limit_ms)
+
 # Generate the distance matrix for multiple locations
-@routing_router.post("/distance-matrix", response_model=List[List[float]])
-def generate_distance_matrix(locations: List[Tuple[float, float]]):
-    try:
-        return get_distance_matrix(locations)
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+# Clients can ask for a raw little-endian float32 buffer (Accept: application/octet-stream)
+# or for one JSON array per row (Accept: application/x-ndjson) instead of nested JSON lists
+@routing_router.post(
+    "/distance-matrix",
+    response_model=List[List[float]],
+    responses={200: {"content": {BINARY_MATRIX_MEDIA_TYPE: {}, NDJSON_MEDIA_TYPE: {}}}}
+)
+def generate_distance_matrix(locations: List[Tuple[float, float]], ellipsoidal: bool = False, road: bool = False,
+                             accept: Optional[str] = Header(None)):
+    matrix_format = preferred_matrix_format(accept)
+    if matrix_format == "json":
+        try:
+            return get_distance_matrix(locations, ellipsoidal=ellipsoidal, road=road)
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    shape = {"X-Matrix-Shape": f"{len(locations)},{len(locations)}"}
+    if matrix_format == "binary":
+        matrix = as_little_endian_float32(compute_distance_matrix(locations, ellipsoidal=ellipsoidal, road=road, dtype=np.float32))
+        headers = {**shape, "X-Matrix-Dtype": "float32-le", "Content-Length": str(matrix.nbytes)}
+        return StreamingResponse(iter_matrix_bytes(matrix), media_type=BINARY_MATRIX_MEDIA_TYPE, headers=headers)
+    matrix = compute_distance_matrix(locations, ellipsoidal=ellipsoidal, road=road)
+    return StreamingResponse(iter_matrix_ndjson(matrix), media_type=NDJSON_MEDIA_TYPE, headers=shape)
 
 # Create a new route for a mission
 @routing_router.post("/", response_model=RouteResponse, status_code=status.HTTP_201_CREATED)
@@ -67,13 +181,100 @@ def create_new_route(route_data: RouteCreate, db: Session = Depends(get_db)):
 
 # Get the optimized route for a mission
 @routing_router.post("/mission/{mission_id}/optimize", response_model=dict)
-def get_route_for_mission(mission_id: int, locations: List[Tuple[float, float]], db: Session = Depends(get_db)):
-    return get_optimized_route(db=db, mission_id=mission_id, locations=locations)
+def get_route_for_mission(mission_id: int, locations: List[Tuple[float, float]], response: Response,
+                          time_limit_ms: Optional[int] = Query(None, ge=MIN_SOLVER_TIME_MS, le=MAX_SOLVER_TIME_MS),
+                          include_matrix: bool = False, db: Session = Depends(get_db)):
+    result = get_optimized_route(db=db, mission_id=mission_id, locations=locations, time_limit_ms=time_limit_ms,
+                                 include_matrix=include_matrix)
+    set_solver_headers(response, result["stats"])
+    return result
 
 # Optimize load based on vehicle capacity
 @routing_router.post("/optimize-load", response_model=List[Dict[str, float]])
-def optimize_vehicle_load(items: List[Dict[str, float]], max_weight: float):
+def optimize_vehicle_load(items: List[Dict[str, float]], max_weight: float, response: Response,
+                          mode: LoadOptimizationMode = LoadOptimizationMode.AUTO,
+                          time_limit_ms: Optional[int] = Query(None, ge=MIN_SOLVER_TIME_MS, le=MAX_SOLVER_TIME_MS)):
     try:
-        return optimize_load(items, max_weight)
+        stats = {}
+        load = optimize_load(items, max_weight, mode=mode, time_limit_ms=time_limit_ms, stats=stats)
+        set_solver_headers(response, stats)
+        return load
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+# Geocode a batch of addresses (cached, duplicates resolved once)
+@routing_router.post("/geocode/batch", response_model=Dict[str, Optional[Tuple[float, float]]])
+def geocode_address_batch(addresses: List[str], db: Session = Depends(get_db)):
+    return geocode_addresses(db=db, addresses=addresses)
+
+# Geocoding cache statistics
+@routing_router.get("/geocode/cache-stats", response_model=dict)
+def geocode_cache_statistics():
+    return get_geocode_cache_stats()
+
+# Async geo client statistics (calls, retries, coalesced requests, breaker state)
+@routing_router.get("/geocode/client-stats", response_model=dict)
+def geo_client_statistics():
+    return get_geo_client_stats()
+
+# Distance matrix cache statistics
+@routing_router.get("/distance-matrix/cache-stats", response_model=dict)
+def distance_matrix_cache_statistics():
+    return get_matrix_cache_stats()
+
+# Open orders within a radius of a point, nearest first
+@routing_router.get("/orders/nearby", response_model=List[NearbyOrderResponse])
+def nearby_orders(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5.0, gt=0),
+    order_status: Optional[List[OrderStatus]] = Query(None, alias="status"),
+    limit: Optional[int] = Query(None, gt=0),
+    db: Session = Depends(get_db)
+):
+    return get_nearby_orders(db=db, latitude=latitude, longitude=longitude, radius_km=radius_km,
+                             statuses=order_status, limit=limit)
+
+# The k open orders closest to a point
+@routing_router.get("/orders/nearest", response_model=List[NearbyOrderResponse])
+def nearest_orders(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, gt=0, le=1000),
+    order_status: Optional[List[OrderStatus]] = Query(None, alias="status"),
+    db: Session = Depends(get_db)
+):
+    return get_nearest_orders(db=db, latitude=latitude, longitude=longitude, k=k, statuses=order_status)
+
+# Submit a routing or load problem to the background worker pool
+@routing_router.post("/jobs", response_model=OptimizationJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_optimization_job(job_data: OptimizationJobCreate):
+    return submit_optimization_job(job_data)
+
+# Poll the status and result of an optimization job
+@routing_router.get("/jobs/{job_id}", response_model=OptimizationJobResponse)
+def read_optimization_job(job_id: str):
+    return get_optimization_job(job_id)
+
+# Stream status changes of an optimization job as server-sent events until it finishes
+@routing_router.get("/jobs/{job_id}/stream")
+async def stream_optimization_job(job_id: str):
+    get_optimization_job(job_id)
+
+    async def events():
+        last_status = None
+        while True:
+            job = get_optimization_job(job_id)
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield f"event: {last_status}\ndata: {json.dumps(jsonable_encoder(job))}\n\n"
+            if last_status in FINISHED_JOB_STATUSES:
+                break
+            await asyncio.sleep(JOB_STREAM_INTERVAL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+# Cancel an optimization job
+@routing_router.delete("/jobs/{job_id}", response_model=OptimizationJobResponse)
+def delete_optimization_job(job_id: str):
+    return cancel_optimization_job(job_id)
@@ -18,7 +18,9 @@ from app.schemas.user import (
     UserResponse,
     UserWithRoleCreate
 )
-from app.utils.dependencies import get_db, get_current_user
+from app.utils.dependencies import get_db, get_current_user, get_page_params
+from app.utils.pagination import PageParams
+from app.schemas.common import CursorPage
 from app.models.user import User, UserRole
 
 user_router = APIRouter(
@@ -52,9 +54,9 @@ def delete_existing_user(user_id: int, db: Session = Depends(get_db), current_us
     return delete_user(db=db, user_id=user_id, current_user=current_user)
 
 # List all users (Admin only)
-@user_router.get("/", response_model=List[UserResponse])
-def list_all_users(role: Optional[UserRole] = None, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    return list_users(db=db, role=role, current_user=current_user)
+@user_router.get("/", response_model=CursorPage[UserResponse])
+def list_all_users(role: Optional[UserRole] = None, page: PageParams = Depends(get_page_params), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    return list_users(db=db, role=role, current_user=current_user, page=page)
 
 # Get user details by ID (Admin/Moderator)
 @user_router.get("/{user_id}", response_model=UserResponse)
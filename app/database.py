@@ -8,6 +8,7 @@ sys.path.insert(0, backend_dir)
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.utils.config_loader import get_config
 from app.models.base import Base  # Use the unified Base
 
@@ -21,6 +22,9 @@ DB_NAME = get_config("DB_NAME", "tire_app")
 # Database URL for SQLAlchemy
 DATABASE_URL = f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Database URL for the async engine (e.g. sqlite+aiosqlite:///./tire_app.db for local tests)
+ASYNC_DATABASE_URL = get_config("ASYNC_DATABASE_URL", f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}")
+
 # Create the SQLAlchemy engine
 engine = create_engine(
     DATABASE_URL,
@@ -43,6 +47,35 @@ def get_db():
     finally:
         db.close()
 
+# The async engine is created on first use, so the async driver is only needed once an async route runs
+async_engine = None
+AsyncSessionLocal = None
+
+def get_async_engine():
+    global async_engine, AsyncSessionLocal
+    if async_engine is None:
+        options = {"pool_pre_ping": True}
+        if not ASYNC_DATABASE_URL.startswith("sqlite"):
+            options.update(pool_size=10, max_overflow=20, pool_recycle=3600)
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, **options)
+        # Objects stay readable after commit, since lazy refreshes cannot run outside the event loop
+        AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    return async_engine
+
+# Dependency to get an async database session
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Close the async connection pool (application shutdown)
+async def dispose_async_engine():
+    global async_engine, AsyncSessionLocal
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+        AsyncSessionLocal = None
+
 # Test the database connection
 def test_connection():
     try:
@@ -2,8 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
-from app.database import engine
+from app.database import engine, dispose_async_engine
 from app.utils.logger import log_info
+from app.utils.job_queue import optimization_jobs
+from app.utils.geo_client import geo_client
+from app.utils.query_counter import query_count_middleware
 import uvicorn
 import pkgutil
 import importlib
@@ -34,8 +37,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Response headers the browser UI reads (query count, solver statistics, matrix layout)
+    expose_headers=[
+        "X-Query-Count",
+        "X-Solver-Elapsed-Ms",
+        "X-Solver-Iterations",
+        "X-Solver-Timed-Out",
+        "X-Solver-Objective",
+        "X-Solver-Bound",
+        "X-Solver-Gap",
+        "X-Matrix-Shape",
+        "X-Matrix-Dtype",
+    ],
 )
 
+# SQL statements issued per request, reported in the X-Query-Count header
+app.middleware("http")(query_count_middleware)
+
 # Mounting static files
 app.mount("/static", StaticFiles(directory="./static"), name="static")
 
@@ -79,6 +97,9 @@ app.include_router(item_router, prefix="/api", tags=["Items"])
 @app.on_event("shutdown")
 async def shutdown_event():
     log_info("Shutting down the application...")
+    optimization_jobs.shutdown()
+    await geo_client.aclose()
+    await dispose_async_engine()
     print("Application shutdown complete.")
 
 if __name__ == "__main__":
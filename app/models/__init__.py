@@ -5,6 +5,7 @@ from app.models.user import User
 
 # Address and Location Models
 from app.models.address import Address
+from app.models.geocode_cache import GeocodeCacheEntry
 
 # Item and Order Models
 from app.models.item import Item
@@ -15,6 +16,7 @@ from app.models.order_item import OrderItem
 from app.models.vehicle import Vehicle
 from app.models.mission import Mission
 from app.models.route import Route
+from app.models.optimized_route import OptimizedRoute
 from app.models.mission_assignment_log import MissionAssignmentLog
 
 # Notification and Audit Log Models
@@ -25,12 +27,14 @@ __all__ = [
     "Base",
     "User",
     "Address",
+    "GeocodeCacheEntry",
     "Item",
     "Order",
     "OrderItem",
     "Vehicle",
     "Mission",
     "Route",
+    "OptimizedRoute",
     "MissionAssignmentLog",
     "Notification",
     "AuditLog"
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from datetime import datetime
+from app.models import Base
+
+class GeocodeCacheEntry(Base):
+    __tablename__ = "geocode_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    address_key = Column(String(255), unique=True, index=True, nullable=False)  # Normalized address string
+    place_id = Column(String(100), nullable=True, index=True)  # Unique identifier from Google Maps
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    formatted_address = Column(String(255), nullable=True)  # Address as returned by the provider
+    created_at = Column(DateTime, default=datetime.utcnow)  # When the provider was last asked
+
+    def __repr__(self):
+        return (f"<GeocodeCacheEntry(id={self.id}, address_key='{self.address_key}', "
+                f"latitude={self.latitude}, longitude={self.longitude})>")
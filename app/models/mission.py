@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Enum, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, Enum, ForeignKey, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -13,6 +13,9 @@ class MissionStatus(PyEnum):
 
 class Mission(Base):
     __tablename__ = "missions"
+    __table_args__ = (
+        Index("ix_missions_created_at_id", "created_at", "id"),  # Keyset pagination
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     driver_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -23,13 +26,16 @@ class Mission(Base):
     completed_at = Column(DateTime, nullable=True)
     distance = Column(Float, nullable=True)  # Total distance of the mission
     total_load = Column(Float, nullable=True)  # Total load to be carried in the mission
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)  # Admin/moderator who created the mission
+    notes = Column(Text, nullable=True)  # Instructions for the driver
 
     # Relationships
-    driver = relationship("User", back_populates="missions")  # Link to the assigned driver
+    driver = relationship("User", back_populates="missions", foreign_keys=[driver_id])  # Link to the assigned driver
     vehicle = relationship("Vehicle", back_populates="missions")  # Link to the vehicle used
     orders = relationship("Order", back_populates="mission", cascade="all, delete-orphan")  # Orders grouped in the mission
     assignment_logs = relationship("MissionAssignmentLog", back_populates="mission", cascade="all, delete-orphan")  # Log of mission assignments
-    routes = relationship("Route", back_populates="mission", cascade="all, delete-orphan")  # Optimized route for the mission
+    routes = relationship("Route", back_populates="mission", cascade="all, delete-orphan")  # Routes created for the mission
+    optimized_routes = relationship("OptimizedRoute", back_populates="mission", cascade="all, delete-orphan")  # Solver results by stop set
 
     def __repr__(self):
         return (f"<Mission(id={self.id}, driver_id={self.driver_id}, vehicle_id={self.vehicle_id}, "
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -13,6 +13,11 @@ class AssignmentStatus(PyEnum):
 
 class MissionAssignmentLog(Base):
     __tablename__ = "mission_assignment_logs"
+    __table_args__ = (
+        Index("ix_mission_assignment_logs_timestamp_id", "timestamp", "id"),  # Keyset pagination
+        Index("ix_mission_assignment_logs_driver_id_timestamp", "driver_id", "timestamp"),
+        Index("ix_mission_assignment_logs_mission_id_timestamp", "mission_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     mission_id = Column(Integer, ForeignKey("missions.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Enum, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, Enum, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -12,6 +12,10 @@ class NotificationType(PyEnum):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_recipient_id_created_at_id", "recipient_id", "created_at", "id"),  # A user's feed, keyset-paginated
+        Index("ix_notifications_recipient_id_is_read_created_at", "recipient_id", "is_read", "created_at"),  # Unread notifications
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     recipient_id = Column(Integer, ForeignKey("users.id"), nullable=False)
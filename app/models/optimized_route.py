@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, JSON, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.models import Base
+
+class OptimizedRoute(Base):
+    __tablename__ = "optimized_routes"
+    __table_args__ = (
+        Index("ix_optimized_routes_mission_id_stop_set_hash", "mission_id", "stop_set_hash", unique=True),  # One result per stop set
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    mission_id = Column(Integer, ForeignKey("missions.id"), nullable=False)
+    stop_set_hash = Column(String(64), nullable=False)  # SHA-256 of the stop set the route was optimized for
+    stop_order = Column(JSON, nullable=False)  # Visiting order as positions in the canonical stop list
+    encoded_polyline = Column(Text, nullable=False)  # Encoded polyline of the stops in visiting order
+    distance = Column(Float, nullable=False)  # Length of the route in kilometers
+    created_at = Column(DateTime, default=datetime.utcnow)  # When the route was optimized
+
+    # Relationships
+    mission = relationship("Mission", back_populates="optimized_routes")  # Link to the mission the route was optimized for
+
+    def __repr__(self):
+        return (f"<OptimizedRoute(id={self.id}, mission_id={self.mission_id}, "
+                f"stop_set_hash='{self.stop_set_hash}', distance={self.distance})>")
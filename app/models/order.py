@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Enum, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -14,6 +14,12 @@ class OrderStatus(PyEnum):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_created_at_id", "created_at", "id"),  # Keyset pagination
+        Index("ix_orders_status", "status"),  # Pending/assigned orders, in id order within a status
+        Index("ix_orders_customer_id_created_at", "customer_id", "created_at"),
+        Index("ix_orders_mission_id_status", "mission_id", "status"),  # Orders of a mission
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     customer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -23,6 +29,9 @@ class Order(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     notes = Column(Text, nullable=True)
+    window_start = Column(DateTime, nullable=True)  # Earliest pickup time agreed with the customer
+    window_end = Column(DateTime, nullable=True)  # Latest pickup time agreed with the customer
+    service_time_minutes = Column(Float, nullable=True)  # Expected time on site; a default is used when empty
 
     # Relationships
     customer = relationship("User", back_populates="orders")  # Customer placing the order
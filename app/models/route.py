@@ -1,17 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models import Base
 
 class Route(Base):
     __tablename__ = "routes"
+    __table_args__ = (
+        Index("ix_routes_mission_id", "mission_id"),  # Routes of a mission
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     mission_id = Column(Integer, ForeignKey("missions.id"), nullable=False)
     start_location = Column(String(255), nullable=False)  # Starting address or coordinates
     end_location = Column(String(255), nullable=False)    # Ending address or coordinates
     distance = Column(Float, nullable=False)  # Distance in kilometers or miles
-    optimized_route = Column(String(1000), nullable=True)  # JSON or serialized data of the route
+    optimized_route = Column(Text, nullable=True)  # Encoded polyline of the route
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
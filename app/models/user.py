@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Enum, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -13,6 +13,10 @@ class UserRole(PyEnum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),  # Keyset pagination
+        Index("ix_users_role_created_at", "role", "created_at"),  # Users filtered by role
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String(50), unique=True, nullable=False)
@@ -28,7 +32,7 @@ class User(Base):
     orders = relationship("Order", back_populates="customer", cascade="all, delete-orphan")
 
     # Relationships: Driver Role
-    missions = relationship("Mission", back_populates="driver", cascade="all, delete-orphan")
+    missions = relationship("Mission", back_populates="driver", foreign_keys="Mission.driver_id", cascade="all, delete-orphan")
     vehicles = relationship("Vehicle", back_populates="driver", cascade="all, delete-orphan")
     assignment_logs = relationship("MissionAssignmentLog", back_populates="driver", cascade="all, delete-orphan")
 
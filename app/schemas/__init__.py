@@ -14,6 +14,7 @@ from .audit_log import (
 
 from .common import (
     Pagination,
+    CursorPage,
     Coordinate,
     StatusResponse,
     DateRange,
@@ -56,6 +57,7 @@ from .notification import (
 from .order_item import (
     OrderItemCreate,
     OrderItemUpdate,
+    OrderItemConfirm,
     OrderItemResponse,
     OrderItemDelete
 )
@@ -72,7 +74,23 @@ from .route import (
     RouteCreate,
     RouteUpdate,
     RouteResponse,
-    RouteDelete
+    RouteDelete,
+    FleetRouteRequest,
+    DepotSpec,
+    MultiDepotRouteRequest,
+    FleetRoutingMode,
+    DistanceMethod,
+    DistanceSource,
+    DistanceBatchRequest,
+    DistanceLeg,
+    DistanceBatchResponse,
+    LoadOptimizationMode,
+    OrderGroupingStrategy,
+    NearbyOrderResponse,
+    OptimizationJobType,
+    OptimizationJobStatus,
+    OptimizationJobCreate,
+    OptimizationJobResponse
 )
 
 from .user import (
@@ -1,11 +1,19 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Generic, Optional, List, TypeVar
+
+T = TypeVar("T")
 
 # Pagination parameters
 class Pagination(BaseModel):
     page: int = 1
     size: int = 10
 
+# Keyset-paginated list; pass next_cursor back as ?cursor= for the following page
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None  # None on the last page
+    total: Optional[int] = None  # Only with ?include_total=true
+
 # Coordinate representation for geolocation
 class Coordinate(BaseModel):
     latitude: float
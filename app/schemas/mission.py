@@ -1,7 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+from sqlalchemy.orm import selectinload
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
+from app.models.mission import Mission
+from app.models.order import Order
+from app.utils.loaders import response_loaders
 
 # Enum for mission status
 class MissionStatus(str, Enum):
@@ -30,20 +34,31 @@ class MissionUpdate(BaseModel):
 # Schema for returning mission details
 class MissionResponse(BaseModel):
     id: int
-    driver_id: int
-    vehicle_id: int
+    driver_id: Optional[int]
+    vehicle_id: Optional[int]
     status: MissionStatus
-    distance: float
-    total_load: float
+    distance: Optional[float] = None
+    total_load: Optional[float] = None
     route_map_url: Optional[str]
     created_at: datetime
     completed_at: Optional[datetime]
-    notes: Optional[str]
+    notes: Optional[str] = None
     orders: List[int]
 
+    # The model holds Order objects; the response lists their ids
+    @field_validator("orders", mode="before")
+    @classmethod
+    def order_ids(cls, orders):
+        return [getattr(order, "id", order) for order in orders]
+
     class Config:
         from_attributes = True
 
+# Loader options for missions serialized as MissionResponse: only the ids of
+# the orders of a whole page, in one extra SELECT
+def mission_response_loaders() -> tuple:
+    return response_loaders(selectinload(Mission.orders).load_only(Order.id))
+
 # Schema for mission assignment (used when assigning a driver or vehicle)
 class MissionAssignment(BaseModel):
     mission_id: int
@@ -1,7 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import AliasPath, BaseModel, Field
+from sqlalchemy.orm import joinedload, selectinload
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.utils.loaders import response_loaders
 
 # Enum for order status
 class OrderStatus(str, Enum):
@@ -17,16 +21,22 @@ class OrderCreate(BaseModel):
     address_id: int = Field(..., example=1)
     notes: Optional[str] = Field(None, example="Handle with care")
     items: List[dict] = Field(..., example=[{"item_id": 1, "quantity": 2}])
+    window_start: Optional[datetime] = Field(None, example="2024-05-01T09:00:00")  # Pickup window
+    window_end: Optional[datetime] = Field(None, example="2024-05-01T12:00:00")
+    service_time_minutes: Optional[float] = Field(None, ge=0, example=15)
 
 # Schema for updating an existing order
 class OrderUpdate(BaseModel):
     status: Optional[OrderStatus] = Field(None, example="ASSIGNED")
     notes: Optional[str] = Field(None, example="New handling instructions")
+    window_start: Optional[datetime] = Field(None, example="2024-05-01T13:00:00")
+    window_end: Optional[datetime] = Field(None, example="2024-05-01T16:00:00")
+    service_time_minutes: Optional[float] = Field(None, ge=0, example=20)
 
 # Schema for an item within an order
 class OrderItemResponse(BaseModel):
     item_id: int
-    name: str
+    name: str = Field(validation_alias=AliasPath("item", "name"))  # From the catalog item
     quantity: int
     unit_price: float
     total_price: float
@@ -40,11 +50,19 @@ class OrderResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     notes: Optional[str]
-    items: List[OrderItemResponse]
+    window_start: Optional[datetime] = None
+    window_end: Optional[datetime] = None
+    service_time_minutes: Optional[float] = None
+    items: List[OrderItemResponse] = Field(validation_alias="order_items")
 
     class Config:
         from_attributes = True
 
+# Loader options for orders serialized as OrderResponse: the items of a whole
+# page with their catalog entries in one extra SELECT
+def order_response_loaders() -> tuple:
+    return response_loaders(selectinload(Order.order_items).joinedload(OrderItem.item))
+
 # Schema for deleting an order
 class OrderDelete(BaseModel):
     id: int
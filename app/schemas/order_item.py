@@ -14,6 +14,11 @@ class OrderItemUpdate(BaseModel):
     quantity: Optional[int] = Field(None, example=3)
     unit_price: Optional[float] = Field(None, example=45.0)
 
+# Schema for confirming the collected quantity of an order item
+class OrderItemConfirm(BaseModel):
+    id: int = Field(..., example=7)
+    quantity: int = Field(..., ge=0, example=4)
+
 # Schema for returning order item details
 class OrderItemResponse(BaseModel):
     id: int
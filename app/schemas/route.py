@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict, Any
 from datetime import datetime
+from enum import Enum
+from app.schemas.common import Coordinate
 
 # Schema for creating a new route
 class RouteCreate(BaseModel):
@@ -8,11 +10,11 @@ class RouteCreate(BaseModel):
     start_location: str = Field(..., example="24.7136, 46.6753")
     end_location: str = Field(..., example="21.4225, 39.8262")
     distance: float = Field(..., example=350.5)  # in kilometers
-    optimized_route: Optional[List[str]] = Field(None, example=["Location A", "Location B", "Location C"])
+    optimized_route: Optional[str] = Field(None, example="i{yuCug{{GuzOiyC")  # Encoded polyline
 
 # Schema for updating an existing route
 class RouteUpdate(BaseModel):
-    optimized_route: Optional[List[str]] = Field(None, example=["Location A", "Location B", "Location C", "Location D"])
+    optimized_route: Optional[str] = Field(None, example="i{yuCug{{GuzOiyC")  # Encoded polyline
     distance: Optional[float] = Field(None, example=400.0)
 
 # Schema for returning route details
@@ -22,7 +24,7 @@ class RouteResponse(BaseModel):
     start_location: str
     end_location: str
     distance: float
-    optimized_route: Optional[List[str]]
+    optimized_route: Optional[str]  # Encoded polyline of the route
     created_at: datetime
 
     class Config:
@@ -32,3 +34,137 @@ class RouteResponse(BaseModel):
 class RouteDelete(BaseModel):
     id: int
     message: str = Field(default="Route deleted successfully.")
+
+# Schema for planning vehicle routes over pending orders
+class FleetRouteRequest(BaseModel):
+    depot: Coordinate = Field(..., example={"latitude": 24.7136, "longitude": 46.6753})
+    vehicle_ids: Optional[List[int]] = Field(None, example=[1, 2, 3])  # Defaults to all available vehicles
+    departure_time: Optional[datetime] = Field(None, example="2024-05-01T08:00:00")  # Defaults to now (UTC)
+
+# A collection yard and the vehicles dispatched from it
+class DepotSpec(BaseModel):
+    location: Coordinate = Field(..., example={"latitude": 24.7136, "longitude": 46.6753})
+    vehicle_ids: List[int] = Field(..., min_length=1, example=[1, 2])
+
+# Schema for planning routes from several depots over all pending orders
+class MultiDepotRouteRequest(BaseModel):
+    depots: List[DepotSpec] = Field(..., min_length=1)
+    balance_tolerance: Optional[float] = Field(0.1, ge=0, example=0.1)  # Allowed load overshoot per depot; null disables balancing
+
+# Fleet routing modes: capacity only, or capacity plus pickup time windows
+class FleetRoutingMode(str, Enum):
+    CAPACITY = "capacity"
+    TIME_WINDOWS = "time_windows"
+
+# Distance formulas, from exact (geodesic) to fastest (equirectangular)
+class DistanceMethod(str, Enum):
+    GEODESIC = "geodesic"
+    VINCENTY = "vincenty"
+    HAVERSINE = "haversine"
+    EQUIRECTANGULAR = "equirectangular"
+
+# Where batch leg distances and durations come from
+class DistanceSource(str, Enum):
+    FORMULA = "formula"  # Distance formula, duration at the average driving speed
+    ROAD = "road"  # Local road network, or multi-waypoint directions requests
+
+# Schema for measuring many legs in one call: (start, end) pairs or an ordered waypoint list
+class DistanceBatchRequest(BaseModel):
+    pairs: Optional[List[Tuple[Tuple[float, float], Tuple[float, float]]]] = Field(
+        None, example=[[[24.7136, 46.6753], [24.7743, 46.7386]]])
+    waypoints: Optional[List[Tuple[float, float]]] = Field(
+        None, example=[[24.7136, 46.6753], [24.7743, 46.7386], [24.6877, 46.7219]])
+    method: DistanceMethod = DistanceMethod.HAVERSINE  # Formula source only
+    source: DistanceSource = DistanceSource.FORMULA
+
+# One measured leg
+class DistanceLeg(BaseModel):
+    start: Tuple[float, float]
+    end: Tuple[float, float]
+    distance_km: float = Field(..., example=9.4)
+    duration_minutes: float = Field(..., example=14.1)
+
+# Schema for returning per-leg and total distance and duration
+class DistanceBatchResponse(BaseModel):
+    legs: List[DistanceLeg]
+    total_distance_km: float = Field(..., example=18.2)
+    total_duration_minutes: float = Field(..., example=27.3)
+
+# Solver modes for vehicle load optimization
+class LoadOptimizationMode(str, Enum):
+    AUTO = "auto"
+    GREEDY = "greedy"
+    DP = "dp"
+    BNB = "bnb"
+
+# Bin-packing strategies for grouping orders into vehicle loads
+class OrderGroupingStrategy(str, Enum):
+    SEQUENTIAL = "sequential"
+    FIRST_FIT = "first_fit"
+    BEST_FIT = "best_fit"
+
+# Schema for an open order returned by the nearby/nearest queries
+class NearbyOrderResponse(BaseModel):
+    order_id: int = Field(..., example=42)
+    status: str = Field(..., example="PENDING")
+    latitude: float = Field(..., example=24.7136)
+    longitude: float = Field(..., example=46.6753)
+    distance_km: float = Field(..., example=1.8)
+
+# Problem types accepted by the optimization job queue
+class OptimizationJobType(str, Enum):
+    TOUR = "tour"
+    FLEET = "fleet"
+    LOAD = "load"
+    ORDER_GROUPS = "order_groups"
+
+# Lifecycle states of an optimization job
+class OptimizationJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+# Payload of a "tour" job: visit every location, starting from the first
+class TourJobPayload(BaseModel):
+    locations: List[Tuple[float, float]] = Field(..., example=[[24.7136, 46.6753], [24.7743, 46.7386], [24.6877, 46.7219]])
+    closed: bool = Field(False, example=False)
+
+# Payload of a "fleet" job: capacitated routes from the first location (the depot)
+class FleetJobPayload(BaseModel):
+    locations: List[Tuple[float, float]] = Field(..., example=[[24.7136, 46.6753], [24.7743, 46.7386], [24.6877, 46.7219]])
+    demands: List[float] = Field(..., example=[0, 12, 7])  # Depot demand is ignored
+    capacities: List[float] = Field(..., example=[60, 60])
+
+# Payload of a "load" job: choose items to maximize value within the weight limit
+class LoadJobPayload(BaseModel):
+    items: List[Dict[str, float]] = Field(..., example=[{"weight": 10, "value": 60}, {"weight": 20, "value": 100}])
+    max_weight: float = Field(..., example=25)
+    mode: LoadOptimizationMode = Field(LoadOptimizationMode.AUTO, example="auto")
+
+# Payload of an "order_groups" job: pack orders into vehicle loads
+class OrderGroupsJobPayload(BaseModel):
+    orders: List[Dict[str, float]] = Field(..., example=[{"id": 1, "weight": 20}, {"id": 2, "weight": 35}])
+    max_capacity: float = Field(..., example=50)
+    strategy: OrderGroupingStrategy = Field(OrderGroupingStrategy.BEST_FIT, example="best_fit")
+    cell_size_km: Optional[float] = Field(None, gt=0, example=5)
+
+# Schema for submitting an optimization job
+class OptimizationJobCreate(BaseModel):
+    type: OptimizationJobType = Field(..., example="tour")
+    payload: Dict[str, Any] = Field(..., example={"locations": [[24.7136, 46.6753], [24.7743, 46.7386]]})
+    time_limit_ms: int = Field(5000, ge=10, le=600000, example=5000)  # Solver time budget
+
+# Schema for returning the state (and result) of an optimization job
+class OptimizationJobResponse(BaseModel):
+    job_id: str
+    type: OptimizationJobType
+    status: OptimizationJobStatus
+    time_limit_ms: int
+    submitted_at: datetime
+    finished_at: Optional[datetime] = None
+    elapsed_ms: Optional[float] = None  # Solver time inside the worker
+    result: Optional[Any] = None
+    stats: Optional[Dict[str, Any]] = None  # Iterations, bound and optimality gap of the solver
+    error: Optional[str] = None
@@ -43,6 +43,8 @@ from .order import (
     cancel_order,
     list_all_orders,
     get_order,
+    list_all_orders_async,
+    get_order_async,
     confirm_order_items
 )
 
@@ -52,13 +54,17 @@ from .mission import (
     delete_mission,
     mark_order_as_done,
     list_all_missions,
-    get_mission
+    get_mission,
+    list_all_missions_async,
+    get_mission_async
 )
 
 from .notification import (
     create_notification,
     list_notifications,
     list_unread_notifications,
+    list_notifications_async,
+    list_unread_notifications_async,
     mark_notification_read,
     mark_all_notifications_read,
     remove_notification
@@ -85,12 +91,29 @@ from .audit_log import (
 from .routing import (
     calculate_optimal_route,
     get_distance_between_coords,
+    get_distances_between_coords,
+    get_distance_batch,
     generate_route_map,
+    generate_route_map_async,
+    get_geo_client_stats,
     optimize_order_groups,
     get_distance_matrix,
+    compute_distance_matrix,
     optimize_load,
     create_route,
-    get_optimized_route
+    get_optimized_route,
+    invalidate_mission_routes,
+    reoptimize_remaining_route,
+    plan_fleet_routes,
+    plan_multi_depot_routes,
+    geocode_addresses,
+    get_geocode_cache_stats,
+    get_matrix_cache_stats,
+    get_nearby_orders,
+    get_nearest_orders,
+    submit_optimization_job,
+    get_optimization_job,
+    cancel_optimization_job
 )
 
 from .mission_assignment_log import (
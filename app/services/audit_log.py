@@ -5,6 +5,7 @@ from datetime import datetime
 from app.models.audit_log import AuditLog
 from app.schemas.audit_log import AuditLogCreate, AuditLogResponse
 from app.utils.permission_checker import require_admin
+from app.utils.pagination import PageParams, paginate
 
 # Helper function to create an audit log entry
 def create_audit_log(db: Session, user_id: int, action: str, details: str) -> AuditLog:
@@ -23,12 +24,13 @@ def create_audit_log(db: Session, user_id: int, action: str, details: str) -> Au
         db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error creating audit log: {str(e)}")
 
-# Admin: Get all audit logs
-def get_all_audit_logs(db: Session, current_user) -> List[AuditLogResponse]:
+# Admin: Get all audit logs, newest first, one keyset page at a time
+def get_all_audit_logs(db: Session, current_user, page: Optional[PageParams] = None) -> dict:
     require_admin(current_user)
 
-    logs = db.query(AuditLog).order_by(AuditLog.timestamp.desc()).all()
-    if not logs:
+    page = page or PageParams()
+    logs = paginate(db.query(AuditLog), AuditLog.timestamp, AuditLog.id, page)
+    if not logs["items"] and page.after is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No audit logs found")
     return logs
 
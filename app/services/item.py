@@ -4,6 +4,7 @@ from typing import List, Optional
 from app.models.item import Item
 from app.schemas.item import ItemCreate, ItemUpdate, ItemResponse
 from app.utils.permission_checker import require_admin
+from app.utils.pagination import PageParams, paginate
 
 # Helper function to get an item by ID
 def get_item_by_id(db: Session, item_id: int) -> Item:
@@ -68,10 +69,9 @@ def delete_item(db: Session, item_id: int, current_user):
     db.commit()
     return {"message": "Item deleted successfully"}
 
-# Public: Get all items
-def get_all_items(db: Session) -> List[ItemResponse]:
-    items = db.query(Item).all()
-    return items
+# Public: Get all items, newest first, one keyset page at a time
+def get_all_items(db: Session, page: Optional[PageParams] = None) -> dict:
+    return paginate(db.query(Item), Item.created_at, Item.id, page or PageParams())
 
 # Public: Get item by ID
 def get_item(db: Session, item_id: int) -> ItemResponse:
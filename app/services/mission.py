@@ -1,18 +1,32 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from app.models.mission import Mission, MissionStatus
 from app.models.order import Order, OrderStatus
 from app.models.order_item import OrderItem
 from app.models.user import User
-from app.models.notification import Notification
-from app.schemas.mission import MissionCreate, MissionUpdate, MissionResponse
+from app.models.notification import Notification, NotificationType
+from app.schemas.mission import MissionCreate, MissionUpdate, MissionResponse, mission_response_loaders
 from app.utils.permission_checker import require_admin, require_moderator
+from app.utils.spatial_index import order_spatial_index
+from app.utils.pagination import PageParams, paginate, paginate_async
+from app.utils.logger import log_error, route_logger
+from app.services.routing import reoptimize_remaining_route
+
+# Helper function to get a mission by ID, with optional loader options
+def get_mission_by_id(db: Session, mission_id: int, options: tuple = ()) -> Mission:
+    mission = db.query(Mission).options(*options).filter(Mission.id == mission_id).first()
+    if not mission:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found")
+    return mission
 
-# Helper function to get a mission by ID
-def get_mission_by_id(db: Session, mission_id: int) -> Mission:
-    mission = db.query(Mission).filter(Mission.id == mission_id).first()
+# Async helper to get a mission by ID, loaded for MissionResponse up front (no lazy loads on an AsyncSession)
+async def get_mission_by_id_async(db: AsyncSession, mission_id: int) -> Mission:
+    result = await db.execute(select(Mission).options(*mission_response_loaders()).where(Mission.id == mission_id))
+    mission = result.scalar_one_or_none()
     if not mission:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found")
     return mission
@@ -27,6 +41,7 @@ def create_mission(db: Session, mission_data: MissionCreate, current_user) -> Mi
         status=MissionStatus.PLANNED,
         created_at=datetime.utcnow(),
         route_map_url=mission_data.route_map_url,
+        created_by=current_user.id,
         notes=mission_data.notes
     )
     db.add(new_mission)
@@ -37,7 +52,7 @@ def create_mission(db: Session, mission_data: MissionCreate, current_user) -> Mi
     notification = Notification(
         recipient_id=mission_data.driver_id,
         message=f"A new mission has been assigned to you by {current_user.username}.",
-        type="MISSION_ASSIGNMENT",
+        type=NotificationType.MISSION_UPDATE,
         created_at=datetime.utcnow()
     )
     db.add(notification)
@@ -88,6 +103,7 @@ def mark_order_as_done(db: Session, mission_id: int, order_id: int, driver_id: i
     # Mark the order as done
     order.status = OrderStatus.COMPLETED
     db.commit()
+    order_spatial_index.sync_order(order)
 
     # Check if all orders in the mission are done
     orders = db.query(Order).filter(Order.mission_id == mission_id).all()
@@ -97,27 +113,52 @@ def mark_order_as_done(db: Session, mission_id: int, order_id: int, driver_id: i
         mission.status = MissionStatus.COMPLETED
         db.commit()
 
-        # Notify the creator of the mission
-        notification = Notification(
-            recipient_id=mission.created_by,
-            message=f"Mission {mission_id} has been completed by driver {driver_id}.",
-            type="MISSION_COMPLETION",
-            created_at=datetime.utcnow()
-        )
-        db.add(notification)
-        db.commit()
-
-    return {"message": "Order marked as done"}
-
-# Get all missions (Admin/Moderator)
-def list_all_missions(db: Session, current_user) -> List[MissionResponse]:
+        # Notify the creator of the mission (unknown for missions created before it was recorded)
+        if mission.created_by is not None:
+            notification = Notification(
+                recipient_id=mission.created_by,
+                message=f"Mission {mission_id} has been completed by driver {driver_id}.",
+                type=NotificationType.MISSION_UPDATE,
+                created_at=datetime.utcnow()
+            )
+            db.add(notification)
+            db.commit()
+
+    # Re-plan the remaining stops starting from the one just completed, within a bounded solver budget.
+    # The completion is already committed, so a failed re-plan is logged and reported as no route
+    remaining_route = None
+    try:
+        remaining_route = reoptimize_remaining_route(db, mission_id, (order.address.latitude, order.address.longitude))
+    except Exception as e:
+        db.rollback()
+        log_error(f"Error re-planning mission {mission_id} after order {order_id}: {getattr(e, 'detail', str(e))}", route_logger)
+
+    return {"message": "Order marked as done", "remaining_route": remaining_route}
+
+# Get all missions, newest first, one keyset page at a time (Admin/Moderator)
+def list_all_missions(db: Session, current_user, page: Optional[PageParams] = None) -> dict:
     require_moderator(current_user)
-    missions = db.query(Mission).all()
-    return missions
+    return paginate(db.query(Mission).options(*mission_response_loaders()), Mission.created_at, Mission.id, page or PageParams())
 
 # Get mission by ID (Admin/Moderator/Driver)
 def get_mission(db: Session, mission_id: int, current_user) -> MissionResponse:
-    mission = get_mission_by_id(db, mission_id)
+    mission = get_mission_by_id(db, mission_id, mission_response_loaders())
+
+    # Check access permission
+    if current_user.role == "DRIVER" and mission.driver_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    return mission
+
+# Async variant of list_all_missions
+async def list_all_missions_async(db: AsyncSession, current_user, page: Optional[PageParams] = None) -> dict:
+    require_moderator(current_user)
+    statement = select(Mission).options(*mission_response_loaders())
+    return await paginate_async(db, statement, Mission.created_at, Mission.id, page or PageParams())
+
+# Async variant of get_mission
+async def get_mission_async(db: AsyncSession, mission_id: int, current_user) -> MissionResponse:
+    mission = await get_mission_by_id_async(db, mission_id)
 
     # Check access permission
     if current_user.role == "DRIVER" and mission.driver_id != current_user.id:
@@ -10,6 +10,7 @@ from app.schemas.mission_assignment_log import (
     MissionAssignmentDelete
 )
 from app.utils.permission_checker import require_admin
+from app.utils.pagination import PageParams, paginate
 
 # Helper function to create a mission assignment log entry
 def create_assignment_log(db: Session, log_data: MissionAssignmentCreate, assigned_by: int) -> MissionAssignmentLog:
@@ -30,12 +31,13 @@ def create_assignment_log(db: Session, log_data: MissionAssignmentCreate, assign
         db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error creating assignment log: {str(e)}")
 
-# Admin: Get all mission assignment logs
-def get_all_assignment_logs(db: Session, current_user) -> List[MissionAssignmentResponse]:
+# Admin: Get all mission assignment logs, newest first, one keyset page at a time
+def get_all_assignment_logs(db: Session, current_user, page: Optional[PageParams] = None) -> dict:
     require_admin(current_user)
 
-    logs = db.query(MissionAssignmentLog).order_by(MissionAssignmentLog.timestamp.desc()).all()
-    if not logs:
+    page = page or PageParams()
+    logs = paginate(db.query(MissionAssignmentLog), MissionAssignmentLog.timestamp, MissionAssignmentLog.id, page)
+    if not logs["items"] and page.after is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No mission assignment logs found")
     return logs
 
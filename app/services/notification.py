@@ -1,14 +1,18 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from typing import List, Optional
 from app.schemas.notification import NotificationResponse
+from app.utils.pagination import PageParams
 from app.utils.notification import (
     send_notification,
     get_unread_notifications,
     mark_notification_as_read,
     mark_all_as_read,
     delete_notification,
-    get_all_notifications
+    get_all_notifications,
+    get_all_notifications_async,
+    get_unread_notifications_async
 )
 
 # Send a notification (internal use)
@@ -19,11 +23,12 @@ def create_notification(db: Session, recipient_id: int, message: str, notificati
     except RuntimeError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
-# Get all notifications for a specific user
-def list_notifications(db: Session, user_id: int) -> List[NotificationResponse]:
+# Get notifications for a specific user, newest first, one keyset page at a time
+def list_notifications(db: Session, user_id: int, page: Optional[PageParams] = None) -> dict:
     try:
-        notifications = get_all_notifications(db, user_id)
-        if not notifications:
+        page = page or PageParams()
+        notifications = get_all_notifications(db, user_id, page)
+        if not notifications["items"] and page.after is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No notifications found")
         return notifications
     except RuntimeError as e:
@@ -39,6 +44,24 @@ def list_unread_notifications(db: Session, user_id: int) -> List[NotificationRes
     except RuntimeError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
+# Async variant of list_notifications
+async def list_notifications_async(db: AsyncSession, user_id: int, page: Optional[PageParams] = None) -> dict:
+    try:
+        page = page or PageParams()
+        notifications = await get_all_notifications_async(db, user_id, page)
+        if not notifications["items"] and page.after is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No notifications found")
+        return notifications
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+# Async variant of list_unread_notifications
+async def list_unread_notifications_async(db: AsyncSession, user_id: int) -> List[NotificationResponse]:
+    try:
+        return await get_unread_notifications_async(db, user_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
 # Mark a specific notification as read
 def mark_notification_read(db: Session, notification_id: int) -> dict:
     try:
@@ -1,32 +1,56 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from typing import List, Optional
 from app.models.order import Order, OrderStatus
-from app.models.order_item import OrderItem
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse
+from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, order_response_loaders
+from app.schemas.order_item import OrderItemConfirm
 from app.utils.permission_checker import require_admin, require_moderator
+from app.utils.spatial_index import order_spatial_index
+from app.utils.pagination import PageParams, paginate, paginate_async
+from app.services.routing import invalidate_mission_routes
+from app.services.order_item import apply_collected_quantities
 from datetime import datetime
 
-# Helper function to get an order by ID
-def get_order_by_id(db: Session, order_id: int) -> Order:
-    order = db.query(Order).filter(Order.id == order_id).first()
+# Helper function to get an order by ID, with optional loader options
+def get_order_by_id(db: Session, order_id: int, options: tuple = ()) -> Order:
+    order = db.query(Order).options(*options).filter(Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
     return order
 
+# Async helper to get an order by ID, loaded for OrderResponse up front (no lazy loads on an AsyncSession)
+async def get_order_by_id_async(db: AsyncSession, order_id: int) -> Order:
+    result = await db.execute(select(Order).options(*order_response_loaders()).where(Order.id == order_id))
+    order = result.scalar_one_or_none()
+    if not order:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    return order
+
+# Helper function to reject pickup windows that end before they start
+def validate_pickup_window(window_start: Optional[datetime], window_end: Optional[datetime]):
+    if window_start and window_end and window_end <= window_start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Pickup window must end after it starts")
+
 # Customer: Create a new order
 def create_order(db: Session, order_data: OrderCreate, customer_id: int) -> Order:
+    validate_pickup_window(order_data.window_start, order_data.window_end)
     new_order = Order(
         customer_id=customer_id,
         address_id=order_data.address_id,
         status=OrderStatus.PENDING,
         notes=order_data.notes,
+        window_start=order_data.window_start,
+        window_end=order_data.window_end,
+        service_time_minutes=order_data.service_time_minutes,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
     )
     db.add(new_order)
     db.commit()
     db.refresh(new_order)
+    order_spatial_index.sync_order(new_order)
     return new_order
 
 # Admin/Moderator: Update an existing order
@@ -40,10 +64,22 @@ def update_order(db: Session, order_id: int, order_data: OrderUpdate, current_us
         order.status = order_data.status
     if order_data.notes:
         order.notes = order_data.notes
+    if order_data.window_start:
+        order.window_start = order_data.window_start
+    if order_data.window_end:
+        order.window_end = order_data.window_end
+    if order_data.service_time_minutes is not None:
+        order.service_time_minutes = order_data.service_time_minutes
+    validate_pickup_window(order.window_start, order.window_end)
+
+    # The mission's stored route no longer matches its stops
+    if order_data.status:
+        invalidate_mission_routes(db, order.mission_id)
 
     order.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(order)
+    order_spatial_index.sync_order(order)
     return order
 
 # Customer: Cancel an order
@@ -59,18 +95,35 @@ def cancel_order(db: Session, order_id: int, customer_id: int) -> dict:
 
     order.status = OrderStatus.CANCELLED
     order.updated_at = datetime.utcnow()
+    invalidate_mission_routes(db, order.mission_id)
     db.commit()
+    order_spatial_index.sync_order(order)
     return {"message": "Order canceled successfully"}
 
-# Get all orders (Admin/Moderator)
-def list_all_orders(db: Session, current_user) -> List[OrderResponse]:
+# Get all orders, newest first, one keyset page at a time (Admin/Moderator)
+def list_all_orders(db: Session, current_user, page: Optional[PageParams] = None) -> dict:
     require_moderator(current_user)
-    orders = db.query(Order).all()
-    return orders
+    return paginate(db.query(Order).options(*order_response_loaders()), Order.created_at, Order.id, page or PageParams())
 
 # Get order by ID (Admin/Moderator/Customer)
 def get_order(db: Session, order_id: int, current_user) -> OrderResponse:
-    order = get_order_by_id(db, order_id)
+    order = get_order_by_id(db, order_id, order_response_loaders())
+
+    # Ensure customers can only view their own orders
+    if current_user.role == "CUSTOMER" and order.customer_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+    return order
+
+# Async variant of list_all_orders
+async def list_all_orders_async(db: AsyncSession, current_user, page: Optional[PageParams] = None) -> dict:
+    require_moderator(current_user)
+    statement = select(Order).options(*order_response_loaders())
+    return await paginate_async(db, statement, Order.created_at, Order.id, page or PageParams())
+
+# Async variant of get_order
+async def get_order_async(db: AsyncSession, order_id: int, current_user) -> OrderResponse:
+    order = await get_order_by_id_async(db, order_id)
 
     # Ensure customers can only view their own orders
     if current_user.role == "CUSTOMER" and order.customer_id != current_user.id:
@@ -78,24 +131,17 @@ def get_order(db: Session, order_id: int, current_user) -> OrderResponse:
 
     return order
 
-# Confirm collected items in an order (Driver operation)
-def confirm_order_items(db: Session, order_id: int, collected_items: List[dict], current_user):
+# Confirm collected items in an order (Driver operation), all in one transaction
+def confirm_order_items(db: Session, order_id: int, collected_items: List[OrderItemConfirm], current_user):
     order = get_order_by_id(db, order_id)
 
     # Ensure the driver is assigned to the mission associated with the order
     if order.status != OrderStatus.ASSIGNED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Order not yet assigned")
 
-    for item in collected_items:
-        order_item = db.query(OrderItem).filter(OrderItem.id == item["id"]).first()
-        if not order_item:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order item not found")
-
-        # Update the collected quantity
-        order_item.quantity = item["quantity"]
-        db.commit()
-
+    apply_collected_quantities(db, order_id, collected_items)
     order.status = OrderStatus.PICKED_UP
     order.updated_at = datetime.utcnow()
     db.commit()
+    order_spatial_index.sync_order(order)
     return {"message": "Order items confirmed successfully"}
@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select, update
 from fastapi import HTTPException, status
-from typing import List
+from typing import Dict, List
+from datetime import datetime
 from app.models.order_item import OrderItem
 from app.models.order import Order
 from app.models.item import Item
-from app.schemas.order_item import OrderItemCreate, OrderItemUpdate, OrderItemResponse
+from app.schemas.order_item import OrderItemCreate, OrderItemUpdate, OrderItemConfirm, OrderItemResponse
 from app.utils.permission_checker import require_admin, require_moderator
 
 # Helper function to get an order item by ID
@@ -83,23 +85,39 @@ def get_order_items(db: Session, order_id: int) -> List[OrderItemResponse]:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No items found for this order")
     return order_items
 
-# Confirm collected items (Driver operation)
-def confirm_collected_items(db: Session, order_id: int, collected_items: List[OrderItemUpdate], current_user):
+# Stage the collected quantities of an order's items without committing:
+# one IN fetch, validation in memory, then a single executemany UPDATE
+def apply_collected_quantities(db: Session, order_id: int, collected_items: List[OrderItemConfirm]) -> int:
+    quantities: Dict[int, int] = {}
     for item_data in collected_items:
-        order_item = get_order_item_by_id(db, item_data.id)
-        
-        # Validate that the driver is handling the correct order
-        if order_item.order_id != order_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Order item does not belong to the specified order"
-            )
-        
-        # Update collected quantity
-        if item_data.quantity:
-            order_item.quantity = item_data.quantity
-            order_item.total_price = order_item.quantity * order_item.unit_price
-        db.commit()
-        db.refresh(order_item)
+        if item_data.id in quantities:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Order item {item_data.id} is listed more than once")
+        quantities[item_data.id] = item_data.quantity
+    if not quantities:
+        return 0
 
+    rows = db.execute(
+        select(OrderItem.id, OrderItem.order_id, OrderItem.unit_price).where(OrderItem.id.in_(quantities))
+    ).all()
+    if len(rows) != len(quantities):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order item not found")
+
+    # Validate that the driver is handling the correct order
+    if any(row.order_id != order_id for row in rows):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Order item does not belong to the specified order"
+        )
+
+    now = datetime.utcnow()
+    db.execute(update(OrderItem), [
+        {"id": row.id, "quantity": quantities[row.id], "total_price": quantities[row.id] * row.unit_price, "updated_at": now}
+        for row in rows
+    ])
+    return len(rows)
+
+# Confirm collected items (Driver operation), all in one transaction
+def confirm_collected_items(db: Session, order_id: int, collected_items: List[OrderItemConfirm], current_user):
+    apply_collected_quantities(db, order_id, collected_items)
+    db.commit()
     return {"message": "Collected items confirmed successfully"}
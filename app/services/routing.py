@@ -1,35 +1,136 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
-from typing import List, Dict, Tuple
+from pydantic import ValidationError
+from typing import List, Dict, Tuple, Optional
+from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import numpy as np
+from googlemaps.convert import encode_polyline, decode_polyline
 from app.utils.routing import (
-    a_star_algorithm,
+    optimize_tour,
+    solve_tour,
+    solve_cvrp,
+    solve_vrptw,
+    travel_time_matrix,
+    DEFAULT_SERVICE_MINUTES,
+    REPLAN_TIME_LIMIT_MS,
+    AVERAGE_SPEED_KMH,
     knapsack_capacity,
     combine_orders,
     calculate_route_matrix
 )
 from app.utils.geo_utils import (
     address_to_coords,
+    batch_address_to_coords,
+    geocode_cache,
     coords_to_address,
     calculate_distance,
-    get_route
+    calculate_distances,
+    path_distance,
+    get_route,
+    get_route_async,
+    get_route_legs_async
 )
+from app.utils.road_network import get_road_network
+from app.utils.geo_client import geo_client, GeoProviderError, GeoServiceUnavailable
+from app.utils.matrix_cache import distance_matrix_cache, stop_key
+from app.utils.job_queue import optimization_jobs
+from app.utils.spatial_index import order_spatial_index
+from app.utils.clustering import cluster_orders_by_depot
 from app.models.route import Route
-from app.schemas.route import RouteCreate, RouteResponse
+from app.models.optimized_route import OptimizedRoute
+from app.models.mission import Mission
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.models.address import Address
+from app.models.vehicle import Vehicle
+from app.schemas.route import (
+    RouteCreate,
+    RouteResponse,
+    FleetRouteRequest,
+    MultiDepotRouteRequest,
+    FleetRoutingMode,
+    DistanceMethod,
+    DistanceSource,
+    DistanceBatchRequest,
+    LoadOptimizationMode,
+    OrderGroupingStrategy,
+    OptimizationJobType,
+    OptimizationJobCreate,
+    TourJobPayload,
+    FleetJobPayload,
+    LoadJobPayload,
+    OrderGroupsJobPayload
+)
 
-# Helper function to get the optimal route using A* algorithm
-def calculate_optimal_route(locations: List[Tuple[float, float]]) -> List[int]:
+# Helper function to get the optimal multi-stop route visiting every location
+def calculate_optimal_route(locations: List[Tuple[float, float]], time_limit_ms: Optional[int] = None,
+                            stats: Optional[dict] = None) -> List[int]:
     try:
-        return a_star_algorithm(locations)
+        return optimize_tour(locations, time_limit_ms=time_limit_ms, stats=stats)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calculating route: {str(e)}")
 
 # Get the distance between two coordinates
-def get_distance_between_coords(start: Tuple[float, float], end: Tuple[float, float]) -> float:
+def get_distance_between_coords(start: Tuple[float, float], end: Tuple[float, float],
+                                method: DistanceMethod = DistanceMethod.GEODESIC) -> float:
     try:
-        return calculate_distance(start[0], start[1], end[0], end[1])
+        return calculate_distance(start[0], start[1], end[0], end[1], method=DistanceMethod(method).value)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calculating distance: {str(e)}")
 
+# Get the distances for many (start, end) coordinate pairs in one vectorized call
+def get_distances_between_coords(pairs: List[Tuple[Tuple[float, float], Tuple[float, float]]],
+                                 method: DistanceMethod = DistanceMethod.GEODESIC) -> List[float]:
+    try:
+        if not pairs:
+            return []
+        points = np.asarray(pairs, dtype=np.float64).reshape(-1, 2, 2)
+        return calculate_distances(points[:, 0], points[:, 1], method=DistanceMethod(method).value).tolist()
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calculating distances: {str(e)}")
+
+# Measure many legs in one call, from (start, end) pairs or consecutive waypoints
+async def get_distance_batch(request: DistanceBatchRequest) -> dict:
+    if (request.pairs is None) == (request.waypoints is None):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Provide either pairs or waypoints")
+    if request.waypoints is not None and len(request.waypoints) < 2:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least two waypoints are required")
+    legs = request.pairs if request.pairs is not None else list(zip(request.waypoints[:-1], request.waypoints[1:]))
+    try:
+        if not legs:
+            distances, durations = [], []
+        elif request.source == DistanceSource.ROAD:
+            if request.waypoints is not None:
+                totals = await get_route_legs_async(request.waypoints)
+            else:
+                # Pairs are independent routes; the geo client runs them concurrently
+                results = await asyncio.gather(*(get_route_legs_async([start, end]) for start, end in legs))
+                totals = [result[0] for result in results]
+            distances = [leg["distance_km"] for leg in totals]
+            durations = [leg["duration_seconds"] / 60 for leg in totals]
+        else:
+            points = np.asarray(legs, dtype=np.float64).reshape(-1, 2, 2)
+            distances = calculate_distances(points[:, 0], points[:, 1], method=DistanceMethod(request.method).value).tolist()
+            durations = [distance / AVERAGE_SPEED_KMH * 60 for distance in distances]
+        return {
+            "legs": [
+                {"start": start, "end": end, "distance_km": distance, "duration_minutes": duration}
+                for (start, end), distance, duration in zip(legs, distances, durations)
+            ],
+            "total_distance_km": float(sum(distances)),
+            "total_duration_minutes": float(sum(durations))
+        }
+    except GeoServiceUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except GeoProviderError as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=f"Error calculating distances: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calculating distances: {str(e)}")
+
 # Create a route map URL using Google Maps API
 def generate_route_map(start_coords: Tuple[float, float], end_coords: Tuple[float, float]) -> dict:
     try:
@@ -37,26 +138,63 @@ def generate_route_map(start_coords: Tuple[float, float], end_coords: Tuple[floa
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error generating route map: {str(e)}")
 
-# Combine orders into optimal groups based on vehicle capacity
-def optimize_order_groups(orders: List[Dict[str, float]], max_capacity: float) -> List[List[Dict[str, float]]]:
+# Create a route map without blocking a worker thread (async geo client)
+async def generate_route_map_async(start_coords: Tuple[float, float], end_coords: Tuple[float, float]) -> dict:
+    try:
+        return await get_route_async(start_coords, end_coords)
+    except GeoServiceUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except GeoProviderError as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=f"Error generating route map: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error generating route map: {str(e)}")
+
+# Call counters and breaker state of the async geo client
+def get_geo_client_stats() -> dict:
+    return geo_client.stats()
+
+# Combine orders into optimal groups based on vehicle capacity (optionally within geographic cells)
+def optimize_order_groups(orders: List[Dict[str, float]], max_capacity: float,
+                          strategy: OrderGroupingStrategy = OrderGroupingStrategy.SEQUENTIAL,
+                          cell_size_km: Optional[float] = None, time_limit_ms: Optional[int] = None,
+                          stats: Optional[dict] = None) -> List[List[Dict[str, float]]]:
     try:
-        return combine_orders(orders, max_capacity)
+        return combine_orders(orders, max_capacity, strategy=OrderGroupingStrategy(strategy).value, cell_size_km=cell_size_km,
+                              time_limit_ms=time_limit_ms, stats=stats)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error optimizing order groups: {str(e)}")
 
-# Generate the distance matrix for multiple locations
-def get_distance_matrix(locations: List[Tuple[float, float]]) -> List[List[float]]:
+# Compute the distance matrix for multiple locations as a NumPy array
+def compute_distance_matrix(locations: List[Tuple[float, float]], ellipsoidal: bool = False,
+                            road: bool = False, dtype=np.float64) -> np.ndarray:
     try:
-        return calculate_route_matrix(locations).tolist()
+        if road:
+            # Road distances from the local road network instead of great-circle distances
+            road_network = get_road_network()
+            if road_network is None:
+                raise ValueError("Local road network is not configured")
+            matrix = road_network.distance_matrix(locations, metric="distance")
+            if not np.isfinite(matrix).all():
+                raise ValueError("Some locations are not connected by road")
+            return matrix.astype(dtype, copy=False)
+        return calculate_route_matrix(locations, ellipsoidal=ellipsoidal, dtype=dtype)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error calculating distance matrix: {str(e)}")
 
+# Generate the distance matrix for multiple locations as nested lists (JSON)
+def get_distance_matrix(locations: List[Tuple[float, float]], ellipsoidal: bool = False,
+                        road: bool = False) -> List[List[float]]:
+    return compute_distance_matrix(locations, ellipsoidal=ellipsoidal, road=road).tolist()
+
 # Create a new route
 def create_route(db: Session, route_data: RouteCreate) -> Route:
     try:
-        start_coords = address_to_coords(route_data.start_location)
-        end_coords = address_to_coords(route_data.end_location)
-        distance = calculate_distance(start_coords[0], start_coords[1], end_coords[0], end_coords[1])
+        coords = batch_address_to_coords([route_data.start_location, route_data.end_location], db)
+        start_coords = coords[route_data.start_location]
+        end_coords = coords[route_data.end_location]
+        if start_coords is None or end_coords is None:
+            raise ValueError("Address not found")
+        distance = path_distance([start_coords, end_coords])
         
         new_route = Route(
             mission_id=route_data.mission_id,
@@ -73,23 +211,354 @@ def create_route(db: Session, route_data: RouteCreate) -> Route:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error creating route: {str(e)}")
 
-# Get the optimized route for a mission
-def get_optimized_route(db: Session, mission_id: int, locations: List[Tuple[float, float]]) -> dict:
+# Canonical stop list (start first, then the other stops by rounded coordinates) and its hash
+def _canonical_stops(locations: List[Tuple[float, float]]) -> Tuple[List[int], str]:
+    keys = [stop_key(location) for location in locations]
+    canonical = [0] + sorted(range(1, len(keys)), key=lambda i: keys[i])
+    digest = hashlib.sha256(repr([keys[i] for i in canonical]).encode()).hexdigest()
+    return canonical, digest
+
+# Drop the stored optimized routes of a mission whose orders changed (committed by the caller).
+# Results are keyed by stop set, so this only reclaims rows that will not be asked for again
+def invalidate_mission_routes(db: Session, mission_id: Optional[int]):
+    if mission_id is None:
+        return
+    db.query(OptimizedRoute).filter(OptimizedRoute.mission_id == mission_id).delete(synchronize_session=False)
+
+# Get the optimized route for a mission, reusing the stored result while the stop set is unchanged.
+# The distance matrix is built only to solve (or when include_matrix asks for it in the response)
+def get_optimized_route(db: Session, mission_id: int, locations: List[Tuple[float, float]],
+                        initial_tour: Optional[List[int]] = None, time_limit_ms: Optional[int] = None,
+                        include_matrix: bool = False) -> dict:
     try:
-        optimal_order = calculate_optimal_route(locations)
-        distance_matrix = get_distance_matrix(locations)
-        optimal_route = [locations[i] for i in optimal_order]
+        if not locations:
+            return {"optimal_route": [], "stop_order": [], "distance": 0.0, "encoded_polyline": "", "cached": False,
+                    "distance_matrix": [] if include_matrix else None, "stats": None}
+        canonical, digest = _canonical_stops(locations)
+        distance_matrix = None
+
+        # Solver results live apart from the mission's user-created routes, one row per stop set
+        route = db.query(OptimizedRoute).filter(OptimizedRoute.mission_id == mission_id,
+                                                OptimizedRoute.stop_set_hash == digest).first()
+        cached = route is not None
+        solver_stats = None
+        if cached:
+            optimal_order = [canonical[position] for position in route.stop_order]
+        else:
+            if not db.query(Mission.id).filter(Mission.id == mission_id).first():
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found")
+            # Only rows for stops not seen before in this mission are recomputed
+            distance_matrix = distance_matrix_cache.get_matrix(("mission", mission_id), locations)
+            solver_stats = {}
+            optimal_order = solve_tour(distance_matrix, start=0, initial_tour=initial_tour,
+                                       time_limit_ms=time_limit_ms, stats=solver_stats)
+            positions = {index: position for position, index in enumerate(canonical)}
+            route = OptimizedRoute(
+                mission_id=mission_id,
+                stop_set_hash=digest,
+                stop_order=[positions[i] for i in optimal_order],
+                encoded_polyline=encode_polyline([locations[i] for i in optimal_order]),
+                # The matrix drives the search; the stored length uses the exact leg distances
+                distance=path_distance([locations[i] for i in optimal_order])
+            )
+            db.add(route)
+            try:
+                db.commit()
+            except IntegrityError:
+                # A concurrent request stored this stop set first; both results are valid
+                db.rollback()
 
+        if include_matrix and distance_matrix is None:
+            distance_matrix = distance_matrix_cache.get_matrix(("mission", mission_id), locations)
         return {
-            "optimal_route": optimal_route,
-            "distance_matrix": distance_matrix
+            "optimal_route": [locations[i] for i in optimal_order],
+            "stop_order": optimal_order,
+            "distance": route.distance,
+            "encoded_polyline": route.encoded_polyline,
+            "cached": cached,
+            "distance_matrix": distance_matrix.tolist() if include_matrix else None,
+            "stats": solver_stats
         }
+    except HTTPException:
+        raise
     except Exception as e:
+        db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error retrieving optimized route: {str(e)}")
 
+# Re-plan the rest of a mission from the driver's current stop over its remaining (assigned) orders,
+# warm-started from the mission's most recently optimized route
+def reoptimize_remaining_route(db: Session, mission_id: int, current_location: Tuple[float, float],
+                               time_limit_ms: int = REPLAN_TIME_LIMIT_MS) -> dict:
+    remaining = db.query(Order.id, Address.latitude, Address.longitude) \
+        .join(Address, Order.address_id == Address.id) \
+        .filter(Order.mission_id == mission_id, Order.status == OrderStatus.ASSIGNED) \
+        .order_by(Order.id) \
+        .all()
+    if not remaining:
+        return {"order_ids": [], "route": [], "distance": 0.0}
+
+    locations = [current_location] + [(latitude, longitude) for _, latitude, longitude in remaining]
+    previous = db.query(OptimizedRoute.encoded_polyline).filter(OptimizedRoute.mission_id == mission_id) \
+        .order_by(OptimizedRoute.id.desc()).first()
+    initial_tour = None
+    if previous is not None:
+        # Keep the remaining stops in the order the previous route visited them
+        visit_rank = {}
+        for rank, point in enumerate(decode_polyline(previous.encoded_polyline)):
+            visit_rank.setdefault(stop_key((point["lat"], point["lng"])), rank)
+        initial_tour = [0] + sorted(range(1, len(locations)),
+                                    key=lambda i: visit_rank.get(stop_key(locations[i]), len(visit_rank)))
+
+    result = get_optimized_route(db, mission_id, locations, initial_tour=initial_tour, time_limit_ms=time_limit_ms)
+    return {
+        "order_ids": [remaining[i - 1][0] for i in result["stop_order"][1:]],
+        "route": result["optimal_route"],
+        "distance": result["distance"]
+    }
+
 # Optimize load based on vehicle capacity
-def optimize_load(items: List[Dict[str, float]], max_weight: float) -> List[Dict[str, float]]:
+def optimize_load(items: List[Dict[str, float]], max_weight: float,
+                  mode: LoadOptimizationMode = LoadOptimizationMode.AUTO, time_limit_ms: Optional[int] = None,
+                  stats: Optional[dict] = None) -> List[Dict[str, float]]:
     try:
-        return knapsack_capacity(items, max_weight)
+        return knapsack_capacity(items, max_weight, mode=LoadOptimizationMode(mode).value,
+                                 time_limit_ms=time_limit_ms, stats=stats)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error optimizing load: {str(e)}")
+
+# Load pending orders with their pickup coordinates, demand (total item quantity) and pickup window
+def get_pending_order_stops(db: Session) -> List[dict]:
+    rows = db.query(
+        Order.id,
+        Address.latitude,
+        Address.longitude,
+        Order.window_start,
+        Order.window_end,
+        Order.service_time_minutes,
+        func.coalesce(func.sum(OrderItem.quantity), 0)
+    ).join(Address, Order.address_id == Address.id) \
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id) \
+        .filter(Order.status == OrderStatus.PENDING) \
+        .group_by(Order.id, Address.latitude, Address.longitude,
+                  Order.window_start, Order.window_end, Order.service_time_minutes) \
+        .all()
+    return [
+        {
+            "order_id": order_id,
+            "latitude": latitude,
+            "longitude": longitude,
+            "window_start": window_start,
+            "window_end": window_end,
+            "service_time_minutes": service_time_minutes,
+            "weight": float(weight)
+        }
+        for order_id, latitude, longitude, window_start, window_end, service_time_minutes, weight in rows
+    ]
+
+# Load the vehicles available for dispatch, optionally restricted to the given IDs
+def get_dispatch_vehicles(db: Session, vehicle_ids: Optional[List[int]] = None) -> List[Vehicle]:
+    query = db.query(Vehicle).filter(Vehicle.is_available == True)
+    if vehicle_ids:
+        query = query.filter(Vehicle.id.in_(vehicle_ids))
+    return query.order_by(Vehicle.id).all()
+
+# Minutes between the departure and a pickup window bound (inf for an open bound)
+def _minutes_after(departure: datetime, moment: Optional[datetime], default: float) -> float:
+    if moment is None:
+        return default
+    return (moment - departure).total_seconds() / 60
+
+# Plan one route per available vehicle over all pending orders (capacitated VRP, optionally with time windows)
+def plan_fleet_routes(db: Session, request: FleetRouteRequest, time_limit_ms: int = 1000,
+                      mode: FleetRoutingMode = FleetRoutingMode.CAPACITY) -> dict:
+    try:
+        stops = get_pending_order_stops(db)
+        vehicles = get_dispatch_vehicles(db, request.vehicle_ids)
+        if not vehicles:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No available vehicles found")
+
+        depot = (request.depot.latitude, request.depot.longitude)
+        locations = [depot] + [(stop["latitude"], stop["longitude"]) for stop in stops]
+        demands = [0.0] + [stop["weight"] for stop in stops]
+        capacities = [vehicle.capacity for vehicle in vehicles]
+        dist_matrix = calculate_route_matrix(locations)
+
+        if FleetRoutingMode(mode) == FleetRoutingMode.TIME_WINDOWS:
+            departure = request.departure_time or datetime.utcnow()
+            plan = solve_vrptw(
+                travel_time_matrix(dist_matrix),
+                [0.0] + [max(0.0, _minutes_after(departure, stop["window_start"], 0.0)) for stop in stops],
+                [float("inf")] + [_minutes_after(departure, stop["window_end"], float("inf")) for stop in stops],
+                [0.0] + [stop["service_time_minutes"] if stop["service_time_minutes"] is not None
+                         else DEFAULT_SERVICE_MINUTES for stop in stops],
+                demands,
+                capacities,
+                depot=0,
+                cost_matrix=dist_matrix,
+                time_limit_ms=time_limit_ms
+            )
+        else:
+            departure = None
+            plan = solve_cvrp(dist_matrix, demands, capacities, depot=0, time_limit_ms=time_limit_ms)
+
+        routes = []
+        for route in plan["routes"]:
+            if not route["stops"]:
+                continue
+            entry = {
+                "vehicle_id": vehicles[route["vehicle_index"]].id,
+                "order_ids": [stops[i - 1]["order_id"] for i in route["stops"]],
+                "load": route["load"],
+                "distance": path_distance([locations[i] for i in [0] + route["stops"] + [0]])
+            }
+            if departure is not None:
+                entry["pickup_times"] = [departure + timedelta(minutes=start) for start in route["service_starts"]]
+                entry["return_time"] = departure + timedelta(minutes=route["return_time"])
+            routes.append(entry)
+
+        return {
+            "routes": routes,
+            "unassigned_order_ids": [stops[i - 1]["order_id"] for i in plan["unassigned"]],
+            "total_distance": sum(route["distance"] for route in routes),
+            "stats": plan["stats"]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error planning fleet routes: {str(e)}")
+
+# Split pending orders between several depots (capacity-constrained k-means), then plan each
+# depot's vehicle routes in parallel on the worker pool
+def plan_multi_depot_routes(db: Session, request: MultiDepotRouteRequest, time_limit_ms: int = 1000) -> dict:
+    try:
+        requested_ids = [vehicle_id for depot in request.depots for vehicle_id in depot.vehicle_ids]
+        if len(set(requested_ids)) != len(requested_ids):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A vehicle can only belong to one depot")
+        vehicles = {vehicle.id: vehicle for vehicle in get_dispatch_vehicles(db, requested_ids)}
+        missing = sorted(set(requested_ids) - set(vehicles))
+        if missing:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Vehicles not available: {missing}")
+
+        stops = get_pending_order_stops(db)
+        depots = [(depot.location.latitude, depot.location.longitude) for depot in request.depots]
+        fleets = [[vehicles[vehicle_id] for vehicle_id in depot.vehicle_ids] for depot in request.depots]
+        labels = cluster_orders_by_depot(
+            [(stop["latitude"], stop["longitude"]) for stop in stops],
+            [stop["weight"] for stop in stops],
+            depots,
+            [sum(vehicle.capacity for vehicle in fleet) for fleet in fleets],
+            balance_tolerance=request.balance_tolerance
+        )
+
+        clusters = [[stop for stop, label in zip(stops, labels) if label == index] for index in range(len(depots))]
+        solved = [index for index, cluster in enumerate(clusters) if cluster]
+        results = optimization_jobs.run_many("fleet", [
+            {
+                "locations": [depots[index]] + [(stop["latitude"], stop["longitude"]) for stop in clusters[index]],
+                "demands": [0.0] + [stop["weight"] for stop in clusters[index]],
+                "capacities": [vehicle.capacity for vehicle in fleets[index]]
+            }
+            for index in solved
+        ], time_limit_ms)
+
+        plans = []
+        unassigned = [stop["order_id"] for stop, label in zip(stops, labels) if label < 0]
+        for index, outcome in zip(solved, results):
+            cluster, plan = clusters[index], outcome["result"]
+            locations = [depots[index]] + [(stop["latitude"], stop["longitude"]) for stop in cluster]
+            routes = [
+                {
+                    "vehicle_id": fleets[index][route["vehicle_index"]].id,
+                    "order_ids": [cluster[i - 1]["order_id"] for i in route["stops"]],
+                    "load": route["load"],
+                    "distance": path_distance([locations[i] for i in [0] + route["stops"] + [0]])
+                }
+                for route in plan["routes"] if route["stops"]
+            ]
+            depot_unassigned = [cluster[i - 1]["order_id"] for i in plan["unassigned"]]
+            unassigned.extend(depot_unassigned)
+            plans.append({
+                "depot_index": index,
+                "routes": routes,
+                "unassigned_order_ids": depot_unassigned,
+                "total_distance": sum(route["distance"] for route in routes),
+                "stats": outcome["stats"]
+            })
+
+        return {
+            "depots": plans,
+            "unassigned_order_ids": sorted(unassigned),
+            "total_distance": sum(plan["total_distance"] for plan in plans)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error planning multi-depot routes: {str(e)}")
+
+# Geocode many addresses at once through the shared geocoding cache
+def geocode_addresses(db: Session, addresses: List[str]) -> Dict[str, Optional[Tuple[float, float]]]:
+    try:
+        return batch_address_to_coords(addresses, db)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error geocoding addresses: {str(e)}")
+
+# Hit/miss counters of the geocoding cache
+def get_geocode_cache_stats() -> dict:
+    return geocode_cache.stats()
+
+# Hit/miss counters and memory use of the per-mission distance matrix cache
+def get_matrix_cache_stats() -> dict:
+    return distance_matrix_cache.stats()
+
+# Open orders within a radius of a point (e.g. a driver or depot), nearest first
+def get_nearby_orders(db: Session, latitude: float, longitude: float, radius_km: float,
+                      statuses: Optional[List[OrderStatus]] = None, limit: Optional[int] = None) -> List[dict]:
+    try:
+        return order_spatial_index.nearby(db, latitude, longitude, radius_km, statuses=statuses, limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error finding nearby orders: {str(e)}")
+
+# The k open orders closest to a point, nearest first
+def get_nearest_orders(db: Session, latitude: float, longitude: float, k: int,
+                       statuses: Optional[List[OrderStatus]] = None) -> List[dict]:
+    try:
+        return order_spatial_index.nearest(db, latitude, longitude, k, statuses=statuses)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error finding nearest orders: {str(e)}")
+
+# Payload schema for each optimization job type
+JOB_PAYLOAD_SCHEMAS = {
+    OptimizationJobType.TOUR: TourJobPayload,
+    OptimizationJobType.FLEET: FleetJobPayload,
+    OptimizationJobType.LOAD: LoadJobPayload,
+    OptimizationJobType.ORDER_GROUPS: OrderGroupsJobPayload
+}
+
+# Submit a routing or load problem to the background worker pool
+def submit_optimization_job(job_data: OptimizationJobCreate) -> dict:
+    try:
+        payload = JOB_PAYLOAD_SCHEMAS[job_data.type](**job_data.payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors(include_url=False))
+    if isinstance(payload, FleetJobPayload) and len(payload.demands) != len(payload.locations):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="demands must have one entry per location")
+    try:
+        return optimization_jobs.submit(job_data.type.value, payload.model_dump(mode="json"), job_data.time_limit_ms)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error submitting optimization job: {str(e)}")
+
+# Get the status (and result, once finished) of an optimization job
+def get_optimization_job(job_id: str) -> dict:
+    job = optimization_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Optimization job not found")
+    return job
+
+# Cancel an optimization job
+def cancel_optimization_job(job_id: str) -> dict:
+    job = optimization_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Optimization job not found")
+    return job
@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from app.models.user import User, UserRole
 from app.utils.common import hash_password
 from app.utils.permission_checker import require_admin
+from app.utils.pagination import PageParams, paginate
 from app.schemas.user import (
     UserCreate,
     UserUpdate,
@@ -96,15 +97,15 @@ def delete_user(db: Session, user_id: int, current_user: User):
     db.commit()
     return {"message": f"User {user.username} has been permanently deleted."}
 
-# Admin: List all users or filter by role
-def list_users(db: Session, role: Optional[UserRole], current_user: User) -> list:
+# Admin: List all users or filter by role, newest first, one keyset page at a time
+def list_users(db: Session, role: Optional[UserRole], current_user: User, page: Optional[PageParams] = None) -> dict:
     require_admin(current_user)
 
     query = db.query(User)
     if role:
         query = query.filter(User.role == role)
 
-    return query.all()
+    return paginate(query, User.created_at, User.id, page or PageParams())
 
 # Admin/Moderator: Get a specific user's details
 def get_user(db: Session, user_id: int, current_user: User) -> User:
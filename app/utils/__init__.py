@@ -10,14 +10,26 @@ from app.utils.jwt import (
 # Geographical Utilities
 from app.utils.geo_utils import (
     calculate_distance,
+    calculate_distances,
+    path_distance,
     address_to_coords,
+    batch_address_to_coords,
     coords_to_address,
-    get_route
+    get_route,
+    address_to_coords_async,
+    batch_address_to_coords_async,
+    coords_to_address_async,
+    get_route_async,
+    get_route_legs_async,
+    haversine_distances,
+    haversine_matrix
 )
 
 # Routing and Optimization Utilities
 from app.utils.routing import (
     a_star_algorithm,
+    solve_tour,
+    optimize_tour,
     knapsack_capacity,
     combine_orders,
     calculate_route_matrix
@@ -58,7 +70,9 @@ from app.utils.notification import (
     mark_notification_as_read,
     mark_all_as_read,
     delete_notification,
-    get_all_notifications
+    get_all_notifications,
+    get_unread_notifications_async,
+    get_all_notifications_async
 )
 
 # Common Utilities
@@ -94,6 +108,24 @@ from app.utils.permission_checker import (
     check_permission
 )
 
+# Pagination Utilities
+from app.utils.pagination import (
+    PageParams,
+    encode_cursor,
+    decode_cursor,
+    paginate,
+    paginate_async
+)
+
+# Query Loading and Counting Utilities
+from app.utils.loaders import response_loaders
+from app.utils.query_counter import (
+    start_query_count,
+    current_query_count,
+    stop_query_count,
+    query_count_middleware
+)
+
 __all__ = [
     # JWT Utilities
     "create_access_token",
@@ -104,12 +136,24 @@ __all__ = [
 
     # Geo Utilities
     "calculate_distance",
+    "calculate_distances",
+    "path_distance",
     "address_to_coords",
+    "batch_address_to_coords",
     "coords_to_address",
     "get_route",
+    "address_to_coords_async",
+    "batch_address_to_coords_async",
+    "coords_to_address_async",
+    "get_route_async",
+    "get_route_legs_async",
+    "haversine_distances",
+    "haversine_matrix",
 
     # Routing Utilities
     "a_star_algorithm",
+    "solve_tour",
+    "optimize_tour",
     "knapsack_capacity",
     "combine_orders",
     "calculate_route_matrix",
@@ -143,6 +187,8 @@ __all__ = [
     "mark_all_as_read",
     "delete_notification",
     "get_all_notifications",
+    "get_unread_notifications_async",
+    "get_all_notifications_async",
 
     # Common Utilities
     "generate_uuid",
@@ -169,5 +215,19 @@ __all__ = [
     "require_driver",
     "require_customer",
     "has_permission",
-    "check_permission"
+    "check_permission",
+
+    # Pagination Utilities
+    "PageParams",
+    "encode_cursor",
+    "decode_cursor",
+    "paginate",
+    "paginate_async",
+
+    # Query Loading and Counting Utilities
+    "response_loaders",
+    "start_query_count",
+    "current_query_count",
+    "stop_query_count",
+    "query_count_middleware"
 ]
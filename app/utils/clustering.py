@@ -0,0 +1,122 @@
+import math
+from typing import List, Optional, Tuple
+import numpy as np
+from app.utils.config_loader import get_config
+from app.utils.geo_utils import EARTH_MEAN_RADIUS_KM
+
+# Clustering configuration
+KMEANS_MAX_ITERATIONS = int(get_config("KMEANS_MAX_ITERATIONS", "50"))
+CLUSTER_BALANCE_TOLERANCE = float(get_config("CLUSTER_BALANCE_TOLERANCE", "0.1"))  # Allowed overshoot of a fair share
+
+def project_points(points: np.ndarray, origin: Tuple[float, float]) -> np.ndarray:
+    """
+    Equirectangular projection of (lat, lon) degrees onto a plane in kilometers,
+    centred on `origin`. Accurate enough for clustering within a region.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    scale = math.pi * EARTH_MEAN_RADIUS_KM / 180
+    x = (points[:, 1] - origin[1]) * scale * math.cos(math.radians(origin[0]))
+    y = (points[:, 0] - origin[0]) * scale
+    return np.column_stack((x, y))
+
+def _pairwise(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2))
+
+def _capacitated_assignment(cost: np.ndarray, demands: np.ndarray, capacities: np.ndarray) -> np.ndarray:
+    """
+    Assigns every point to its cheapest cluster that still has room.
+    Points with the largest regret (second-best minus best cost) go first, so
+    the ones that lose the most from a detour are placed while there is room.
+    """
+    n, k = cost.shape
+    labels = np.full(n, -1, dtype=np.int64)
+    preference = np.argsort(cost, axis=1, kind="stable")
+    if k > 1:
+        ranked = np.take_along_axis(cost, preference[:, :2], axis=1)
+        regret = ranked[:, 1] - ranked[:, 0]
+    else:
+        regret = np.zeros(n)
+    remaining = capacities.astype(np.float64).copy()
+    for point in np.argsort(-regret, kind="stable"):
+        for cluster in preference[point]:
+            if demands[point] <= remaining[cluster] + 1e-9:
+                labels[point] = cluster
+                remaining[cluster] -= demands[point]
+                break
+    return labels
+
+def _balance(cost: np.ndarray, demands: np.ndarray, labels: np.ndarray, capacities: np.ndarray,
+             shares: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Moves points out of clusters loaded above their fair share (the overall
+    load ratio times the cluster's share, plus `tolerance`) into clusters below
+    theirs, cheapest extra cost first, until every cluster is within bounds or
+    no move is possible.
+    """
+    k = cost.shape[1]
+    assigned = labels >= 0
+    loads = np.bincount(labels[assigned], weights=demands[assigned], minlength=k)
+    targets = loads.sum() * shares / shares.sum() * (1 + tolerance)
+    for _ in range(len(labels)):
+        over = np.flatnonzero(loads > targets + 1e-9)
+        if len(over) == 0:
+            break
+        members = np.flatnonzero(np.isin(labels, over))
+        own = cost[members, labels[members]]
+        room = np.minimum(targets, capacities) - loads
+        fits = demands[members, None] <= room[None, :] + 1e-9
+        fits[np.arange(len(members)), labels[members]] = False
+        delta = np.where(fits, cost[members] - own[:, None], np.inf)
+        flat = int(np.argmin(delta))
+        if not np.isfinite(delta.flat[flat]):
+            break
+        member, cluster = divmod(flat, k)
+        point = members[member]
+        loads[labels[point]] -= demands[point]
+        loads[cluster] += demands[point]
+        labels[point] = cluster
+    return labels
+
+def cluster_orders_by_depot(points: List[Tuple[float, float]], demands: List[float],
+                            depots: List[Tuple[float, float]], capacities: Optional[List[float]] = None,
+                            max_iterations: int = KMEANS_MAX_ITERATIONS,
+                            balance_tolerance: Optional[float] = CLUSTER_BALANCE_TOLERANCE) -> np.ndarray:
+    """
+    Capacity-constrained k-means with one cluster per depot.
+    Each cluster's centre starts at its depot and moves to the demand-weighted
+    mean of its orders. An order's cost for a cluster is its distance to the
+    depot plus its distance to the centre, which keeps clusters compact while
+    anchored to their yard. Assignment respects each depot's capacity (total
+    vehicle capacity; None means unlimited), and a final balancing step evens
+    out the load relative to capacity (skipped when balance_tolerance is None).
+    Returns the depot index of every order, or -1 when no depot has room for it.
+    """
+    if not points:
+        return np.empty(0, dtype=np.int64)
+    origin = tuple(np.mean(np.asarray(depots, dtype=np.float64), axis=0))
+    xy = project_points(points, origin)
+    depot_xy = project_points(depots, origin)
+    demands = np.asarray(demands, dtype=np.float64)
+    k = len(depot_xy)
+    hard_limits = np.full(k, np.inf) if capacities is None else np.asarray(capacities, dtype=np.float64)
+    shares = np.ones(k) if capacities is None else hard_limits
+
+    to_depot = _pairwise(xy, depot_xy)
+    centers = depot_xy.copy()
+    labels = None
+    for _ in range(max_iterations):
+        cost = to_depot + _pairwise(xy, centers)
+        new_labels = _capacitated_assignment(cost, demands, hard_limits)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        # Demand-weighted centroids (orders without demand still count a little)
+        weights = np.maximum(demands, 1e-6)
+        for cluster in range(k):
+            members = labels == cluster
+            centers[cluster] = (np.average(xy[members], axis=0, weights=weights[members])
+                                if members.any() else depot_xy[cluster])
+
+    if balance_tolerance is not None and k > 1:
+        labels = _balance(cost, demands, labels, hard_limits, shares, balance_tolerance)
+    return labels
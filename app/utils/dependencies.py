@@ -1,12 +1,15 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
 from app.models.user import User, UserRole
 from app.utils.jwt import verify_token
 from app.database import get_db
-from typing import Generator
+from typing import Generator, Optional
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import SessionLocal, get_async_db
+from app.utils.pagination import PageParams, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 # Helper function to get the current user from the token
 def get_current_user(db: Session = Depends(get_db), token: str = Depends(verify_token)) -> User:
@@ -31,6 +34,29 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(verify_
             detail="Invalid token"
         )
 
+# Async variant of get_current_user for handlers that use an AsyncSession
+async def get_current_user_async(db: AsyncSession = Depends(get_async_db), token: str = Depends(verify_token)) -> User:
+    try:
+        payload = jwt.decode(token, "SECRET_KEY", algorithms=["HS256"])
+        user_id: int = payload.get("sub")
+        if user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials"
+            )
+        user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        return user
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token"
+        )
+
 # Dependency for getting the database session
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -39,6 +65,15 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+# Dependency for keyset pagination parameters (?cursor=&limit=&include_total=)
+def get_page_params(cursor: Optional[str] = Query(None), limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                    include_total: bool = False) -> PageParams:
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return PageParams(after=after, limit=limit, include_total=include_total)
+
 # Dependency to check if the current user is an admin
 def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
     if current_user.role != UserRole.ADMIN:
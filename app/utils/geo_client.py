@@ -0,0 +1,387 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import httpx
+import numpy as np
+from app.utils.config_loader import get_config
+from app.utils.logger import log_warning, route_logger
+
+# Client configuration
+GEO_MAX_CONCURRENCY = int(get_config("GEO_MAX_CONCURRENCY", "10"))  # Provider requests in flight at once
+GEO_TIMEOUT_SECONDS = float(get_config("GEO_TIMEOUT_SECONDS", "5"))  # Per attempt
+GEO_MAX_RETRIES = int(get_config("GEO_MAX_RETRIES", "3"))  # Retries after the first attempt
+GEO_BACKOFF_BASE_SECONDS = float(get_config("GEO_BACKOFF_BASE_SECONDS", "0.2"))
+GEO_BACKOFF_MAX_SECONDS = float(get_config("GEO_BACKOFF_MAX_SECONDS", "5"))
+GEO_BREAKER_FAILURES = int(get_config("GEO_BREAKER_FAILURES", "5"))  # Consecutive failures that open the breaker
+GEO_BREAKER_RESET_SECONDS = float(get_config("GEO_BREAKER_RESET_SECONDS", "30"))  # Open time before a trial call
+GEO_MAX_WAYPOINTS = int(get_config("GEO_MAX_WAYPOINTS", "25"))  # Intermediate stops per directions request
+
+GOOGLE_MAPS_BASE_URL = "https://maps.googleapis.com/maps/api/"
+MOCK_COORDINATES = (24.7136, 46.6753)  # Riyadh, Saudi Arabia
+MOCK_ADDRESS = "Mocked Address, Riyadh, Saudi Arabia"
+LOCAL_DRIVING_SPEED_KMH = 40.0
+
+class GeoProviderError(Exception):
+    """
+    A provider call that failed for a transient reason (timeout, rate limit,
+    server error) and may be retried.
+    """
+
+class GeoServiceUnavailable(RuntimeError):
+    """
+    Raised without calling the provider while the circuit breaker is open.
+    """
+
+class GoogleMapsProvider:
+    """
+    Google Maps web services over a pooled httpx.AsyncClient.
+    Results have the same shape as the synchronous helpers in geo_utils;
+    unknown addresses raise ValueError.
+    """
+    RETRYABLE_STATUSES = ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR")
+
+    def __init__(self, api_key: str, max_connections: int = GEO_MAX_CONCURRENCY,
+                 base_url: str = GOOGLE_MAPS_BASE_URL):
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.base_url = base_url
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _session(self) -> httpx.AsyncClient:
+        # Created on first use so that it binds to the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                timeout=None  # Timeouts are enforced per call by AsyncGeoClient
+            )
+        return self._client
+
+    async def _get(self, endpoint: str, params: Dict[str, Any]) -> List[dict]:
+        try:
+            response = await self._session().get(endpoint, params={**params, "key": self.api_key})
+        except httpx.TransportError as e:
+            raise GeoProviderError(f"{type(e).__name__}: {e}") from e
+        if response.status_code == 429 or response.status_code >= 500:
+            raise GeoProviderError(f"HTTP {response.status_code} from {endpoint}")
+        response.raise_for_status()
+        body = response.json()
+        api_status = body.get("status")
+        if api_status in ("ZERO_RESULTS", "NOT_FOUND"):
+            raise ValueError("No results found")
+        if api_status in self.RETRYABLE_STATUSES:
+            raise GeoProviderError(f"{api_status} from {endpoint}")
+        if api_status != "OK":
+            raise RuntimeError(f"{api_status}: {body.get('error_message', 'request failed')}")
+        return body.get("results") or body.get("routes") or []
+
+    async def geocode(self, address: str) -> dict:
+        results = await self._get("geocode/json", {"address": address})
+        if not results:
+            raise ValueError("Address not found")
+        location = results[0]['geometry']['location']
+        return {
+            "latitude": location['lat'],
+            "longitude": location['lng'],
+            "place_id": results[0].get('place_id'),
+            "formatted_address": results[0].get('formatted_address')
+        }
+
+    async def reverse_geocode(self, lat: float, lon: float) -> str:
+        results = await self._get("geocode/json", {"latlng": f"{lat},{lon}"})
+        if not results:
+            raise ValueError("Coordinates not found")
+        return results[0]['formatted_address']
+
+    async def directions(self, start_coords: Tuple[float, float], end_coords: Tuple[float, float]) -> dict:
+        routes = await self._get("directions/json", {
+            "origin": f"{start_coords[0]},{start_coords[1]}",
+            "destination": f"{end_coords[0]},{end_coords[1]}",
+            "mode": "driving",
+            "alternatives": "false"
+        })
+        if not routes:
+            raise ValueError("No route found")
+        leg = routes[0]['legs'][0]
+        return {
+            "distance": leg['distance']['text'],
+            "duration": leg['duration']['text'],
+            "start_address": leg['start_address'],
+            "end_address": leg['end_address'],
+            "steps": [step['html_instructions'] for step in leg['steps']]
+        }
+
+    async def directions_legs(self, waypoints: Tuple[Tuple[float, float], ...]) -> List[dict]:
+        """
+        Distance (km) and duration (s) of every leg of an ordered waypoint list,
+        from a single directions request.
+        """
+        stops = [f"{lat},{lon}" for lat, lon in waypoints]
+        params = {"origin": stops[0], "destination": stops[-1], "mode": "driving", "alternatives": "false"}
+        if len(stops) > 2:
+            params["waypoints"] = "|".join(stops[1:-1])
+        routes = await self._get("directions/json", params)
+        if not routes:
+            raise ValueError("No route found")
+        return [
+            {"distance_km": leg['distance']['value'] / 1000, "duration_seconds": float(leg['duration']['value'])}
+            for leg in routes[0]['legs']
+        ]
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+class LocalGeoProvider:
+    """
+    Offline stand-in for tests and for running without an API key.
+    Known addresses resolve to their configured coordinates, anything else to
+    the usual Riyadh mock; routes are straight lines at a constant speed.
+    `delay_seconds` simulates provider latency.
+    """
+    def __init__(self, places: Optional[Dict[str, Tuple[float, float]]] = None, delay_seconds: float = 0.0):
+        self.places = {address.strip().lower(): coords for address, coords in (places or {}).items()}
+        self.delay_seconds = delay_seconds
+        self.calls = 0
+
+    async def _wait(self):
+        self.calls += 1
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+
+    async def geocode(self, address: str) -> dict:
+        await self._wait()
+        latitude, longitude = self.places.get(address.strip().lower(), MOCK_COORDINATES)
+        return {"latitude": latitude, "longitude": longitude, "place_id": None, "formatted_address": address}
+
+    async def reverse_geocode(self, lat: float, lon: float) -> str:
+        await self._wait()
+        for address, (latitude, longitude) in self.places.items():
+            if abs(latitude - lat) < 1e-6 and abs(longitude - lon) < 1e-6:
+                return address
+        return MOCK_ADDRESS
+
+    async def directions(self, start_coords: Tuple[float, float], end_coords: Tuple[float, float]) -> dict:
+        from app.utils.geo_utils import calculate_distance
+        await self._wait()
+        distance = calculate_distance(start_coords[0], start_coords[1], end_coords[0], end_coords[1], method="haversine")
+        return {
+            "distance": f"{distance:.1f} km",
+            "duration": f"{round(distance / LOCAL_DRIVING_SPEED_KMH * 60)} mins",
+            "start_address": f"Mocked Start ({start_coords})",
+            "end_address": f"Mocked End ({end_coords})",
+            "steps": ["Head towards the destination", "Arrive at destination"]
+        }
+
+    async def directions_legs(self, waypoints: Tuple[Tuple[float, float], ...]) -> List[dict]:
+        from app.utils.geo_utils import calculate_distances
+        await self._wait()
+        points = np.asarray(waypoints, dtype=np.float64)
+        distances = calculate_distances(points[:-1], points[1:], method="haversine")
+        return [
+            {"distance_km": float(distance), "duration_seconds": float(distance / LOCAL_DRIVING_SPEED_KMH * 3600)}
+            for distance in distances
+        ]
+
+    async def aclose(self):
+        pass
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_seconds`; then lets a single trial call through (half-open) and
+    closes again if it succeeds.
+    """
+    def __init__(self, failure_threshold: int = GEO_BREAKER_FAILURES, reset_seconds: float = GEO_BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_running or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+    def release_trial(self):
+        """
+        Ends a half-open trial that was abandoned (cancelled) before it had an
+        outcome, without counting a failure, so the next call can try again.
+        """
+        self._trial_running = False
+
+class AsyncGeoClient:
+    """
+    Async front end for a geo provider.
+    Bounds the number of concurrent provider calls with a semaphore, shares one
+    call between identical requests already in flight (single-flight), applies a
+    timeout to every attempt, retries transient failures with full-jitter
+    exponential backoff and stops calling a failing provider through a circuit breaker.
+    """
+    def __init__(self, provider, max_concurrency: int = GEO_MAX_CONCURRENCY, timeout: float = GEO_TIMEOUT_SECONDS,
+                 max_retries: int = GEO_MAX_RETRIES, backoff_base: float = GEO_BACKOFF_BASE_SECONDS,
+                 backoff_max: float = GEO_BACKOFF_MAX_SECONDS, breaker: Optional[CircuitBreaker] = None):
+        self.provider = provider
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._stats = {"calls": 0, "coalesced": 0, "retries": 0, "timeouts": 0, "failures": 0, "rejected": 0}
+
+    def set_provider(self, provider):
+        """
+        Swap the provider (e.g. a LocalGeoProvider in tests) and reset the breaker.
+        """
+        self.provider = provider
+        self.breaker.record_success()
+
+    def stats(self) -> dict:
+        return {**self._stats, "in_flight": len(self._inflight), "breaker": self.breaker.state}
+
+    async def _attempt(self, operation: str, *args):
+        """
+        One provider call with retries, under the semaphore and the breaker.
+        """
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                self._stats["rejected"] += 1
+                raise GeoServiceUnavailable("Geo provider is temporarily unavailable")
+            # Checked before any await, so a concurrent trial is never mistaken for this one
+            is_trial = self.breaker.state == "half_open"
+            try:
+                async with self._semaphore:
+                    self._stats["calls"] += 1
+                    result = await asyncio.wait_for(getattr(self.provider, operation)(*args), self.timeout)
+                self.breaker.record_success()
+                return result
+            except ValueError:
+                # Not found is an answer, not a provider failure
+                self.breaker.record_success()
+                raise
+            except (asyncio.TimeoutError, GeoProviderError) as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self._stats["timeouts"] += 1
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    self._stats["failures"] += 1
+                    log_warning(f"Geo provider {operation} failed after {attempt + 1} attempts: {e!r}", route_logger)
+                    raise GeoProviderError(f"{operation} failed: {e!r}") from e
+                self._stats["retries"] += 1
+                await asyncio.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+            except asyncio.CancelledError:
+                # The caller went away; that says nothing about the provider
+                if is_trial:
+                    self.breaker.release_trial()
+                raise
+            except Exception:
+                self.breaker.record_failure()
+                self._stats["failures"] += 1
+                raise
+
+    async def _call(self, operation: str, key: Hashable, *args):
+        """
+        Run an operation, or wait for the identical call that is already running.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._attempt(operation, *args)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                # Only this caller went away; coalesced waiters get an error they can retry
+                e = GeoProviderError(f"{operation} was abandoned by the caller running it")
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved when nobody else was waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def geocode(self, address: str) -> dict:
+        return await self._call("geocode", ("geocode", address.strip().lower()), address)
+
+    async def geocode_many(self, addresses: List[str]) -> Dict[str, Optional[dict]]:
+        """
+        Geocode many addresses concurrently; unknown addresses map to None.
+        """
+        unique = list(dict.fromkeys(addresses))
+        results = await asyncio.gather(*(self.geocode(address) for address in unique), return_exceptions=True)
+        resolved = {}
+        for address, result in zip(unique, results):
+            if isinstance(result, ValueError):
+                resolved[address] = None
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                resolved[address] = result
+        return {address: resolved[address] for address in addresses}
+
+    async def reverse_geocode(self, lat: float, lon: float) -> str:
+        return await self._call("reverse_geocode", ("reverse", round(lat, 6), round(lon, 6)), lat, lon)
+
+    async def route(self, start_coords: Tuple[float, float], end_coords: Tuple[float, float]) -> dict:
+        key = ("route", tuple(round(c, 6) for c in start_coords), tuple(round(c, 6) for c in end_coords))
+        return await self._call("directions", key, tuple(start_coords), tuple(end_coords))
+
+    async def route_legs(self, waypoints: List[Tuple[float, float]]) -> List[dict]:
+        """
+        Per-leg distance and duration along an ordered waypoint list.
+        Lists longer than the provider's waypoint limit are split into
+        requests that share their boundary stop and run concurrently.
+        """
+        points = [tuple(round(c, 6) for c in point) for point in waypoints]
+        span = GEO_MAX_WAYPOINTS + 1
+        chunks = [tuple(points[start:start + span + 1]) for start in range(0, len(points) - 1, span)]
+        results = await asyncio.gather(*(self._call("directions_legs", ("legs", chunk), chunk) for chunk in chunks))
+        return [leg for legs in results for leg in legs]
+
+    async def aclose(self):
+        await self.provider.aclose()
+
+def default_geo_provider():
+    """
+    Google Maps when a valid API key is configured, otherwise the local stand-in.
+    """
+    api_key = get_config("GOOGLE_MAPS_API_KEY")
+    # Same key check googlemaps.Client applies, so both clients fall back together
+    if api_key and api_key.startswith("AIza"):
+        return GoogleMapsProvider(api_key)
+    return LocalGeoProvider()
+
+# Shared async geo client; tests can swap in a stand-in with geo_client.set_provider()
+geo_client = AsyncGeoClient(default_geo_provider())
@@ -1,6 +1,29 @@
 from geopy.distance import geodesic
+from typing import List, Tuple, Dict, Optional
+import math
+from sqlalchemy.orm import Session
+import numpy as np
 import googlemaps
 from app.utils.config_loader import get_config
+from app.utils.geocode_cache import GeocodeCache
+from app.utils.road_network import get_road_network
+from app.utils.geo_client import geo_client
+
+# Earth model constants (WGS-84)
+EARTH_MEAN_RADIUS_KM = 6371.0088
+WGS84_EQUATORIAL_RADIUS_KM = 6378.137
+WGS84_FLATTENING = 1 / 298.257223563
+
+# Rows per broadcast block when filling a full distance matrix
+MATRIX_BLOCK_ROWS = 256
+
+# Distance formulas, from most to least accurate:
+# geodesic (Karney, via geopy), vincenty (iterative WGS-84, ~0.1 mm),
+# haversine (spherical, ~0.5%) and equirectangular (flat projection, short hops only)
+DISTANCE_METHODS = ("geodesic", "vincenty", "haversine", "equirectangular")
+VINCENTY_MAX_ITERATIONS = 200
+VINCENTY_TOLERANCE = 1e-12  # Radians of longitude on the auxiliary sphere
+LAMBERT_MAX_ANGLE = math.pi / 2  # Longest central angle Lambert's correction is used for (about 10,000 km)
 
 # Initialize Google Maps client if API key is available
 API_KEY = get_config("GOOGLE_MAPS_API_KEY")
@@ -12,33 +35,293 @@ if API_KEY:
     except Exception as e:
         print(f"Failed to initialize Google Maps client: {e}")
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float, method: str = "geodesic") -> float:
     """
     Calculate the distance between two geographical coordinates.
+    `method` picks the formula (see DISTANCE_METHODS); solvers use the cheap
+    ones while searching. Distances stored or reported by the app go through
+    path_distance, which uses "vincenty" (within 0.1 mm of "geodesic").
+    Returns the distance in kilometers.
+    """
+    if method == "geodesic":
+        return geodesic((lat1, lon1), (lat2, lon2)).kilometers
+    if method in ("haversine", "equirectangular"):
+        # Plain math on scalars; numpy's per-call overhead dominates for a single pair
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        delta_lon = math.radians((lon2 - lon1 + 180) % 360 - 180)
+        if method == "equirectangular":
+            return EARTH_MEAN_RADIUS_KM * math.hypot(delta_lon * math.cos((phi1 + phi2) / 2), phi2 - phi1)
+        h = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lon / 2) ** 2
+        return 2 * EARTH_MEAN_RADIUS_KM * math.asin(math.sqrt(min(h, 1.0)))
+    return float(distance_arrays(lat1, lon1, lat2, lon2, method=method))
+
+def calculate_distances(starts, ends, method: str = "haversine") -> np.ndarray:
+    """
+    Batched calculate_distance over arrays of (lat, lon) pairs.
+    `starts` and `ends` are (N, 2) arrays (or one of them a single point).
+    Returns an array of N distances in kilometers.
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+    return distance_arrays(starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1], method=method)
+
+def distance_arrays(lat1, lon1, lat2, lon2, method: str = "haversine") -> np.ndarray:
+    """
+    Vectorized distance between broadcastable coordinate arrays (degrees) with
+    the given method. "geodesic" falls back to geopy per pair and is only meant
+    for small arrays.
+    Returns the distances in kilometers.
+    """
+    if method == "haversine":
+        return haversine_distances(lat1, lon1, lat2, lon2)
+    if method == "equirectangular":
+        return equirectangular_distances(lat1, lon1, lat2, lon2)
+    if method == "vincenty":
+        return vincenty_distances(lat1, lon1, lat2, lon2)
+    if method == "geodesic":
+        lat1, lon1, lat2, lon2 = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64)
+                                                       for value in (lat1, lon1, lat2, lon2)))
+        distances = np.empty(lat1.shape)
+        for index in np.ndindex(lat1.shape):
+            distances[index] = geodesic((lat1[index], lon1[index]), (lat2[index], lon2[index])).kilometers
+        return distances
+    raise ValueError(f"Unknown distance method: {method}")
+
+def path_distance(points, method: str = "vincenty") -> float:
+    """
+    Length of a path through (lat, lon) points, leg by leg.
+    Defaults to Vincenty, which matches the geodesic to well under a millimetre
+    while staying vectorized; used for the distances reported to clients.
     Returns the distance in kilometers.
     """
-    point1 = (lat1, lon1)
-    point2 = (lat2, lon2)
-    return geodesic(point1, point2).kilometers
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 2:
+        return 0.0
+    return float(calculate_distances(points[:-1], points[1:], method=method).sum())
+
+def _longitude_difference(lon1: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """
+    lon2 - lon1 wrapped into [-pi, pi) (inputs in radians).
+    """
+    return (lon2 - lon1 + np.pi) % (2 * np.pi) - np.pi
+
+def equirectangular_distances(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Flat-earth approximation on the mean sphere: the longitude difference is
+    scaled by the cosine of the mean latitude. Cheapest formula, accurate to a
+    fraction of a percent for the few-kilometre hops between pickups in a city.
+    Returns the distances in kilometers.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    x = _longitude_difference(lon1, lon2) * np.cos((lat1 + lat2) / 2)
+    y = lat2 - lat1
+    return EARTH_MEAN_RADIUS_KM * np.hypot(x, y)
+
+def vincenty_distances(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Vectorized Vincenty inverse formula on the WGS-84 ellipsoid.
+    All pairs iterate together until every one has converged; the rare
+    near-antipodal pairs that do not converge are handed to geopy's geodesic.
+    Returns the distances in kilometers.
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64)
+                                                   for value in (lat1, lon1, lat2, lon2)))
+    a = WGS84_EQUATORIAL_RADIUS_KM
+    f = WGS84_FLATTENING
+    b = a * (1 - f)
+
+    longitude_diff = _longitude_difference(np.radians(lon1), np.radians(lon2))
+    reduced1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    reduced2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sin_u1, cos_u1 = np.sin(reduced1), np.cos(reduced1)
+    sin_u2, cos_u2 = np.sin(reduced2), np.cos(reduced2)
+
+    lam = longitude_diff
+    converged = np.zeros(lam.shape, dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(VINCENTY_MAX_ITERATIONS):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cos_u1 * cos_u2 * sin_lam / sin_sigma)
+            cos_sq_alpha = 1 - sin_alpha ** 2
+            # Equatorial lines have cos^2(alpha) = 0 and no midpoint term
+            cos_2sigma_m = np.where(cos_sq_alpha == 0, 0.0, cos_sigma - 2 * sin_u1 * sin_u2 / cos_sq_alpha)
+            c = f / 16 * cos_sq_alpha * (4 + f * (4 - 3 * cos_sq_alpha))
+            previous = lam
+            lam = longitude_diff + (1 - c) * f * sin_alpha * (
+                sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)))
+            converged = np.abs(lam - previous) < VINCENTY_TOLERANCE
+            if converged.all():
+                break
+
+    u_sq = cos_sq_alpha * (a ** 2 - b ** 2) / b ** 2
+    big_a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = big_b * sin_sigma * (cos_2sigma_m + big_b / 4 * (
+        cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+        - big_b / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)))
+    distances = b * big_a * (sigma - delta_sigma)
+
+    failed = ~converged | ~np.isfinite(distances)
+    if failed.any():
+        distances = np.array(distances)
+        distances[failed] = distance_arrays(lat1[failed], lon1[failed], lat2[failed], lon2[failed], method="geodesic")
+    return distances
+
+def _unit_vector(lat, lon):
+    """
+    Cartesian coordinates of points on the unit sphere (inputs in radians).
+    """
+    cos_lat = np.cos(lat)
+    return cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)
+
+def haversine_distances(lat1, lon1, lat2, lon2, ellipsoidal: bool = False,
+                        dtype=np.float64) -> np.ndarray:
+    """
+    Vectorized great-circle distance between coordinate arrays (degrees).
+    Inputs are broadcast against each other, so a column and a row of
+    coordinates produce a full matrix in one pass. Trigonometry is only
+    evaluated per input point; the pairwise work is the haversine term written
+    as a chord length, which keeps large matrices cheap.
+    With `ellipsoidal=True`, Lambert's formula corrects the spherical result
+    for the WGS-84 flattening: under 0.5 m from the geodesic distance up to
+    ~300 km, growing to ~15 m at a quarter of the globe. Its error keeps
+    growing beyond that (kilometres near antipodal points), so pairs further
+    apart than LAMBERT_MAX_ANGLE are measured with Vincenty instead.
+    `dtype` is the type of the result only: the math always runs in float64,
+    since float32 trigonometry is off by up to half the distance at short range.
+    Returns the distances in kilometers.
+    """
+    degrees = (lat1, lon1, lat2, lon2)
+    lat1 = np.radians(np.asarray(lat1, dtype=np.float64))
+    lon1 = np.radians(np.asarray(lon1, dtype=np.float64))
+    lat2 = np.radians(np.asarray(lat2, dtype=np.float64))
+    lon2 = np.radians(np.asarray(lon2, dtype=np.float64))
+
+    if ellipsoidal:
+        # Work on reduced (parametric) latitudes for the ellipsoid
+        lat1 = np.arctan((1 - WGS84_FLATTENING) * np.tan(lat1))
+        lat2 = np.arctan((1 - WGS84_FLATTENING) * np.tan(lat2))
+
+    x1, y1, z1 = _unit_vector(lat1, lon1)
+    x2, y2, z2 = _unit_vector(lat2, lon2)
+    # Haversine term h = sin^2(sigma / 2) = chord^2 / 4
+    h = ((x1 - x2) ** 2 + (y1 - y2) ** 2 + (z1 - z2) ** 2) / 4
+    h = np.clip(h, 0, 1)
+    sin_half = np.sqrt(h)
+    central_angle = 2 * np.arcsin(sin_half)
+
+    if not ellipsoidal:
+        return (EARTH_MEAN_RADIUS_KM * central_angle).astype(dtype, copy=False)
+
+    # sin(P)cos(Q) and cos(P)sin(Q) with P, Q the half sum/difference of the latitudes
+    sum_term = ((z1 + z2) / 2) ** 2
+    diff_term = ((z2 - z1) / 2) ** 2
+    cos_half_sq = 1 - h
+    sin_angle = 2 * sin_half * np.sqrt(cos_half_sq)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = (central_angle - sin_angle) * sum_term / cos_half_sq
+        y = (central_angle + sin_angle) * diff_term / h
+    x = np.where(cos_half_sq == 0, 0, x)
+    y = np.where(h == 0, 0, y)
+    distance = WGS84_EQUATORIAL_RADIUS_KM * (central_angle - WGS84_FLATTENING / 2 * (x + y))
+
+    far = central_angle > LAMBERT_MAX_ANGLE
+    if far.any():
+        distance = np.array(distance, dtype=np.float64)
+        points = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64) for value in degrees))
+        distance[far] = vincenty_distances(*(point[far] for point in points))
+    return distance.astype(dtype, copy=False)
+
+def haversine_matrix(locations: List[Tuple[float, float]], ellipsoidal: bool = False,
+                     dtype=np.float64, condensed: bool = False) -> np.ndarray:
+    """
+    Build the pairwise great-circle distance matrix (km) for a list of (lat, lon) points.
+    The full N x N matrix is filled by broadcasting blocks of rows against all
+    points, which keeps the intermediate arrays small for large N.
+    With `condensed=True`, only the upper triangle is computed and returned as a
+    flat array in the same layout as scipy's `pdist` (half the memory).
+    """
+    coords = np.asarray(locations, dtype=np.float64).reshape(-1, 2)
+    lat, lon = coords[:, 0], coords[:, 1]
+    n = len(coords)
+
+    if not condensed:
+        matrix = np.empty((n, n), dtype=dtype)
+        for start in range(0, n, MATRIX_BLOCK_ROWS):
+            stop = min(start + MATRIX_BLOCK_ROWS, n)
+            matrix[start:stop] = haversine_distances(lat[start:stop, None], lon[start:stop, None],
+                                                     lat[None, :], lon[None, :],
+                                                     ellipsoidal=ellipsoidal, dtype=dtype)
+        np.fill_diagonal(matrix, 0)
+        return matrix
+
+    result = np.empty(n * (n - 1) // 2, dtype=dtype)
+    offset = 0
+    for i in range(n - 1):
+        count = n - i - 1
+        result[offset:offset + count] = haversine_distances(lat[i], lon[i], lat[i + 1:], lon[i + 1:],
+                                                            ellipsoidal=ellipsoidal, dtype=dtype)
+        offset += count
+    return result
+
+def _google_geocode(address: str) -> dict:
+    """
+    Geocode a single address with the Google Maps client.
+    Raises ValueError if the address cannot be found.
+    """
+    geocode_result = gmaps.geocode(address)
+    if not geocode_result:
+        raise ValueError("Address not found")
+    location = geocode_result[0]['geometry']['location']
+    return {
+        "latitude": location['lat'],
+        "longitude": location['lng'],
+        "place_id": geocode_result[0].get('place_id'),
+        "formatted_address": geocode_result[0].get('formatted_address')
+    }
+
+# Shared geocoding cache; tests can swap in a stub with geocode_cache.set_provider()
+geocode_cache = GeocodeCache(provider=_google_geocode)
+
+def _uses_mock_geocoding() -> bool:
+    return not gmaps and geocode_cache.provider is _google_geocode
 
-def address_to_coords(address: str) -> tuple:
+def address_to_coords(address: str, db: Optional[Session] = None) -> tuple:
     """
     Convert a human-readable address to geographical coordinates (latitude, longitude).
+    Results are cached in memory and, when a session is given, in the geocode_cache table.
     Uses mock data if Google Maps client is not available.
     """
-    if not gmaps:
+    if _uses_mock_geocoding():
         print(f"Mocking coordinates for address: {address}")
         return (24.7136, 46.6753)  # Riyadh, Saudi Arabia (Mocked)
     try:
-        geocode_result = gmaps.geocode(address)
-        if geocode_result:
-            location = geocode_result[0]['geometry']['location']
-            return location['lat'], location['lng']
-        else:
-            raise ValueError("Address not found")
+        result = geocode_cache.lookup(address, db)
+        return result['latitude'], result['longitude']
     except Exception as e:
         raise ValueError(f"Error in geocoding address: {str(e)}")
 
+def batch_address_to_coords(addresses: List[str], db: Optional[Session] = None) -> Dict[str, Optional[tuple]]:
+    """
+    Convert many addresses to coordinates in one pass through the geocoding cache.
+    Duplicates are resolved once and only cache misses reach the provider.
+    Returns a mapping of each address to (latitude, longitude), or None if not found.
+    """
+    if _uses_mock_geocoding():
+        print(f"Mocking coordinates for {len(addresses)} addresses")
+        return {address: (24.7136, 46.6753) for address in addresses}  # Riyadh, Saudi Arabia (Mocked)
+    try:
+        results = geocode_cache.lookup_many(addresses, db)
+        return {
+            address: (result['latitude'], result['longitude']) if result else None
+            for address, result in results.items()
+        }
+    except Exception as e:
+        raise ValueError(f"Error in geocoding addresses: {str(e)}")
+
 def coords_to_address(lat: float, lon: float) -> str:
     """
     Convert geographical coordinates to a human-readable address.
@@ -59,8 +342,12 @@ def coords_to_address(lat: float, lon: float) -> str:
 def get_route(start_coords: tuple, end_coords: tuple) -> dict:
     """
     Retrieve an optimized route between two coordinates.
-    Uses mock data if Google Maps client is not available.
+    Uses the local road network when ROUTING_ENGINE=local is configured,
+    otherwise Google directions, or mock data if the client is not available.
     """
+    road_network = get_road_network()
+    if road_network is not None:
+        return road_network.route(start_coords, end_coords)
     if not gmaps:
         print(f"Mocking route from {start_coords} to {end_coords}")
         return {
@@ -92,3 +379,75 @@ def get_route(start_coords: tuple, end_coords: tuple) -> dict:
             raise ValueError("No route found")
     except Exception as e:
         raise ValueError(f"Error in fetching route: {str(e)}")
+
+async def address_to_coords_async(address: str) -> tuple:
+    """
+    Non-blocking address_to_coords for async request handlers.
+    Served from the in-memory geocoding cache when possible, otherwise through
+    the shared AsyncGeoClient (pooled, coalesced, with timeouts and retries).
+    """
+    result = geocode_cache.peek(address)
+    if result is None:
+        try:
+            result = await geo_client.geocode(address)
+        except ValueError as e:
+            raise ValueError(f"Error in geocoding address: {str(e)}")
+        geocode_cache.store(address, result)
+    return result['latitude'], result['longitude']
+
+async def batch_address_to_coords_async(addresses: List[str]) -> Dict[str, Optional[tuple]]:
+    """
+    Non-blocking batch_address_to_coords: cache misses are geocoded concurrently.
+    Returns a mapping of each address to (latitude, longitude), or None if not found.
+    """
+    cached = {address: geocode_cache.peek(address) for address in addresses}
+    missing = [address for address, result in cached.items() if result is None]
+    if missing:
+        for address, result in (await geo_client.geocode_many(missing)).items():
+            if result is not None:
+                geocode_cache.store(address, result)
+            cached[address] = result
+    return {
+        address: (result['latitude'], result['longitude']) if result else None
+        for address, result in cached.items()
+    }
+
+async def coords_to_address_async(lat: float, lon: float) -> str:
+    """
+    Non-blocking coords_to_address through the shared AsyncGeoClient.
+    """
+    try:
+        return await geo_client.reverse_geocode(lat, lon)
+    except ValueError as e:
+        raise ValueError(f"Error in reverse geocoding: {str(e)}")
+
+async def get_route_async(start_coords: tuple, end_coords: tuple) -> dict:
+    """
+    Non-blocking get_route: the local road network when configured, otherwise
+    directions through the shared AsyncGeoClient.
+    """
+    road_network = get_road_network()
+    if road_network is not None:
+        return road_network.route(start_coords, end_coords)
+    try:
+        return await geo_client.route(start_coords, end_coords)
+    except ValueError as e:
+        raise ValueError(f"Error in fetching route: {str(e)}")
+
+async def get_route_legs_async(waypoints: List[tuple]) -> List[dict]:
+    """
+    Distance (km) and duration (s) of every leg between consecutive waypoints:
+    the local road network when configured, otherwise multi-waypoint
+    directions requests through the shared AsyncGeoClient.
+    """
+    road_network = get_road_network()
+    if road_network is not None:
+        legs = list(zip(waypoints[:-1], waypoints[1:]))
+        return [
+            {"distance_km": distance, "duration_seconds": duration}
+            for distance, duration in road_network.leg_totals(legs)
+        ]
+    try:
+        return await geo_client.route_legs(waypoints)
+    except ValueError as e:
+        raise ValueError(f"Error in fetching route: {str(e)}")
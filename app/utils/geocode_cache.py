@@ -0,0 +1,228 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.models.geocode_cache import GeocodeCacheEntry
+from app.utils.config_loader import get_config
+from app.utils.logger import log_warning, route_logger
+
+# Cache configuration
+GEOCODE_CACHE_SIZE = int(get_config("GEOCODE_CACHE_SIZE", "10000"))  # Entries kept in process memory
+GEOCODE_CACHE_TTL_SECONDS = int(get_config("GEOCODE_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+# A provider resolves one address to a dict with latitude, longitude, place_id and
+# formatted_address, and raises ValueError when the address cannot be found.
+GeocodeProvider = Callable[[str], dict]
+
+def normalize_address(address: str) -> str:
+    """
+    Normalize an address string into a cache key (case, whitespace and comma spacing).
+    """
+    key = re.sub(r"\s+", " ", address.strip().lower())
+    key = re.sub(r"\s*,\s*", ", ", key)
+    return key[:255]
+
+class _InFlightLookup:
+    """
+    A provider call that other threads asking for the same address wait on.
+    """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[dict] = None
+        self.error: Optional[Exception] = None
+
+class GeocodeCache:
+    """
+    Two-level geocoding cache: an in-process LRU in front of the geocode_cache table.
+    Only addresses missing from both levels reach the provider, and concurrent
+    lookups of the same address share a single provider call.
+    """
+    def __init__(self, provider: GeocodeProvider, maxsize: int = GEOCODE_CACHE_SIZE,
+                 ttl_seconds: int = GEOCODE_CACHE_TTL_SECONDS):
+        self.provider = provider
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (result, expires_at)
+        self._inflight: Dict[str, _InFlightLookup] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "db_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    def set_provider(self, provider: GeocodeProvider):
+        """
+        Swap the provider (e.g. a local stub in tests) and drop cached results.
+        """
+        with self._lock:
+            self.provider = provider
+            self._entries.clear()
+
+    def clear(self):
+        """
+        Drop all in-memory entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters and the current in-memory size.
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["db_hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "hit_rate": (self._stats["hits"] + self._stats["db_hits"]) / lookups if lookups else 0.0
+            }
+
+    def peek(self, address: str) -> Optional[dict]:
+        """
+        In-memory result for an address, without touching the database or the provider.
+        """
+        return self._get_memory(normalize_address(address))
+
+    def store(self, address: str, result: dict):
+        """
+        Put a result obtained elsewhere (e.g. the async geo client) into the memory cache.
+        """
+        self._put_memory(normalize_address(address), result)
+
+    def _get_memory(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            result, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return result
+
+    def _put_memory(self, key: str, result: dict, expires_at: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (result, expires_at or time.time() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _resolve(self, key: str, address: str) -> dict:
+        """
+        Ask the provider for one address, sharing the call with concurrent lookups.
+        """
+        with self._lock:
+            inflight = self._inflight.get(key)
+            owner = inflight is None
+            if owner:
+                inflight = self._inflight[key] = _InFlightLookup()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not owner:
+            inflight.done.wait()
+            if inflight.error:
+                raise inflight.error
+            return inflight.result
+
+        try:
+            inflight.result = self.provider(address)
+            self._put_memory(key, inflight.result)
+            return inflight.result
+        except Exception as e:
+            inflight.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            inflight.done.set()
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def lookup_many(self, addresses: List[str], db: Optional[Session] = None) -> Dict[str, Optional[dict]]:
+        """
+        Resolve many addresses at once.
+        Memory hits are served directly, the rest are read from the database in one
+        query, and only the remaining misses are sent to the provider. New results
+        are written back to the database when a session is given.
+        Returns a mapping of each input address to its result (None if not found).
+        """
+        keys = {address: normalize_address(address) for address in addresses}
+        results: Dict[str, Optional[dict]] = {}
+        pending: Dict[str, str] = {}  # key -> original address
+        for address, key in keys.items():
+            if key in results or key in pending:
+                continue
+            cached = self._get_memory(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = address
+
+        stored_rows: Dict[str, GeocodeCacheEntry] = {}
+        if db is not None and pending:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+            rows = db.query(GeocodeCacheEntry).filter(GeocodeCacheEntry.address_key.in_(list(pending))).all()
+            for row in rows:
+                stored_rows[row.address_key] = row
+                if row.created_at and row.created_at >= cutoff:
+                    result = {
+                        "latitude": row.latitude,
+                        "longitude": row.longitude,
+                        "place_id": row.place_id,
+                        "formatted_address": row.formatted_address
+                    }
+                    expires_at = time.time() - (datetime.utcnow() - row.created_at).total_seconds() + self.ttl_seconds
+                    self._put_memory(row.address_key, result, expires_at)
+                    results[row.address_key] = result
+                    with self._lock:
+                        self._stats["db_hits"] += 1
+                    del pending[row.address_key]
+
+        fetched: Dict[str, dict] = {}
+        for key, address in pending.items():
+            try:
+                fetched[key] = results[key] = self._resolve(key, address)
+            except ValueError:
+                results[key] = None
+
+        if db is not None and fetched:
+            try:
+                now = datetime.utcnow()
+                for key, result in fetched.items():
+                    row = stored_rows.get(key)
+                    if row is None:
+                        row = GeocodeCacheEntry(address_key=key)
+                        db.add(row)
+                    row.latitude = result["latitude"]
+                    row.longitude = result["longitude"]
+                    row.place_id = result.get("place_id")
+                    row.formatted_address = (result.get("formatted_address") or "")[:255] or None
+                    row.created_at = now
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                log_warning(f"Could not persist geocode cache entries: {str(e)}", route_logger)
+
+        return {address: results.get(key) for address, key in keys.items()}
+
+    def lookup(self, address: str, db: Optional[Session] = None) -> dict:
+        """
+        Resolve a single address through the cache.
+        Raises ValueError if the provider cannot find it.
+        """
+        key = normalize_address(address)
+        cached = self._get_memory(key)
+        if cached is not None:
+            return cached
+        if db is None:
+            return self._resolve(key, address)
+        result = self.lookup_many([address], db)[address]
+        if result is None:
+            raise ValueError("Address not found")
+        return result
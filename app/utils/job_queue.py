@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.utils.config_loader import get_config
+from app.utils.logger import log_info, route_logger
+from app.utils.routing import (
+    optimize_tour,
+    solve_cvrp,
+    knapsack_capacity,
+    combine_orders,
+    calculate_route_matrix
+)
+
+# Worker pool configuration
+JOB_WORKERS = int(get_config("JOB_WORKERS", str(os.cpu_count() or 1)))
+JOB_MAX_PENDING = int(get_config("JOB_MAX_PENDING", "100"))  # Jobs queued or running at once
+JOB_RETENTION_SECONDS = int(get_config("JOB_RETENTION_SECONDS", "3600"))  # How long finished jobs stay queryable
+
+FINISHED_JOB_STATUSES = ("completed", "failed", "cancelled")
+
+def _execute_job(job_type: str, payload: dict, time_limit_ms: int) -> dict:
+    """
+    Runs one optimization problem inside a worker process within its time budget.
+    Returns the solver result, its statistics and the time it took.
+    """
+    started = time.perf_counter()
+    stats = {}
+    if job_type == "tour":
+        result = optimize_tour(payload["locations"], closed=payload.get("closed", False),
+                               time_limit_ms=time_limit_ms, stats=stats)
+    elif job_type == "fleet":
+        result = solve_cvrp(calculate_route_matrix(payload["locations"]), payload["demands"], payload["capacities"],
+                            depot=0, time_limit_ms=time_limit_ms)
+        stats = result.pop("stats")
+    elif job_type == "load":
+        result = knapsack_capacity(payload["items"], payload["max_weight"], mode=payload.get("mode", "auto"),
+                                   time_limit_ms=time_limit_ms, stats=stats)
+    elif job_type == "order_groups":
+        result = combine_orders(payload["orders"], payload["max_capacity"], strategy=payload.get("strategy", "best_fit"),
+                                cell_size_km=payload.get("cell_size_km"), time_limit_ms=time_limit_ms, stats=stats)
+    else:
+        raise ValueError(f"Unknown job type: {job_type}")
+    return {"result": result, "stats": stats, "elapsed_ms": (time.perf_counter() - started) * 1000}
+
+class _Job:
+    """
+    Bookkeeping for a submitted job; the outcome lives on its future.
+    """
+    def __init__(self, job_id: str, job_type: str, time_limit_ms: int, future: Future):
+        self.job_id = job_id
+        self.job_type = job_type
+        self.time_limit_ms = time_limit_ms
+        self.future = future
+        self.submitted_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.cancelled = False
+
+class OptimizationJobQueue:
+    """
+    Runs CPU-heavy solver calls in a process pool so they do not hold the GIL
+    of the API workers. Jobs are tracked in memory by ID until
+    JOB_RETENTION_SECONDS after they finish.
+    Every solver honours the job's time budget, so a job that is cancelled while
+    running frees its worker by the end of that budget at the latest (processes
+    cannot be interrupted mid-call); its result is discarded.
+    """
+    def __init__(self, max_workers: int = JOB_WORKERS, max_pending: int = JOB_MAX_PENDING,
+                 retention_seconds: int = JOB_RETENTION_SECONDS):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            log_info(f"Started optimization worker pool with {self.max_workers} processes", route_logger)
+        return self._executor
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at.timestamp() < cutoff:
+                del self._jobs[job_id]
+
+    def submit(self, job_type: str, payload: dict, time_limit_ms: int) -> dict:
+        """
+        Queue a job and return its initial state.
+        Raises RuntimeError when too many jobs are already pending.
+        """
+        with self._lock:
+            self._prune()
+            pending = sum(1 for job in self._jobs.values() if not job.future.done())
+            if pending >= self.max_pending:
+                raise RuntimeError("Too many optimization jobs in progress")
+            job_id = uuid.uuid4().hex
+            future = self._pool().submit(_execute_job, job_type, payload, time_limit_ms)
+            job = self._jobs[job_id] = _Job(job_id, job_type, time_limit_ms, future)
+
+        def finished(_):
+            job.finished_at = job.finished_at or datetime.utcnow()
+        future.add_done_callback(finished)
+        return self._snapshot(job)
+
+    def run_many(self, job_type: str, payloads: List[dict], time_limit_ms: int) -> List[dict]:
+        """
+        Solve independent problems in parallel on the worker pool and wait for all of them.
+        These are not tracked as jobs; results come back in payload order.
+        """
+        futures = [self._pool().submit(_execute_job, job_type, payload, time_limit_ms) for payload in payloads]
+        return [future.result() for future in futures]
+
+    def get(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        return self._snapshot(job) if job else None
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """
+        Cancel a job. Queued jobs never start; running jobs have their result discarded.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if not job.future.done():
+            job.future.cancel()
+            job.cancelled = True
+            job.finished_at = datetime.utcnow()
+        return self._snapshot(job)
+
+    def shutdown(self):
+        """
+        Stop the worker processes, dropping jobs that have not started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _snapshot(job: _Job) -> dict:
+        state = {
+            "job_id": job.job_id,
+            "type": job.job_type,
+            "time_limit_ms": job.time_limit_ms,
+            "submitted_at": job.submitted_at,
+            "finished_at": job.finished_at,
+            "elapsed_ms": None,
+            "result": None,
+            "stats": None,
+            "error": None
+        }
+        future = job.future
+        if job.cancelled or future.cancelled():
+            state["status"] = "cancelled"
+        elif future.done():
+            error = future.exception()
+            if error is not None:
+                state.update(status="failed", error=str(error) or type(error).__name__)
+            else:
+                state.update(status="completed", **future.result())
+        else:
+            state["status"] = "running" if future.running() else "queued"
+        return state
+
+# Shared job queue used by the routing service
+optimization_jobs = OptimizationJobQueue()
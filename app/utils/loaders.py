@@ -0,0 +1,16 @@
+from sqlalchemy.orm import raiseload
+from app.utils.config_loader import get_config
+
+# Loader configuration
+STRICT_LOADING = get_config("STRICT_LOADING", "false").lower() in ("1", "true", "yes")  # Lazy loads raise (use in tests)
+
+def response_loaders(*options) -> tuple:
+    """
+    Loader options for a query whose rows are serialized into a response.
+    Under STRICT_LOADING every relationship not eagerly loaded by `options`
+    raises on access, so a schema field that would lazy load (one query per
+    row) fails instead of silently issuing N+1 queries.
+    """
+    if STRICT_LOADING:
+        return (*options, raiseload("*"))
+    return options
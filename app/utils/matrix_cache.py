@@ -0,0 +1,125 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Sequence, Tuple
+import numpy as np
+from app.utils.config_loader import get_config
+from app.utils.geo_utils import MATRIX_BLOCK_ROWS, haversine_distances, haversine_matrix
+
+# Cache limits
+MATRIX_CACHE_MAX_BYTES = int(get_config("MATRIX_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+MATRIX_CACHE_MAX_ENTRY_BYTES = int(get_config("MATRIX_CACHE_MAX_ENTRY_BYTES", str(64 * 1024 * 1024)))
+
+# Decimal places kept when coordinates are used as stop keys (~1 m)
+STOP_KEY_PRECISION = 5
+
+def stop_key(location: Tuple[float, float]) -> Tuple[float, float]:
+    """
+    Identity of a stop given by its coordinates, rounded to about a metre.
+    """
+    return (round(float(location[0]), STOP_KEY_PRECISION), round(float(location[1]), STOP_KEY_PRECISION))
+
+class _MatrixEntry:
+    """
+    A cached matrix together with the stop keys of its rows/columns.
+    """
+    def __init__(self, keys: List[Hashable], matrix: np.ndarray):
+        self.keys = keys
+        self.matrix = matrix
+        self.index = {}
+        for position, key in enumerate(keys):
+            self.index.setdefault(key, position)
+
+class DistanceMatrixCache:
+    """
+    Distance matrices cached per context (e.g. a mission), with rows keyed by stop identity.
+    When the stop set of a context changes, rows for stops that were already known
+    are copied from the cached matrix and only the rows and columns of new stops
+    are computed, so adding a stop costs O(n) distance evaluations instead of O(n^2).
+    Entries are evicted least-recently-used once the total size exceeds the limit.
+    """
+    def __init__(self, max_bytes: int = MATRIX_CACHE_MAX_BYTES, max_entry_bytes: int = MATRIX_CACHE_MAX_ENTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[Hashable, _MatrixEntry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "incremental": 0, "misses": 0, "rows_computed": 0, "evictions": 0}
+
+    def get_matrix(self, context: Hashable, locations: Sequence[Tuple[float, float]],
+                   keys: Optional[Sequence[Hashable]] = None) -> np.ndarray:
+        """
+        Distance matrix (km) for the locations of a context, reusing cached rows.
+        `keys` identify the stops (e.g. address IDs); rounded coordinates are used by default.
+        The returned array is shared with the cache and must not be modified.
+        """
+        keys = list(keys) if keys is not None else [stop_key(location) for location in locations]
+        coords = np.asarray(locations, dtype=np.float64).reshape(-1, 2)
+        n = len(keys)
+
+        with self._lock:
+            entry = self._entries.get(context)
+            if entry is not None:
+                self._entries.move_to_end(context)
+        if entry is not None and entry.keys == keys:
+            self._count("hits")
+            return entry.matrix
+
+        old_positions = np.array([entry.index.get(key, -1) for key in keys] if entry else [-1] * n, dtype=np.int64)
+        known = np.flatnonzero(old_positions >= 0)
+        new = np.flatnonzero(old_positions < 0)
+
+        if not len(known):
+            matrix = haversine_matrix(coords)
+        else:
+            matrix = np.empty((n, n), dtype=np.float64)
+            matrix[np.ix_(known, known)] = entry.matrix[np.ix_(old_positions[known], old_positions[known])]
+            # Rows for the new stops against every stop, mirrored into the columns
+            for block_start in range(0, len(new), MATRIX_BLOCK_ROWS):
+                block = new[block_start:block_start + MATRIX_BLOCK_ROWS]
+                rows = haversine_distances(coords[block, 0][:, None], coords[block, 1][:, None],
+                                           coords[None, :, 0], coords[None, :, 1])
+                matrix[block, :] = rows
+                matrix[:, block] = rows.T
+            matrix[new, new] = 0
+        self._count("incremental" if len(known) else "misses")
+        self._count("rows_computed", len(new))
+
+        self._store(context, _MatrixEntry(keys, matrix))
+        return matrix
+
+    def invalidate(self, context: Hashable):
+        """
+        Forget the cached matrix of a context.
+        """
+        with self._lock:
+            entry = self._entries.pop(context, None)
+            if entry is not None:
+                self._size -= entry.matrix.nbytes
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters and the current memory use.
+        """
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "bytes": self._size}
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _store(self, context: Hashable, entry: _MatrixEntry):
+        with self._lock:
+            previous = self._entries.pop(context, None)
+            if previous is not None:
+                self._size -= previous.matrix.nbytes
+            if entry.matrix.nbytes > self.max_entry_bytes:
+                return
+            self._entries[context] = entry
+            self._size += entry.matrix.nbytes
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.matrix.nbytes
+                self._stats["evictions"] += 1
+
+# Shared cache used by the routing service
+distance_matrix_cache = DistanceMatrixCache()
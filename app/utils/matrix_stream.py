@@ -0,0 +1,49 @@
+from typing import Iterator
+import numpy as np
+
+# Media types offered by the distance-matrix endpoint besides plain JSON
+BINARY_MATRIX_MEDIA_TYPE = "application/octet-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+MATRIX_STREAM_CHUNK_BYTES = 1 << 20  # Bytes per chunk of the binary stream
+NDJSON_ROWS_PER_CHUNK = 64  # Matrix rows serialized per NDJSON chunk
+NDJSON_DECIMALS = 6  # Kilometers to the millimetre
+
+def preferred_matrix_format(accept: str) -> str:
+    """
+    Picks "binary", "ndjson" or "json" from an Accept header.
+    Plain JSON stays the default for clients that do not ask for anything else.
+    """
+    accept = (accept or "").lower()
+    if BINARY_MATRIX_MEDIA_TYPE in accept:
+        return "binary"
+    if NDJSON_MEDIA_TYPE in accept:
+        return "ndjson"
+    return "json"
+
+def as_little_endian_float32(matrix: np.ndarray) -> np.ndarray:
+    """
+    C-contiguous little-endian float32 view of a matrix (copies only when needed).
+    """
+    return np.ascontiguousarray(matrix, dtype="<f4")
+
+def iter_matrix_bytes(matrix: np.ndarray, chunk_bytes: int = MATRIX_STREAM_CHUNK_BYTES) -> Iterator[memoryview]:
+    """
+    Yields the raw buffer of a contiguous matrix in chunks, without copying it.
+    """
+    buffer = memoryview(matrix).cast("B")
+    for offset in range(0, len(buffer), chunk_bytes):
+        yield buffer[offset:offset + chunk_bytes]
+
+def iter_matrix_ndjson(matrix: np.ndarray, rows_per_chunk: int = NDJSON_ROWS_PER_CHUNK,
+                       decimals: int = NDJSON_DECIMALS) -> Iterator[str]:
+    """
+    Yields the matrix as newline-delimited JSON, one array per row.
+    Values are written with a fixed number of decimals through a single format
+    string per row, which is several times faster (and smaller) than json.dumps
+    on full-precision floats. Only one block of rows is converted at a time.
+    """
+    row_format = "[" + ",".join([f"%.{decimals}f"] * matrix.shape[1]) + "]\n"
+    for start in range(0, len(matrix), rows_per_chunk):
+        rows = matrix[start:start + rows_per_chunk].tolist()
+        yield "".join(row_format % tuple(row) for row in rows)
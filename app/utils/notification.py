@@ -1,7 +1,10 @@
 from app.models.notification import Notification
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime
+from app.utils.pagination import PageParams, paginate, paginate_async
 
 def send_notification(db: Session, recipient_id: int, message: str, notification_type: str = "GENERAL") -> Notification:
     """
@@ -91,13 +94,35 @@ def delete_notification(db: Session, notification_id: int) -> bool:
         db.rollback()
         raise RuntimeError(f"Error deleting notification: {str(e)}")
 
-def get_all_notifications(db: Session, user_id: int) -> List[Notification]:
+def get_all_notifications(db: Session, user_id: int, page: Optional[PageParams] = None) -> dict:
     """
-    Retrieve all notifications for a user.
+    Retrieve a user's notifications, newest first, one keyset page at a time.
     """
     try:
-        return db.query(Notification).filter(
-            Notification.recipient_id == user_id
-        ).order_by(Notification.created_at.desc()).all()
+        query = db.query(Notification).filter(Notification.recipient_id == user_id)
+        return paginate(query, Notification.created_at, Notification.id, page or PageParams())
+    except Exception as e:
+        raise RuntimeError(f"Error retrieving all notifications: {str(e)}")
+
+async def get_unread_notifications_async(db: AsyncSession, user_id: int) -> List[Notification]:
+    """
+    Async variant of get_unread_notifications.
+    """
+    try:
+        result = await db.execute(select(Notification).where(
+            Notification.recipient_id == user_id,
+            Notification.is_read == False
+        ))
+        return list(result.scalars().all())
+    except Exception as e:
+        raise RuntimeError(f"Error retrieving unread notifications: {str(e)}")
+
+async def get_all_notifications_async(db: AsyncSession, user_id: int, page: Optional[PageParams] = None) -> dict:
+    """
+    Async variant of get_all_notifications.
+    """
+    try:
+        statement = select(Notification).where(Notification.recipient_id == user_id)
+        return await paginate_async(db, statement, Notification.created_at, Notification.id, page or PageParams())
     except Exception as e:
         raise RuntimeError(f"Error retrieving all notifications: {str(e)}")
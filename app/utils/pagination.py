@@ -0,0 +1,99 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import Select
+from app.utils.config_loader import get_config
+
+# Pagination configuration
+DEFAULT_PAGE_SIZE = int(get_config("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(get_config("MAX_PAGE_SIZE", "500"))  # Upper bound on ?limit=
+
+class PageParams:
+    """
+    A keyset page request: up to `limit` rows that come after `after`, the
+    (sort value, id) key of the previous page's last row, newest first.
+    """
+    def __init__(self, after: Optional[Tuple[Optional[datetime], int]] = None,
+                 limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False):
+        self.after = after
+        self.limit = max(1, min(limit, MAX_PAGE_SIZE))
+        self.include_total = include_total
+
+def encode_cursor(sort_value: Optional[datetime], row_id: int) -> str:
+    """
+    Opaque, URL-safe cursor for the row with this (sort value, id) key.
+    """
+    payload = json.dumps([sort_value.isoformat() if sort_value else None, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Inverse of encode_cursor. Raises ValueError for anything it did not produce.
+    """
+    try:
+        payload = base64.urlsafe_b64decode((cursor + "=" * (-len(cursor) % 4)).encode())
+        sort_value, row_id = json.loads(payload)
+        return (datetime.fromisoformat(sort_value) if sort_value is not None else None), int(row_id)
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+
+def _after(sort_column, id_column, after: Tuple[Optional[datetime], int]):
+    """
+    Rows after the key in (sort_column, id_column) descending order, among rows
+    that have a sort value when the key has one. Written as a range on
+    sort_column so the (sort, id) index is searched rather than scanned.
+    """
+    sort_value, row_id = after
+    if sort_value is None:
+        return and_(sort_column.is_(None), id_column < row_id)
+    return and_(sort_column <= sort_value, or_(sort_column < sort_value, id_column < row_id))
+
+def _page(rows: list, sort_column, id_column, page: PageParams, total: Optional[int]) -> dict:
+    # One row beyond the limit is fetched only to tell whether another page exists
+    items = rows[:page.limit]
+    next_cursor = None
+    if len(rows) > page.limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return {"items": items, "next_cursor": next_cursor, "total": total}
+
+def paginate(query: Query, sort_column, id_column, page: PageParams) -> dict:
+    """
+    One page of `query` in (sort_column, id_column) descending order, rows
+    without a sort value last (as MySQL and SQLite order NULLs).
+    Reads at most limit + 1 rows however large the table is; the total is a
+    separate COUNT over the unpaginated query, run only when requested.
+    """
+    total = query.order_by(None).count() if page.include_total else None
+    ordered = query.order_by(sort_column.desc(), id_column.desc())
+    if page.after is None:
+        rows = ordered.limit(page.limit + 1).all()
+    else:
+        rows = ordered.filter(_after(sort_column, id_column, page.after)).limit(page.limit + 1).all()
+        if len(rows) <= page.limit and page.after[0] is not None:
+            # Past the last dated row: continue with the undated ones (a separate indexed lookup)
+            rows += ordered.filter(sort_column.is_(None)).limit(page.limit + 1 - len(rows)).all()
+    return _page(rows, sort_column, id_column, page, total)
+
+async def paginate_async(db: AsyncSession, statement: Select, sort_column, id_column, page: PageParams) -> dict:
+    """
+    paginate for a select() statement on an AsyncSession.
+    """
+    total = None
+    if page.include_total:
+        total = await db.scalar(select(func.count()).select_from(statement.order_by(None).subquery()))
+    ordered = statement.order_by(sort_column.desc(), id_column.desc())
+    if page.after is None:
+        rows = list((await db.execute(ordered.limit(page.limit + 1))).scalars().all())
+    else:
+        result = await db.execute(ordered.where(_after(sort_column, id_column, page.after)).limit(page.limit + 1))
+        rows = list(result.scalars().all())
+        if len(rows) <= page.limit and page.after[0] is not None:
+            result = await db.execute(ordered.where(sort_column.is_(None)).limit(page.limit + 1 - len(rows)))
+            rows += list(result.scalars().all())
+    return _page(rows, sort_column, id_column, page, total)
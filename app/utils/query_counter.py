@@ -0,0 +1,50 @@
+from contextvars import ContextVar
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.config_loader import get_config
+from app.utils.logger import log_warning, app_logger
+
+# Query counting configuration
+QUERY_COUNT_WARNING = int(get_config("QUERY_COUNT_WARNING", "20"))  # Statements per request worth a warning
+
+# Statement count of the current request; a one-element list so that copies of
+# the context (threadpool handlers, dependencies) share the same counter
+_query_count: ContextVar[Optional[List[int]]] = ContextVar("query_count", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+def start_query_count():
+    """
+    Start counting statements for the current context. Returns the token to
+    pass to stop_query_count.
+    """
+    return _query_count.set([0])
+
+def current_query_count() -> Optional[int]:
+    counter = _query_count.get()
+    return None if counter is None else counter[0]
+
+def stop_query_count(token) -> int:
+    count = current_query_count() or 0
+    _query_count.reset(token)
+    return count
+
+async def query_count_middleware(request, call_next):
+    """
+    HTTP middleware reporting the SQL statements a request issued in the
+    X-Query-Count header, with a warning in the API log past QUERY_COUNT_WARNING.
+    """
+    token = start_query_count()
+    try:
+        response = await call_next(request)
+    finally:
+        count = stop_query_count(token)
+    response.headers["X-Query-Count"] = str(count)
+    if count > QUERY_COUNT_WARNING:
+        log_warning(f"{request.method} {request.url.path} issued {count} SQL statements", app_logger)
+    return response
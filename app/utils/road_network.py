@@ -0,0 +1,546 @@
+import argparse
+import csv
+import heapq
+import json
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from scipy.spatial import cKDTree
+from app.utils.config_loader import get_config
+from app.utils.logger import log_info, log_warning, route_logger
+
+# Engine configuration
+ROUTING_ENGINE = get_config("ROUTING_ENGINE", "google").lower()  # "google" or "local"
+ROAD_NETWORK_PATH = get_config("ROAD_NETWORK_PATH", "")  # Directory written by build_road_network
+ROAD_DEFAULT_SPEED_KMH = float(get_config("ROAD_DEFAULT_SPEED_KMH", "40"))  # Used when an edge has no speed
+
+# Nodes settled per witness search while building the contraction hierarchy
+CH_WITNESS_SETTLE_LIMIT = 500
+
+EARTH_RADIUS_KM = 6371.0088
+METRICS = ("distance", "time")  # Edge costs in kilometers and seconds
+
+def _great_circle_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Haversine distance between two points in kilometers (scalar, used by the A* potential).
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    h = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+def _unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+def _csr(sources: np.ndarray, targets: np.ndarray, values: Dict[str, np.ndarray], node_count: int) -> dict:
+    """
+    Compressed sparse row arrays for the edges, grouped by source node.
+    The edges leaving node u are indices[indptr[u]:indptr[u + 1]].
+    """
+    order = np.lexsort((targets, sources))
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+    arrays = {"indptr": indptr, "indices": targets[order].astype(np.int32)}
+    for name, value in values.items():
+        arrays[name] = value[order]
+    return arrays
+
+class _CSRGraph:
+    """
+    Read-only adjacency over CSR arrays (possibly memory-mapped).
+    """
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: Dict[str, np.ndarray]):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+    def edges(self, node: int, metric: str) -> Tuple[List[int], List[float]]:
+        start, end = int(self.indptr[node]), int(self.indptr[node + 1])
+        return self.indices[start:end].tolist(), self.weights[metric][start:end].tolist()
+
+    def edge(self, source: int, target: int, metric: str) -> Tuple[int, float]:
+        """
+        Position and cost of the cheapest source -> target edge.
+        """
+        start, end = int(self.indptr[source]), int(self.indptr[source + 1])
+        matches = np.flatnonzero(self.indices[start:end] == target)
+        if not len(matches):
+            raise KeyError(f"No edge {source} -> {target}")
+        costs = self.weights[metric][start:end][matches]
+        best = int(matches[np.argmin(costs)])
+        return start + best, float(costs.min())
+
+def _witness_search(out_edges: List[dict], source: int, skip: int, limit: float, targets: set) -> Dict[int, float]:
+    """
+    Bounded Dijkstra from source that avoids the node being contracted.
+    The returned tentative distances are lengths of real paths, so any target
+    reached within its shortcut cost does not need the shortcut.
+    """
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    remaining = set(targets)
+    settled = 0
+    while heap and settled < CH_WITNESS_SETTLE_LIMIT:
+        d, node = heapq.heappop(heap)
+        if d > dist[node]:
+            continue
+        if d > limit:
+            break
+        remaining.discard(node)
+        if not remaining:
+            break
+        settled += 1
+        for neighbour, (cost, _) in out_edges[node].items():
+            if neighbour == skip:
+                continue
+            candidate = d + cost
+            if candidate < dist.get(neighbour, math.inf):
+                dist[neighbour] = candidate
+                heapq.heappush(heap, (candidate, neighbour))
+    return dist
+
+def _contract(node_count: int, sources: np.ndarray, targets: np.ndarray, costs: np.ndarray) -> dict:
+    """
+    Contraction hierarchy for one metric.
+    Nodes are contracted in order of edge difference (shortcuts added minus edges
+    removed, plus contracted neighbours), with lazy priority updates. Returns the
+    node ranks and two CSR graphs: upward edges for the forward search and
+    incoming edges from higher-ranked nodes for the backward search. Shortcuts
+    record the contracted middle node so paths can be unpacked.
+    """
+    out_edges: List[dict] = [dict() for _ in range(node_count)]
+    in_edges: List[dict] = [dict() for _ in range(node_count)]
+    for u, v, cost in zip(sources.tolist(), targets.tolist(), costs.tolist()):
+        if cost < out_edges[u].get(v, (math.inf,))[0]:
+            out_edges[u][v] = (cost, -1)
+            in_edges[v][u] = (cost, -1)
+
+    def shortcuts_for(node: int) -> List[Tuple[int, int, float]]:
+        shortcuts = []
+        for u, (cost_in, _) in in_edges[node].items():
+            candidates = {w: cost_in + cost_out for w, (cost_out, _) in out_edges[node].items() if w != u}
+            if not candidates:
+                continue
+            witnesses = _witness_search(out_edges, u, node, max(candidates.values()), set(candidates))
+            for w, cost in candidates.items():
+                if witnesses.get(w, math.inf) > cost:
+                    shortcuts.append((u, w, cost))
+        return shortcuts
+
+    contracted_neighbours = [0] * node_count
+
+    def priority(node: int) -> Tuple[int, list]:
+        shortcuts = shortcuts_for(node)
+        return len(shortcuts) - len(in_edges[node]) - len(out_edges[node]) + contracted_neighbours[node], shortcuts
+
+    heap = [(priority(node)[0], node) for node in range(node_count)]
+    heapq.heapify(heap)
+    rank = np.empty(node_count, dtype=np.int64)
+    up, down = [], []  # (node, neighbour, cost, middle)
+    next_rank = 0
+    while heap:
+        _, node = heapq.heappop(heap)
+        current, shortcuts = priority(node)
+        if heap and current > heap[0][0]:
+            heapq.heappush(heap, (current, node))
+            continue
+
+        rank[node] = next_rank
+        next_rank += 1
+        for w, (cost, middle) in out_edges[node].items():
+            up.append((node, w, cost, middle))
+            del in_edges[w][node]
+            contracted_neighbours[w] += 1
+        for u, (cost, middle) in in_edges[node].items():
+            down.append((node, u, cost, middle))
+            del out_edges[u][node]
+            contracted_neighbours[u] += 1
+        for u, w, cost in shortcuts:
+            if cost < out_edges[u].get(w, (math.inf,))[0]:
+                out_edges[u][w] = (cost, node)
+                in_edges[w][u] = (cost, node)
+        out_edges[node] = {}
+        in_edges[node] = {}
+
+    arrays = {"rank": rank}
+    for name, edges in (("up", up), ("down", down)):
+        edge_array = np.array(edges, dtype=np.float64).reshape(-1, 4)
+        graph = _csr(edge_array[:, 0].astype(np.int64), edge_array[:, 1].astype(np.int64),
+                     {"cost": edge_array[:, 2], "middle": edge_array[:, 3].astype(np.int32)}, node_count)
+        for key, value in graph.items():
+            arrays[f"{name}_{key}"] = value
+    return arrays
+
+def build_road_network(nodes_csv: str, edges_csv: str, output_dir: str, contract: bool = False) -> str:
+    """
+    Convert a road extract into the on-disk format loaded by RoadNetwork.
+    nodes_csv has columns id, lat, lon; edges_csv has source, target, length_m and
+    optionally speed_kmh and oneway (1 for one-way streets, otherwise both
+    directions are added). Node IDs may be any integers, e.g. OSM node IDs.
+    With contract=True a contraction hierarchy is also built for each metric;
+    this runs in pure Python and can take several minutes on a city-sized graph.
+    Returns the output directory.
+    """
+    with open(nodes_csv, newline="") as f:
+        rows = list(csv.DictReader(f))
+    node_ids = np.array([int(row["id"]) for row in rows], dtype=np.int64)
+    lat = np.array([float(row["lat"]) for row in rows], dtype=np.float64)
+    lon = np.array([float(row["lon"]) for row in rows], dtype=np.float64)
+    positions = {node_id: position for position, node_id in enumerate(node_ids.tolist())}
+
+    sources, targets, lengths, speeds = [], [], [], []
+    with open(edges_csv, newline="") as f:
+        for row in csv.DictReader(f):
+            u, v = positions[int(row["source"])], positions[int(row["target"])]
+            if u == v:
+                continue
+            length_km = float(row["length_m"]) / 1000
+            speed = float(row.get("speed_kmh") or ROAD_DEFAULT_SPEED_KMH)
+            sources.append(u)
+            targets.append(v)
+            lengths.append(length_km)
+            speeds.append(speed)
+            if str(row.get("oneway") or "0").strip().lower() not in ("1", "true", "yes"):
+                sources.append(v)
+                targets.append(u)
+                lengths.append(length_km)
+                speeds.append(speed)
+
+    sources = np.array(sources, dtype=np.int64)
+    targets = np.array(targets, dtype=np.int64)
+    costs = {"distance": np.array(lengths, dtype=np.float64)}
+    costs["time"] = costs["distance"] / np.array(speeds, dtype=np.float64) * 3600
+
+    # Lower bounds of cost per great-circle kilometer keep the A* potentials admissible
+    vectors = _unit_vectors(lat, lon)
+    chord = np.linalg.norm(vectors[sources] - vectors[targets], axis=1)
+    great_circle = 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+    usable = great_circle > 1e-9
+    heuristic = {metric: float(np.min(costs[metric][usable] / great_circle[usable]) * 0.999) if usable.any() else 0.0
+                 for metric in METRICS}
+
+    os.makedirs(output_dir, exist_ok=True)
+    arrays = {"node_ids": node_ids, "lat": lat, "lon": lon}
+    for prefix, (a, b) in (("fwd", (sources, targets)), ("rev", (targets, sources))):
+        for key, value in _csr(a, b, costs, len(node_ids)).items():
+            arrays[f"{prefix}_{key}"] = value
+    contracted = []
+    if contract:
+        for metric in METRICS:
+            for key, value in _contract(len(node_ids), sources, targets, costs[metric]).items():
+                arrays[f"ch_{metric}_{key}"] = value
+            contracted.append(metric)
+    for name, value in arrays.items():
+        np.save(os.path.join(output_dir, f"{name}.npy"), value)
+
+    meta = {"nodes": len(node_ids), "edges": len(sources), "heuristic": heuristic, "contracted": contracted}
+    with open(os.path.join(output_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return output_dir
+
+class RoadNetwork:
+    """
+    Shortest paths over a road graph stored as memory-mapped CSR arrays.
+    Queries use the contraction hierarchy when one was built for the metric,
+    otherwise bidirectional A* with great-circle potentials (or plain
+    bidirectional Dijkstra). Costs are kilometers for "distance" and seconds for "time".
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        # Plain ndarray views over the memory maps; slicing np.memmap objects is much slower
+        load = lambda name: np.asarray(np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+        self.node_ids = load("node_ids")
+        self.lat = load("lat")
+        self.lon = load("lon")
+        self.forward = _CSRGraph(load("fwd_indptr"), load("fwd_indices"), {metric: load(f"fwd_{metric}") for metric in METRICS})
+        self.backward = _CSRGraph(load("rev_indptr"), load("rev_indices"), {metric: load(f"rev_{metric}") for metric in METRICS})
+        self.hierarchies = {}
+        for metric in self.meta.get("contracted", []):
+            prefix = f"ch_{metric}"
+            self.hierarchies[metric] = {
+                "rank": load(f"{prefix}_rank"),
+                "up": _CSRGraph(load(f"{prefix}_up_indptr"), load(f"{prefix}_up_indices"),
+                                {"cost": load(f"{prefix}_up_cost"), "middle": load(f"{prefix}_up_middle")}),
+                "down": _CSRGraph(load(f"{prefix}_down_indptr"), load(f"{prefix}_down_indices"),
+                                  {"cost": load(f"{prefix}_down_cost"), "middle": load(f"{prefix}_down_middle")})
+            }
+        self._tree = cKDTree(_unit_vectors(np.asarray(self.lat), np.asarray(self.lon)))
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    def nearest_nodes(self, locations: Sequence[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Closest graph node to each location and the snapping distance in kilometers.
+        """
+        coords = np.asarray(locations, dtype=np.float64).reshape(-1, 2)
+        chord, nodes = self._tree.query(_unit_vectors(coords[:, 0], coords[:, 1]))
+        return nodes.astype(np.int64), 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+    def nearest_node(self, lat: float, lon: float) -> Tuple[int, float]:
+        nodes, distances = self.nearest_nodes([(lat, lon)])
+        return int(nodes[0]), float(distances[0])
+
+    def shortest_path(self, source: int, target: int, metric: str = "time",
+                      algorithm: str = "auto") -> Tuple[float, List[int]]:
+        """
+        Cost and node sequence of the shortest path between two nodes.
+        algorithm is "auto", "ch", "astar" or "dijkstra".
+        Raises ValueError if the target cannot be reached.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        if algorithm == "auto":
+            algorithm = "ch" if metric in self.hierarchies else "astar"
+        if source == target:
+            return 0.0, [source]
+        if algorithm == "ch":
+            if metric not in self.hierarchies:
+                raise ValueError(f"No contraction hierarchy built for {metric}")
+            return self._ch_query(self.hierarchies[metric], source, target)
+        if algorithm in ("astar", "dijkstra"):
+            return self._bidirectional(source, target, metric, potentials=algorithm == "astar")
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+    def _bidirectional(self, source: int, target: int, metric: str, potentials: bool) -> Tuple[float, List[int]]:
+        """
+        Bidirectional Dijkstra, optionally on costs reduced by the average A* potential
+        p(v) = (h_target(v) - h_source(v)) / 2, which is consistent in both directions.
+        The search stops once the two queue minima together reach the best meeting cost.
+        """
+        scale = self.meta["heuristic"][metric] if potentials else 0.0
+        lat, lon = self.lat, self.lon
+        source_lat, source_lon = float(lat[source]), float(lon[source])
+        target_lat, target_lon = float(lat[target]), float(lon[target])
+        potential_cache: Dict[int, float] = {}
+
+        def potential(node: int) -> float:
+            if not scale:
+                return 0.0
+            value = potential_cache.get(node)
+            if value is None:
+                node_lat, node_lon = float(lat[node]), float(lon[node])
+                value = potential_cache[node] = 0.5 * scale * (
+                    _great_circle_km(node_lat, node_lon, target_lat, target_lon)
+                    - _great_circle_km(node_lat, node_lon, source_lat, source_lon))
+            return value
+
+        graphs = (self.forward, self.backward)
+        signs = (1.0, -1.0)
+        dist = ({source: 0.0}, {target: 0.0})
+        parent = ({source: -1}, {target: -1})
+        settled = (set(), set())
+        heaps = ([(potential(source), source)], [(-potential(target), target)])
+        best, meeting = math.inf, -1
+
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            _, node = heapq.heappop(heaps[side])
+            if node in settled[side]:
+                continue
+            settled[side].add(node)
+            d = dist[side][node]
+            other = dist[1 - side]
+            neighbours, costs = graphs[side].edges(node, metric)
+            for neighbour, cost in zip(neighbours, costs):
+                candidate = d + cost
+                if candidate < dist[side].get(neighbour, math.inf):
+                    dist[side][neighbour] = candidate
+                    parent[side][neighbour] = node
+                    heapq.heappush(heaps[side], (candidate + signs[side] * potential(neighbour), neighbour))
+                    if neighbour in other and candidate + other[neighbour] < best:
+                        best, meeting = candidate + other[neighbour], neighbour
+
+        if meeting < 0:
+            raise ValueError("No road path between the given points")
+        path = []
+        node = meeting
+        while node >= 0:
+            path.append(node)
+            node = parent[0][node]
+        path.reverse()
+        node = parent[1][meeting]
+        while node >= 0:
+            path.append(node)
+            node = parent[1][node]
+        return best, path
+
+    def _ch_query(self, hierarchy: dict, source: int, target: int) -> Tuple[float, List[int]]:
+        """
+        Upward searches from both ends of the contraction hierarchy, then shortcut unpacking.
+        """
+        graphs = (hierarchy["up"], hierarchy["down"])
+        dist = ({source: 0.0}, {target: 0.0})
+        parent = ({source: (-1, -1)}, {target: (-1, -1)})  # node -> (previous node, shortcut middle)
+        heaps = ([(0.0, source)], [(0.0, target)])
+        done = [False, False]
+        best, meeting = math.inf, -1
+
+        while not all(done):
+            side = 0 if not done[0] and (done[1] or len(heaps[0]) <= len(heaps[1])) else 1
+            if not heaps[side] or heaps[side][0][0] >= best:
+                done[side] = True
+                continue
+            d, node = heapq.heappop(heaps[side])
+            if d > dist[side][node]:
+                continue
+            if node in dist[1 - side] and d + dist[1 - side][node] < best:
+                best, meeting = d + dist[1 - side][node], node
+            neighbours, costs = graphs[side].edges(node, "cost")
+            middles = graphs[side].weights["middle"][int(graphs[side].indptr[node]):int(graphs[side].indptr[node + 1])].tolist()
+            for neighbour, cost, middle in zip(neighbours, costs, middles):
+                candidate = d + cost
+                if candidate < dist[side].get(neighbour, math.inf):
+                    dist[side][neighbour] = candidate
+                    parent[side][neighbour] = (node, middle)
+                    heapq.heappush(heaps[side], (candidate, neighbour))
+
+        if meeting < 0:
+            raise ValueError("No road path between the given points")
+
+        # Hierarchy edges along the path, as (from, to, middle)
+        edges = []
+        node = meeting
+        while parent[0][node][0] >= 0:
+            previous, middle = parent[0][node]
+            edges.append((previous, node, middle))
+            node = previous
+        edges.reverse()
+        node = meeting
+        while parent[1][node][0] >= 0:
+            following, middle = parent[1][node]
+            edges.append((node, following, middle))
+            node = following
+
+        path = [source]
+        stack = list(reversed(edges))
+        while stack:
+            u, w, middle = stack.pop()
+            if middle < 0:
+                path.append(w)
+                continue
+            # Both halves of a shortcut were stored when the middle node was contracted:
+            # u -> middle as an incoming edge of middle, middle -> w as an upward edge
+            _, first = self._hierarchy_edge(hierarchy["down"], middle, u)
+            _, second = self._hierarchy_edge(hierarchy["up"], middle, w)
+            stack.append((middle, w, second))
+            stack.append((u, middle, first))
+        return best, path
+
+    @staticmethod
+    def _hierarchy_edge(graph: _CSRGraph, node: int, neighbour: int) -> Tuple[float, int]:
+        position, cost = graph.edge(node, neighbour, "cost")
+        return cost, int(graph.weights["middle"][position])
+
+    def path_totals(self, path: List[int], metric: str = "time") -> Tuple[float, float]:
+        """
+        Distance (km) and travel time (s) along a node path, using the edges chosen for metric.
+        """
+        distance = duration = 0.0
+        for u, v in zip(path, path[1:]):
+            position, _ = self.forward.edge(u, v, metric)
+            distance += float(self.forward.weights["distance"][position])
+            duration += float(self.forward.weights["time"][position])
+        return distance, duration
+
+    def leg_totals(self, legs: Sequence[Tuple[Tuple[float, float], Tuple[float, float]]],
+                   metric: str = "time") -> List[Tuple[float, float]]:
+        """
+        Distance (km) and travel time (s) of each (start, end) coordinate pair.
+        All ends are snapped to the graph in a single query.
+        """
+        if not legs:
+            return []
+        nodes, _ = self.nearest_nodes([point for leg in legs for point in leg])
+        totals = []
+        for source, target in nodes.reshape(-1, 2).tolist():
+            _, path = self.shortest_path(source, target, metric)
+            totals.append(self.path_totals(path, metric))
+        return totals
+
+    def route(self, start_coords: Tuple[float, float], end_coords: Tuple[float, float], metric: str = "time") -> dict:
+        """
+        Road route between two coordinates, in the same shape as the Google-backed get_route.
+        Both ends are snapped to the nearest graph node.
+        """
+        nodes, snaps = self.nearest_nodes([start_coords, end_coords])
+        _, path = self.shortest_path(int(nodes[0]), int(nodes[1]), metric)
+        distance, duration = self.path_totals(path, metric)
+        return {
+            "distance": f"{distance:.1f} km",
+            "duration": f"{round(duration / 60)} mins",
+            "distance_km": distance,
+            "duration_seconds": duration,
+            "start_address": f"{start_coords[0]}, {start_coords[1]}",
+            "end_address": f"{end_coords[0]}, {end_coords[1]}",
+            "snap_distance_km": [float(snaps[0]), float(snaps[1])],
+            "steps": [],
+            "path": [[float(self.lat[node]), float(self.lon[node])] for node in path]
+        }
+
+    def distance_matrix(self, locations: Sequence[Tuple[float, float]], metric: str = "distance") -> np.ndarray:
+        """
+        Road cost between every pair of locations (inf where unreachable).
+        Runs one Dijkstra per source that stops once every target is settled.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        nodes, _ = self.nearest_nodes(locations)
+        nodes = nodes.tolist()
+        matrix = np.full((len(nodes), len(nodes)), np.inf)
+        for row, source in enumerate(nodes):
+            remaining = set(nodes)
+            dist = {source: 0.0}
+            heap = [(0.0, source)]
+            while heap and remaining:
+                d, node = heapq.heappop(heap)
+                if d > dist[node]:
+                    continue
+                remaining.discard(node)
+                neighbours, costs = self.forward.edges(node, metric)
+                for neighbour, cost in zip(neighbours, costs):
+                    candidate = d + cost
+                    if candidate < dist.get(neighbour, math.inf):
+                        dist[neighbour] = candidate
+                        heapq.heappush(heap, (candidate, neighbour))
+            matrix[row] = [dist.get(node, np.inf) for node in nodes]
+        return matrix
+
+_road_network: Optional[RoadNetwork] = None
+_road_network_failed = False
+_road_network_lock = threading.Lock()
+
+def get_road_network() -> Optional[RoadNetwork]:
+    """
+    The configured local road network, loaded on first use.
+    Returns None when ROUTING_ENGINE is not "local" or the network cannot be loaded.
+    """
+    global _road_network, _road_network_failed
+    if ROUTING_ENGINE != "local" or not ROAD_NETWORK_PATH or _road_network_failed:
+        return _road_network
+    if _road_network is None:
+        with _road_network_lock:
+            if _road_network is None and not _road_network_failed:
+                try:
+                    _road_network = RoadNetwork(ROAD_NETWORK_PATH)
+                    log_info(f"Loaded road network from {ROAD_NETWORK_PATH} ({_road_network.node_count} nodes)", route_logger)
+                except Exception as e:
+                    _road_network_failed = True
+                    log_warning(f"Could not load road network from {ROAD_NETWORK_PATH}: {str(e)}", route_logger)
+    return _road_network
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local road network used by ROUTING_ENGINE=local")
+    parser.add_argument("nodes_csv")
+    parser.add_argument("edges_csv")
+    parser.add_argument("output_dir")
+    parser.add_argument("--contract", action="store_true", help="Also build contraction hierarchies")
+    args = parser.parse_args()
+    build_road_network(args.nodes_csv, args.edges_csv, args.output_dir, contract=args.contract)
@@ -1,7 +1,90 @@
-from typing import List, Dict, Tuple
-from scipy.spatial.distance import cdist
+from typing import List, Dict, Tuple, Optional
+from bisect import bisect_left, bisect_right, insort
+import math
+import time
 import numpy as np
-from app.utils.geo_utils import calculate_distance
+from app.utils.geo_utils import calculate_distance, haversine_matrix
+from app.utils.config_loader import get_config
+
+# Kilometres per degree of latitude, used to size grid cells for order grouping
+KM_PER_DEGREE = 111.32
+
+# Travel-time model for time-window routing
+AVERAGE_SPEED_KMH = float(get_config("AVERAGE_SPEED_KMH", "40"))
+DEFAULT_SERVICE_MINUTES = float(get_config("DEFAULT_SERVICE_MINUTES", "10"))  # Time on site when an order has none
+REPLAN_TIME_LIMIT_MS = int(get_config("REPLAN_TIME_LIMIT_MS", "500"))  # Solver budget for re-planning inside a driver request
+
+# Knapsack solver limits
+KNAPSACK_DP_RESOLUTION = 10000  # Capacity units used when weights have to be scaled to integers
+KNAPSACK_DP_MAX_CELLS = 50_000_000  # Largest items x capacity-units table the DP mode may allocate
+KNAPSACK_BNB_MAX_ITEMS = 5000  # Largest load auto mode sends to branch-and-bound
+KNAPSACK_BNB_MAX_NODES = 200_000  # Search nodes explored before branch-and-bound returns its best load
+
+class SolverBudget:
+    """
+    Time budget and progress counter shared by the anytime solvers.
+    Solvers poll expired() between improvement steps and, once it trips, stop
+    and return the best solution found so far. time_limit_ms=None means no limit.
+    """
+    def __init__(self, time_limit_ms: Optional[float] = None):
+        self.time_limit_ms = time_limit_ms
+        self.started = time.perf_counter()
+        self.deadline = None if time_limit_ms is None else self.started + time_limit_ms / 1000
+        self.iterations = 0
+        self.timed_out = False
+
+    def expired(self) -> bool:
+        if not self.timed_out and self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.timed_out = True
+        return self.timed_out
+
+    def remaining_ms(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, (self.deadline - time.perf_counter()) * 1000)
+
+    def report(self, objective: float, bound: float, maximize: bool = False) -> dict:
+        """
+        Solver statistics: elapsed time, iterations, whether the budget ran out,
+        the objective, a bound on the optimum and the relative gap between them.
+        """
+        if maximize:
+            gap = (bound - objective) / bound if bound > 0 else 0.0
+        else:
+            gap = (objective - bound) / objective if objective > 0 else 0.0
+        return {
+            "elapsed_ms": (time.perf_counter() - self.started) * 1000,
+            "iterations": self.iterations,
+            "timed_out": self.timed_out,
+            "objective": float(objective),
+            "bound": float(bound),
+            "gap": max(0.0, float(gap))
+        }
+
+def mst_lower_bound(dist_matrix: np.ndarray, nodes: Optional[List[int]] = None) -> float:
+    """
+    Weight of a minimum spanning tree over the given nodes (default: all).
+    Any path or set of depot round trips that visits every node contains a
+    spanning tree, so this is a lower bound on their total length.
+    Dense Prim's algorithm, one vectorized pass per node; asymmetric matrices
+    use the cheaper direction of every edge.
+    """
+    matrix = np.asarray(dist_matrix, dtype=np.float64)
+    if nodes is not None:
+        matrix = matrix[np.ix_(nodes, nodes)]
+    n = len(matrix)
+    if n < 2:
+        return 0.0
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[0] = True
+    link = np.minimum(matrix[0], matrix[:, 0])  # Cheapest edge from each node into the tree
+    total = 0.0
+    for _ in range(n - 1):
+        node = int(np.argmin(np.where(in_tree, np.inf, link)))
+        total += float(link[node])
+        in_tree[node] = True
+        np.minimum(link, np.minimum(matrix[node], matrix[:, node]), out=link)
+    return total
 
 def a_star_algorithm(locations: List[Tuple[float, float]]) -> List[int]:
     """
@@ -9,7 +92,7 @@ def a_star_algorithm(locations: List[Tuple[float, float]]) -> List[int]:
     Returns the optimal order of indices to visit.
     """
     def heuristic(a: Tuple[float, float], b: Tuple[float, float]) -> float:
-        return calculate_distance(a[0], a[1], b[0], b[1])
+        return calculate_distance(a[0], a[1], b[0], b[1], method="haversine")
 
     start = 0  # Start from the first location
     open_set = {start}
@@ -43,10 +126,558 @@ def a_star_algorithm(locations: List[Tuple[float, float]]) -> List[int]:
 
     return []
 
-def knapsack_capacity(items: List[Dict[str, float]], max_weight: float) -> List[Dict[str, float]]:
+def _nearest_neighbour_tour(dist_matrix: np.ndarray, start: int) -> np.ndarray:
     """
-    Uses the Knapsack algorithm to maximize load while staying within the capacity.
-    Returns the optimal selection of items.
+    Builds an initial closed tour by always moving to the closest unvisited node.
+    """
+    n = len(dist_matrix)
+    visited = np.zeros(n, dtype=bool)
+    tour = np.empty(n, dtype=np.int64)
+    current = start
+    for position in range(n):
+        tour[position] = current
+        visited[current] = True
+        if position == n - 1:
+            break
+        row = np.where(visited, np.inf, dist_matrix[current])
+        current = int(np.argmin(row))
+    return tour
+
+def _two_opt(dist_matrix: np.ndarray, tour: np.ndarray,
+             budget: Optional[SolverBudget] = None) -> Tuple[np.ndarray, bool]:
+    """
+    Runs 2-opt passes until no segment reversal shortens the closed tour
+    (or the budget runs out). Every candidate edge pair for a given first edge
+    is evaluated in one NumPy pass.
+    Returns the improved tour and whether any move was applied.
+    """
+    n = len(tour)
+    improved_any = False
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 2):
+            if budget is not None and budget.expired():
+                return tour, improved_any
+            a, b = tour[i], tour[i + 1]
+            # Candidate second edges (c, d) = (tour[j], tour[j + 1]) for j in [i + 2, n - 1]
+            c = tour[i + 2:]
+            d = np.append(tour[i + 3:], tour[0])
+            if i == 0:
+                # Edge (tour[n - 1], tour[0]) shares a node with (a, b)
+                c, d = c[:-1], d[:-1]
+            if len(c) == 0:
+                continue
+            delta = dist_matrix[a, c] + dist_matrix[b, d] - dist_matrix[a, b] - dist_matrix[c, d]
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                j = i + 2 + best
+                tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1]
+                improved = True
+                improved_any = True
+                if budget is not None:
+                    budget.iterations += 1
+    return tour, improved_any
+
+def _or_opt(dist_matrix: np.ndarray, tour: np.ndarray, max_segment: int = 3,
+            budget: Optional[SolverBudget] = None) -> Tuple[np.ndarray, bool]:
+    """
+    Runs Or-opt passes: relocates chains of 1..max_segment consecutive stops
+    (optionally reversed) to the cheapest position elsewhere in the closed tour,
+    until no move helps or the budget runs out.
+    Returns the improved tour and whether any move was applied.
+    """
+    n = len(tour)
+    improved_any = False
+    improved = True
+    while improved:
+        improved = False
+        for length in range(1, max_segment + 1):
+            if n < length + 3:
+                break
+            i = 0
+            while i < n:
+                if budget is not None and budget.expired():
+                    return tour, improved_any
+                segment_positions = [(i + k) % n for k in range(length)]
+                first, last = tour[segment_positions[0]], tour[segment_positions[-1]]
+                prev_node = tour[(i - 1) % n]
+                next_node = tour[(i + length) % n]
+                removal_gain = (dist_matrix[prev_node, first] + dist_matrix[last, next_node]
+                                - dist_matrix[prev_node, next_node])
+
+                # Remaining tour after cutting the segment out, starting right after it
+                rest = np.roll(tour, -(i + length))[:n - length]
+                u, v = rest[:-1], rest[1:]
+                insert_cost = dist_matrix[u, first] + dist_matrix[last, v] - dist_matrix[u, v]
+                insert_cost_reversed = dist_matrix[u, last] + dist_matrix[first, v] - dist_matrix[u, v]
+                best_forward = int(np.argmin(insert_cost))
+                best_reversed = int(np.argmin(insert_cost_reversed))
+                reverse = insert_cost_reversed[best_reversed] < insert_cost[best_forward]
+                best = best_reversed if reverse else best_forward
+                cost = insert_cost_reversed[best] if reverse else insert_cost[best]
+
+                if cost < removal_gain - 1e-9:
+                    segment = tour[segment_positions]
+                    if reverse:
+                        segment = segment[::-1]
+                    tour = np.concatenate((rest[:best + 1], segment, rest[best + 1:]))
+                    improved = True
+                    improved_any = True
+                    if budget is not None:
+                        budget.iterations += 1
+                i += 1
+    return tour, improved_any
+
+def _path_length(dist_matrix: np.ndarray, order: List[int], closed: bool = False) -> float:
+    """
+    Length of a path through the given indices, back to the first one when closed.
+    """
+    if len(order) < 2:
+        return 0.0
+    path = list(order) + ([order[0]] if closed else [])
+    return float(dist_matrix[path[:-1], path[1:]].sum())
+
+def solve_tour(dist_matrix: np.ndarray, start: int = 0, end: Optional[int] = None,
+               closed: bool = False, initial_tour: Optional[List[int]] = None,
+               time_limit_ms: Optional[int] = None, stats: Optional[dict] = None) -> List[int]:
+    """
+    Finds a short route that visits every location exactly once.
+    The route starts at `start`; it returns to `start` when `closed` is True,
+    finishes at `end` when one is given, and otherwise ends wherever is cheapest.
+    Uses a nearest-neighbour construction followed by 2-opt and Or-opt improvement.
+    A previous visiting order can be passed as `initial_tour` to warm-start the
+    improvement instead (it must visit every index once, beginning at `start`).
+    With `time_limit_ms`, improvement stops when the budget runs out and the best
+    tour so far is returned. A `stats` dict is filled with the solver statistics
+    (gap measured against the minimum spanning tree).
+    Returns the order of indices to visit.
+    """
+    budget = SolverBudget(time_limit_ms)
+    dist_matrix = np.asarray(dist_matrix, dtype=np.float64)
+    n = len(dist_matrix)
+    if n <= 2:
+        order = list(range(n))
+        if n == 2 and start == 1:
+            order.reverse()
+        if stats is not None:
+            length = _path_length(dist_matrix, order, closed)
+            stats.update(budget.report(length, length))
+        return order
+
+    if closed:
+        matrix = dist_matrix
+        dummy = None
+    else:
+        # An open path is a closed tour through a dummy node. The dummy is free to
+        # reach from `start` (and `end`), and every other connection costs the same
+        # large constant, so the optimum always places it next to the path endpoints.
+        penalty = float(dist_matrix.max()) * n + 1.0
+        dummy = n
+        matrix = np.full((n + 1, n + 1), penalty)
+        matrix[:n, :n] = dist_matrix
+        matrix[dummy, dummy] = 0.0
+        matrix[dummy, start] = matrix[start, dummy] = 0.0
+        if end is not None:
+            matrix[dummy, end] = matrix[end, dummy] = 0.0
+
+    if initial_tour is not None and len(initial_tour) == n and initial_tour[0] == start \
+            and sorted(initial_tour) == list(range(n)):
+        tour = np.array(list(initial_tour) + ([dummy] if dummy is not None else []), dtype=np.int64)
+    else:
+        tour = _nearest_neighbour_tour(matrix, start)
+    improved = True
+    while improved and not budget.expired():
+        tour, _ = _two_opt(matrix, tour, budget)
+        tour, or_opt_improved = _or_opt(matrix, tour, budget=budget)
+        improved = or_opt_improved
+
+    # Rotate the tour so that it starts at `start`, then drop the dummy node
+    tour = np.roll(tour, -int(np.where(tour == start)[0][0]))
+    if dummy is not None:
+        if tour[1] == dummy:
+            tour = np.concatenate(([start], tour[1:][::-1]))
+        tour = tour[tour != dummy]
+    order = [int(i) for i in tour]
+    if stats is not None:
+        stats.update(budget.report(_path_length(dist_matrix, order, closed), mst_lower_bound(dist_matrix)))
+    return order
+
+def optimize_tour(locations: List[Tuple[float, float]], closed: bool = False,
+                  time_limit_ms: Optional[int] = None, stats: Optional[dict] = None) -> List[int]:
+    """
+    Plans a multi-stop route over all locations, starting from the first one.
+    Builds the distance matrix once and hands it to the tour solver.
+    Returns the order of indices to visit.
+    """
+    if not locations:
+        if stats is not None:
+            stats.update(SolverBudget(time_limit_ms).report(0.0, 0.0))
+        return []
+    budget = SolverBudget(time_limit_ms)
+    dist_matrix = calculate_route_matrix(locations)
+    # The matrix build counts against the budget
+    return solve_tour(dist_matrix, start=0, closed=closed, time_limit_ms=budget.remaining_ms(), stats=stats)
+
+def _route_length(dist_matrix: np.ndarray, depot: int, stops: List[int]) -> float:
+    """
+    Length of a depot -> stops -> depot round trip.
+    """
+    if not stops:
+        return 0.0
+    path = [depot] + list(stops) + [depot]
+    return float(dist_matrix[path[:-1], path[1:]].sum())
+
+def _clarke_wright_routes(dist_matrix: np.ndarray, demands: np.ndarray, customers: List[int],
+                          depot: int, capacity: float) -> List[List[int]]:
+    """
+    Builds routes with the Clarke-Wright parallel savings heuristic.
+    Starts from one round trip per customer and merges route ends in order of
+    decreasing saving d(depot, i) + d(depot, j) - d(i, j) while the capacity allows.
+    """
+    routes = {c: [c] for c in customers}
+    route_of = {c: c for c in customers}
+    loads = {c: float(demands[c]) for c in customers}
+
+    nodes = np.array(customers)
+    if len(nodes) < 2:
+        return list(routes.values())
+    first, second = np.triu_indices(len(nodes), k=1)
+    i_nodes, j_nodes = nodes[first], nodes[second]
+    savings = dist_matrix[depot, i_nodes] + dist_matrix[depot, j_nodes] - dist_matrix[i_nodes, j_nodes]
+    order = np.argsort(-savings, kind="stable")
+
+    for k in order:
+        if savings[k] <= 0:
+            break
+        i, j = int(i_nodes[k]), int(j_nodes[k])
+        ri, rj = route_of[i], route_of[j]
+        if ri == rj or loads[ri] + loads[rj] > capacity:
+            continue
+        route_i, route_j = routes[ri], routes[rj]
+        # Only route ends can be joined; orient both routes so that i ends one and j starts the other
+        if route_i[-1] != i:
+            if route_i[0] != i:
+                continue
+            route_i.reverse()
+        if route_j[0] != j:
+            if route_j[-1] != j:
+                continue
+            route_j.reverse()
+        route_i.extend(route_j)
+        loads[ri] += loads.pop(rj)
+        del routes[rj]
+        for c in route_j:
+            route_of[c] = ri
+
+    return list(routes.values())
+
+def _assign_routes_to_vehicles(routes: List[List[int]], demands: np.ndarray,
+                               capacities: List[float]) -> Tuple[List[Optional[List[int]]], List[List[int]]]:
+    """
+    Gives each route the smallest free vehicle that can carry it, heaviest routes first.
+    Returns the route per vehicle (None when idle) and the routes no vehicle could take.
+    """
+    assigned: List[Optional[List[int]]] = [None] * len(capacities)
+    free = sorted((float(cap), index) for index, cap in enumerate(capacities))
+    leftovers = []
+    for route in sorted(routes, key=lambda r: -float(demands[r].sum())):
+        load = float(demands[route].sum())
+        position = bisect_left(free, (load, -1))
+        if position == len(free):
+            leftovers.append(route)
+            continue
+        _, vehicle = free.pop(position)
+        assigned[vehicle] = route
+    return assigned, leftovers
+
+def _best_insertion(dist_matrix: np.ndarray, depot: int, route: List[int], node: int) -> Tuple[float, int]:
+    """
+    Cheapest position to insert `node` into a depot round trip.
+    Returns the added length and the index to insert at.
+    """
+    path = np.array([depot] + route + [depot])
+    u, v = path[:-1], path[1:]
+    cost = dist_matrix[u, node] + dist_matrix[node, v] - dist_matrix[u, v]
+    best = int(np.argmin(cost))
+    return float(cost[best]), best
+
+def solve_cvrp(dist_matrix: np.ndarray, demands: List[float], capacities: List[float],
+               depot: int = 0, time_limit_ms: int = 1000) -> Dict:
+    """
+    Capacitated multi-vehicle routing over a distance matrix.
+    Builds routes with Clarke-Wright savings, assigns them to vehicles by capacity,
+    then improves them with inter-route relocation and per-route 2-opt/Or-opt
+    until no move helps or the time budget runs out.
+    Returns one stop sequence per vehicle (indices into the matrix, depot excluded),
+    the stops that could not be served and the solver statistics (gap measured
+    against the minimum spanning tree of the served stops and the depot).
+    """
+    budget = SolverBudget(time_limit_ms)
+    dist_matrix = np.asarray(dist_matrix, dtype=np.float64)
+    demands = np.asarray(demands, dtype=np.float64)
+    capacities = [float(c) for c in capacities]
+    customers = [i for i in range(len(dist_matrix)) if i != depot]
+    max_capacity = max(capacities, default=0.0)
+
+    unassigned = [c for c in customers if demands[c] > max_capacity]
+    servable = [c for c in customers if demands[c] <= max_capacity]
+    routes = _clarke_wright_routes(dist_matrix, demands, servable, depot, max_capacity)
+    assigned, leftovers = _assign_routes_to_vehicles(routes, demands, capacities)
+    vehicle_routes = [route or [] for route in assigned]
+    loads = [float(demands[route].sum()) if route else 0.0 for route in vehicle_routes]
+
+    # Fold stops from routes that did not get a vehicle into the cheapest feasible spot
+    for node in sorted((c for route in leftovers for c in route), key=lambda c: -demands[c]):
+        best = None
+        for vehicle, route in enumerate(vehicle_routes):
+            if loads[vehicle] + demands[node] > capacities[vehicle]:
+                continue
+            cost, position = _best_insertion(dist_matrix, depot, route, node)
+            if best is None or cost < best[0]:
+                best = (cost, vehicle, position)
+        if best is None:
+            unassigned.append(node)
+            continue
+        _, vehicle, position = best
+        vehicle_routes[vehicle].insert(position, node)
+        loads[vehicle] += demands[node]
+
+    # Local search: move single stops between vehicles while it shortens the plan
+    improved = True
+    while improved and not budget.expired():
+        improved = False
+        for source, route in enumerate(vehicle_routes):
+            position = 0
+            while position < len(route):
+                if budget.expired():
+                    break
+                node = route[position]
+                prev_node = route[position - 1] if position > 0 else depot
+                next_node = route[position + 1] if position + 1 < len(route) else depot
+                removal_gain = (dist_matrix[prev_node, node] + dist_matrix[node, next_node]
+                                - dist_matrix[prev_node, next_node])
+                best = None
+                for target, other in enumerate(vehicle_routes):
+                    if target == source or loads[target] + demands[node] > capacities[target]:
+                        continue
+                    cost, insert_at = _best_insertion(dist_matrix, depot, other, node)
+                    if cost < removal_gain - 1e-9 and (best is None or cost < best[0]):
+                        best = (cost, target, insert_at)
+                if best is None:
+                    position += 1
+                    continue
+                _, target, insert_at = best
+                route.pop(position)
+                vehicle_routes[target].insert(insert_at, node)
+                loads[source] -= demands[node]
+                loads[target] += demands[node]
+                budget.iterations += 1
+                improved = True
+
+    # Re-sequence every route on its own sub-matrix
+    for vehicle, route in enumerate(vehicle_routes):
+        if len(route) < 3 or budget.expired():
+            continue
+        nodes = [depot] + route
+        tour_stats = {}
+        order = solve_tour(dist_matrix[np.ix_(nodes, nodes)], start=0, closed=True,
+                           time_limit_ms=budget.remaining_ms(), stats=tour_stats)
+        budget.iterations += tour_stats["iterations"]
+        vehicle_routes[vehicle] = [nodes[i] for i in order[1:]]
+
+    total_distance = sum(_route_length(dist_matrix, depot, route) for route in vehicle_routes)
+    served = [depot] + [node for route in vehicle_routes for node in route]
+    return {
+        "routes": [
+            {
+                "vehicle_index": vehicle,
+                "stops": route,
+                "load": float(loads[vehicle]),
+                "distance": _route_length(dist_matrix, depot, route)
+            }
+            for vehicle, route in enumerate(vehicle_routes)
+        ],
+        "unassigned": sorted(unassigned),
+        "total_distance": total_distance,
+        "stats": budget.report(total_distance, mst_lower_bound(dist_matrix, served))
+    }
+
+def travel_time_matrix(dist_matrix: np.ndarray, speed_kmh: float = AVERAGE_SPEED_KMH) -> np.ndarray:
+    """
+    Converts a distance matrix (km) into travel times in minutes at a constant average speed.
+    """
+    return np.asarray(dist_matrix, dtype=np.float64) / speed_kmh * 60
+
+def _window_slack(travel: np.ndarray, starts: np.ndarray, ends: np.ndarray, service: np.ndarray,
+                  path: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Earliest and latest service start at every position of a path.
+    earliest[p] follows from leaving the depot as early as possible and waiting
+    for windows to open; latest[p] is the last start at p that keeps every
+    later stop inside its window. The path is feasible when earliest <= latest.
+    """
+    earliest = np.empty(len(path))
+    latest = np.empty(len(path))
+    earliest[0] = starts[path[0]]
+    for p in range(1, len(path)):
+        a, b = path[p - 1], path[p]
+        earliest[p] = max(starts[b], earliest[p - 1] + service[a] + travel[a, b])
+    latest[-1] = ends[path[-1]]
+    for p in range(len(path) - 2, -1, -1):
+        a, b = path[p], path[p + 1]
+        latest[p] = min(ends[a], latest[p + 1] - travel[a, b] - service[a])
+    return earliest, latest
+
+def _window_insertions(cost: np.ndarray, travel: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                       service: np.ndarray, path: np.ndarray, earliest: np.ndarray, latest: np.ndarray,
+                       node: int) -> Tuple[float, int]:
+    """
+    Cheapest time-feasible position to insert `node` into a path.
+    Each position is checked in O(1) from the earliest/latest arrays: the node
+    must start within its window, and the stop after it must still start by its latest time.
+    Returns the added cost and the insert index into the stop list (inf, -1 if none fits).
+    """
+    before, after = path[:-1], path[1:]
+    start = np.maximum(starts[node], earliest[:-1] + service[before] + travel[before, node])
+    next_start = np.maximum(starts[after], start + service[node] + travel[node, after])
+    feasible = (start <= ends[node]) & (next_start <= latest[1:] + 1e-9)
+    if not feasible.any():
+        return math.inf, -1
+    added = np.where(feasible, cost[before, node] + cost[node, after] - cost[before, after], np.inf)
+    best = int(np.argmin(added))
+    return float(added[best]), best
+
+def solve_vrptw(travel: np.ndarray, window_starts: List[float], window_ends: List[float],
+                service_times: List[float], demands: List[float], capacities: List[float],
+                depot: int = 0, cost_matrix: Optional[np.ndarray] = None, time_limit_ms: int = 1000) -> Dict:
+    """
+    Capacitated multi-vehicle routing with pickup time windows.
+    Times are minutes from the planned departure (travel holds travel times,
+    windows may be inf where open-ended); cost_matrix (default: travel) is what
+    gets minimized. Stops are inserted tightest-deadline first at their cheapest
+    feasible position, then relocated within and between routes while that lowers
+    the cost. Every insertion is checked in O(1) per position with forward
+    earliest-start and backward latest-start arrays.
+    Returns the stop sequence, service start times and return time per vehicle,
+    the stops that could not be served within their windows or capacity, and the
+    solver statistics (gap against the minimum spanning tree, ignoring the windows).
+    """
+    budget = SolverBudget(time_limit_ms)
+    travel = np.asarray(travel, dtype=np.float64)
+    cost = travel if cost_matrix is None else np.asarray(cost_matrix, dtype=np.float64)
+    starts = np.asarray(window_starts, dtype=np.float64)
+    ends = np.asarray(window_ends, dtype=np.float64)
+    service = np.asarray(service_times, dtype=np.float64).copy()
+    service[depot] = 0.0
+    demands = np.asarray(demands, dtype=np.float64)
+    capacities = [float(c) for c in capacities]
+
+    routes: List[List[int]] = [[] for _ in capacities]
+    loads = [0.0] * len(capacities)
+    slack = [_window_slack(travel, starts, ends, service, [depot, depot]) for _ in capacities]
+
+    def refresh(vehicle: int):
+        slack[vehicle] = _window_slack(travel, starts, ends, service, [depot] + routes[vehicle] + [depot])
+
+    def best_position(node: int, skip: Optional[int] = None) -> Optional[Tuple[float, int, int]]:
+        best = None
+        for vehicle, route in enumerate(routes):
+            if vehicle == skip or loads[vehicle] + demands[node] > capacities[vehicle]:
+                continue
+            earliest, latest = slack[vehicle]
+            added, position = _window_insertions(cost, travel, starts, ends, service,
+                                                 np.array([depot] + route + [depot]), earliest, latest, node)
+            if position >= 0 and (best is None or added < best[0]):
+                best = (added, vehicle, position)
+        return best
+
+    customers = [i for i in range(len(travel)) if i != depot]
+    unassigned = []
+    for node in sorted(customers, key=lambda c: (ends[c], starts[c])):
+        best = best_position(node)
+        if best is None:
+            unassigned.append(node)
+            continue
+        _, vehicle, position = best
+        routes[vehicle].insert(position, node)
+        loads[vehicle] += demands[node]
+        refresh(vehicle)
+
+    # Relocate single stops (within or between routes) while it lowers the cost
+    improved = True
+    while improved and not budget.expired():
+        improved = False
+        for source in range(len(routes)):
+            position = 0
+            while position < len(routes[source]) and not budget.expired():
+                route = routes[source]
+                node = route[position]
+                prev_node = route[position - 1] if position > 0 else depot
+                next_node = route[position + 1] if position + 1 < len(route) else depot
+                removal_gain = cost[prev_node, node] + cost[node, next_node] - cost[prev_node, next_node]
+
+                reduced = route[:position] + route[position + 1:]
+                reduced_path = [depot] + reduced + [depot]
+                earliest, latest = _window_slack(travel, starts, ends, service, reduced_path)
+                if np.any(earliest > latest + 1e-9):
+                    position += 1
+                    continue
+                added, insert_at = _window_insertions(cost, travel, starts, ends, service,
+                                                      np.array(reduced_path), earliest, latest, node)
+                best = (added, source, insert_at) if insert_at >= 0 else None
+                other = best_position(node, skip=source)
+                if other is not None and (best is None or other[0] < best[0]):
+                    best = other
+                if best is None or best[0] >= removal_gain - 1e-9:
+                    position += 1
+                    continue
+
+                _, target, insert_at = best
+                routes[source] = reduced
+                routes[target].insert(insert_at, node)
+                loads[source] -= demands[node]
+                loads[target] += demands[node]
+                refresh(source)
+                if target != source:
+                    refresh(target)
+                budget.iterations += 1
+                improved = True
+
+        # Freed capacity or slack may now fit stops that were left out
+        for node in list(unassigned):
+            best = best_position(node)
+            if best is not None:
+                _, vehicle, position = best
+                routes[vehicle].insert(position, node)
+                loads[vehicle] += demands[node]
+                refresh(vehicle)
+                unassigned.remove(node)
+                improved = True
+
+    plan = []
+    for vehicle, route in enumerate(routes):
+        earliest, _ = slack[vehicle]
+        plan.append({
+            "vehicle_index": vehicle,
+            "stops": route,
+            "load": float(loads[vehicle]),
+            "distance": _route_length(cost, depot, route),
+            "service_starts": [float(t) for t in earliest[1:-1]],
+            "return_time": float(earliest[-1]) if route else 0.0
+        })
+    total_distance = sum(entry["distance"] for entry in plan)
+    served = [depot] + [node for route in routes for node in route]
+    return {
+        "routes": plan,
+        "unassigned": sorted(unassigned),
+        "total_distance": total_distance,
+        "stats": budget.report(total_distance, mst_lower_bound(cost, served))
+    }
+
+def _knapsack_greedy(items: List[Dict[str, float]], max_weight: float) -> List[Dict[str, float]]:
+    """
+    Takes items by decreasing value/weight ratio while they still fit.
     """
     items = sorted(items, key=lambda x: x['value'] / x['weight'], reverse=True)
     total_weight = 0
@@ -59,10 +690,193 @@ def knapsack_capacity(items: List[Dict[str, float]], max_weight: float) -> List[
 
     return selected_items
 
-def combine_orders(orders: List[Dict[str, float]], max_capacity: float) -> List[List[Dict[str, float]]]:
+def _knapsack_scale(weights: np.ndarray, max_weight: float) -> Tuple[np.ndarray, int]:
     """
-    Combines orders into optimal groups based on vehicle capacity.
-    Returns a list of order groups for efficient pickup.
+    Converts weights and capacity to integer units for the DP table.
+    Integral weights are used as-is when the table stays within its size limit; otherwise
+    weights are rounded up on a KNAPSACK_DP_RESOLUTION grid so that a selection
+    that fits in scaled units always fits in real units.
+    """
+    if np.all(weights == np.round(weights)) and max_weight * len(weights) <= KNAPSACK_DP_MAX_CELLS:
+        return weights.astype(np.int64), int(math.floor(max_weight))
+    units = KNAPSACK_DP_RESOLUTION / max_weight
+    return np.ceil(weights * units - 1e-9).astype(np.int64), KNAPSACK_DP_RESOLUTION
+
+def _knapsack_fractional_bound(items: List[Dict[str, float]], max_weight: float) -> float:
+    """
+    Value of the LP relaxation: items by decreasing value/weight ratio, with a
+    fraction of the first one that no longer fits. No load can be worth more.
+    """
+    bound, room = 0.0, max_weight
+    for item in sorted((item for item in items if item['value'] > 0),
+                       key=lambda x: x['value'] / x['weight'], reverse=True):
+        if item['weight'] <= room:
+            bound += item['value']
+            room -= item['weight']
+        else:
+            bound += item['value'] * room / item['weight']
+            break
+    return bound
+
+def _knapsack_dp(items: List[Dict[str, float]], max_weight: float,
+                 budget: Optional[SolverBudget] = None) -> List[Dict[str, float]]:
+    """
+    0/1 knapsack by dynamic programming over (integer-scaled) weight.
+    Keeps a single 1-D array of best values per capacity and a bit table of
+    decisions for reconstructing the selection. If the budget runs out, the
+    selection is optimal over the items processed so far and topped up greedily.
+    """
+    weights = np.array([item['weight'] for item in items], dtype=np.float64)
+    values = np.array([item['value'] for item in items], dtype=np.float64)
+    scaled, capacity = _knapsack_scale(weights, max_weight)
+
+    best = np.zeros(capacity + 1)
+    take = np.zeros((len(items), capacity + 1), dtype=bool)
+    processed = len(items)
+    for k in range(len(items)):
+        if budget is not None:
+            if budget.expired():
+                processed = k
+                break
+            budget.iterations += 1
+        w = scaled[k]
+        if w > capacity or values[k] <= 0:
+            continue
+        candidate = best[:capacity + 1 - w] + values[k]
+        improves = candidate > best[w:]
+        best[w:] = np.where(improves, candidate, best[w:])
+        take[k, w:] = improves
+
+    selected = []
+    remaining = capacity
+    for k in range(processed - 1, -1, -1):
+        if take[k, remaining]:
+            selected.append(k)
+            remaining -= scaled[k]
+    chosen = [items[k] for k in sorted(selected)]
+    if processed < len(items):
+        used = sum(item['weight'] for item in chosen)
+        chosen += _knapsack_greedy(items[processed:], max_weight - used)
+    return chosen
+
+def _knapsack_bnb(items: List[Dict[str, float]], max_weight: float,
+                  max_nodes: int = KNAPSACK_BNB_MAX_NODES,
+                  budget: Optional[SolverBudget] = None) -> List[Dict[str, float]]:
+    """
+    0/1 knapsack by depth-first branch-and-bound.
+    Items are explored by decreasing value/weight ratio and a branch is pruned when
+    its fractional (LP relaxation) bound cannot beat the best load found so far.
+    Stops after `max_nodes` nodes (or when the budget runs out) and returns the best load found.
+    """
+    order = sorted(range(len(items)), key=lambda k: items[k]['value'] / items[k]['weight'], reverse=True)
+    weights = [items[k]['weight'] for k in order]
+    values = [items[k]['value'] for k in order]
+    prefix_weight = np.concatenate(([0.0], np.cumsum(weights))).tolist()
+    prefix_value = np.concatenate(([0.0], np.cumsum(values))).tolist()
+    n = len(order)
+
+    def upper_bound(index: int, weight: float, value: float) -> float:
+        # Fill greedily from `index`, taking a fraction of the first item that does not fit
+        room = max_weight - weight
+        last = bisect_right(prefix_weight, prefix_weight[index] + room) - 1
+        bound = value + prefix_value[last] - prefix_value[index]
+        if last < n:
+            bound += (room - (prefix_weight[last] - prefix_weight[index])) * values[last] / weights[last]
+        return bound
+
+    # Start from the greedy solution as the incumbent
+    best_value, best_taken, weight = 0.0, [], 0.0
+    for position in range(n):
+        if weight + weights[position] <= max_weight:
+            weight += weights[position]
+            best_value += values[position]
+            best_taken.append(position)
+
+    stack = [(0, 0.0, 0.0, None)]  # (next position, weight, value, taken positions as a linked list)
+    nodes = 0
+    while stack and nodes < max_nodes:
+        if budget is not None and nodes % 1024 == 0 and budget.expired():
+            break
+        position, weight, value, taken = stack.pop()
+        nodes += 1
+        if value > best_value:
+            best_value, best_taken = value, taken
+        if position == n or upper_bound(position, weight, value) <= best_value + 1e-12:
+            continue
+        # Push the "skip" branch first so the "take" branch is explored next
+        stack.append((position + 1, weight, value, taken))
+        if weight + weights[position] <= max_weight:
+            stack.append((position + 1, weight + weights[position], value + values[position], (position, taken)))
+    if budget is not None:
+        budget.iterations += nodes
+
+    if isinstance(best_taken, list):
+        chosen = best_taken
+    else:
+        chosen = []
+        while best_taken is not None:
+            chosen.append(best_taken[0])
+            best_taken = best_taken[1]
+    return [items[k] for k in sorted(order[position] for position in chosen)]
+
+def select_knapsack_mode(item_count: int, max_weight: float, integral_weights: bool = False) -> str:
+    """
+    Picks the knapsack mode for a load of the given size.
+    Uses the exact DP when weights are whole units and the items x capacity table
+    is small enough, branch-and-bound (never worse than greedy) for moderate item
+    counts, and greedy otherwise.
+    """
+    if integral_weights and item_count * (int(max_weight) + 1) <= KNAPSACK_DP_MAX_CELLS:
+        return "dp"
+    if item_count <= KNAPSACK_BNB_MAX_ITEMS:
+        return "bnb"
+    return "greedy"
+
+def knapsack_capacity(items: List[Dict[str, float]], max_weight: float, mode: str = "greedy",
+                      time_limit_ms: Optional[int] = None, stats: Optional[dict] = None) -> List[Dict[str, float]]:
+    """
+    Uses the Knapsack algorithm to maximize load while staying within the capacity.
+    Modes: "greedy" (value/weight ratio), "dp" (exact on integer-scaled weights),
+    "bnb" (branch-and-bound with a fractional bound) and "auto" (picked by load size).
+    With `time_limit_ms`, dp and bnb return their best load when the budget runs out.
+    A `stats` dict is filled with the solver statistics (gap against the LP bound).
+    Returns the optimal selection of items.
+    """
+    if mode not in ("auto", "greedy", "dp", "bnb"):
+        raise ValueError(f"Unknown knapsack mode: {mode}")
+    budget = SolverBudget(time_limit_ms)
+    if max_weight <= 0:
+        selected = [item for item in items if item['weight'] <= 0]
+        if stats is not None:
+            value = sum(item['value'] for item in selected)
+            stats.update(budget.report(value, value, maximize=True))
+        return selected
+
+    # Weightless items always fit; the solvers only see the rest
+    free_items = [item for item in items if item['weight'] <= 0]
+    items = [item for item in items if item['weight'] > 0]
+
+    if mode == "auto":
+        integral = all(float(item['weight']).is_integer() for item in items)
+        mode = select_knapsack_mode(len(items), max_weight, integral)
+
+    if mode == "dp":
+        selected = _knapsack_dp(items, max_weight, budget=budget)
+    elif mode == "bnb":
+        selected = _knapsack_bnb(items, max_weight, budget=budget)
+    else:
+        selected = _knapsack_greedy(items, max_weight)
+        budget.iterations += len(items)
+
+    if stats is not None:
+        free_value = sum(item['value'] for item in free_items)
+        value = free_value + sum(item['value'] for item in selected)
+        stats.update(budget.report(value, free_value + _knapsack_fractional_bound(items, max_weight), maximize=True))
+    return free_items + selected
+
+def _sequential_groups(orders: List[Dict[str, float]], max_capacity: float) -> List[List[Dict[str, float]]]:
+    """
+    Walks the orders in input order and starts a new group whenever one overflows.
     """
     order_groups = []
     current_group = []
@@ -73,7 +887,8 @@ def combine_orders(orders: List[Dict[str, float]], max_capacity: float) -> List[
             current_group.append(order)
             current_weight += order['weight']
         else:
-            order_groups.append(current_group)
+            if current_group:
+                order_groups.append(current_group)
             current_group = [order]
             current_weight = order['weight']
 
@@ -82,11 +897,135 @@ def combine_orders(orders: List[Dict[str, float]], max_capacity: float) -> List[
 
     return order_groups
 
-def calculate_route_matrix(locations: List[Tuple[float, float]]) -> np.ndarray:
+def _first_fit_decreasing(orders: List[Dict[str, float]], max_capacity: float) -> List[List[Dict[str, float]]]:
+    """
+    First-fit decreasing bin packing.
+    A max-tree over the remaining capacity of every (possibly unopened) bin finds
+    the leftmost bin that still fits an order in O(log n).
+    """
+    size = 1
+    while size < max(len(orders), 1):
+        size *= 2
+    tree = [max_capacity] * (2 * size)
+    bins: List[List[Dict[str, float]]] = []
+    oversized = []
+
+    for order in sorted(orders, key=lambda o: o['weight'], reverse=True):
+        weight = order['weight']
+        if weight > max_capacity:
+            oversized.append([order])
+            continue
+        node = 1
+        while node < size:
+            node = 2 * node if tree[2 * node] >= weight else 2 * node + 1
+        index = node - size
+        if index == len(bins):
+            bins.append([])
+        bins[index].append(order)
+        tree[node] -= weight
+        node //= 2
+        while node:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+
+    return bins + oversized
+
+def _best_fit_decreasing(orders: List[Dict[str, float]], max_capacity: float) -> List[List[Dict[str, float]]]:
+    """
+    Best-fit decreasing bin packing.
+    Open bins are kept sorted by remaining capacity, so the tightest bin that
+    still fits an order is found by binary search.
+    """
+    bins: List[List[Dict[str, float]]] = []
+    open_bins: List[Tuple[float, int]] = []  # (remaining capacity, bin index)
+    oversized = []
+
+    for order in sorted(orders, key=lambda o: o['weight'], reverse=True):
+        weight = order['weight']
+        if weight > max_capacity:
+            oversized.append([order])
+            continue
+        position = bisect_left(open_bins, (weight, -1))
+        if position < len(open_bins):
+            remaining, index = open_bins.pop(position)
+        else:
+            remaining, index = max_capacity, len(bins)
+            bins.append([])
+        bins[index].append(order)
+        insort(open_bins, (remaining - weight, index))
+
+    return bins + oversized
+
+def _grid_cell(order: Dict[str, float], cell_size_km: float) -> Tuple[int, int]:
+    """
+    Grid cell of an order's pickup location; cells are roughly cell_size_km wide.
+    Orders without coordinates share a single cell ahead of all real ones.
+    """
+    latitude, longitude = order.get('latitude'), order.get('longitude')
+    if latitude is None or longitude is None:
+        return (-2 ** 31, -2 ** 31)
+    lat_step = cell_size_km / KM_PER_DEGREE
+    row = math.floor(latitude / lat_step)
+    row_latitude = math.radians((row + 0.5) * lat_step)
+    lon_step = lat_step / max(math.cos(row_latitude), 1e-6)
+    return row, math.floor(longitude / lon_step)
+
+def _group_count_bound(orders: List[Dict[str, float]], max_capacity: float) -> int:
+    """
+    Fewest groups any packing of the orders can use: total weight over capacity,
+    plus one group for every order heavier than the capacity.
+    """
+    oversized = sum(1 for order in orders if order['weight'] > max_capacity)
+    weight = sum(order['weight'] for order in orders if order['weight'] <= max_capacity)
+    return oversized + (math.ceil(weight / max_capacity - 1e-9) if weight > 0 else 0)
+
+def combine_orders(orders: List[Dict[str, float]], max_capacity: float, strategy: str = "sequential",
+                   cell_size_km: Optional[float] = None, time_limit_ms: Optional[int] = None,
+                   stats: Optional[dict] = None) -> List[List[Dict[str, float]]]:
+    """
+    Combines orders into optimal groups based on vehicle capacity.
+    Strategies: "sequential" (input order), "first_fit" and "best_fit" (decreasing weight).
+    With `cell_size_km`, orders are first split into grid cells over their
+    latitude/longitude and each cell is packed on its own, so every group stays local;
+    cells left when `time_limit_ms` runs out are packed sequentially.
+    A `stats` dict is filled with the solver statistics (gap against the weight bound).
+    Returns a list of order groups for efficient pickup.
+    """
+    packers = {
+        "sequential": _sequential_groups,
+        "first_fit": _first_fit_decreasing,
+        "best_fit": _best_fit_decreasing
+    }
+    if strategy not in packers:
+        raise ValueError(f"Unknown grouping strategy: {strategy}")
+    pack = packers[strategy]
+    budget = SolverBudget(time_limit_ms)
+
+    if not cell_size_km:
+        batches = [orders]
+    else:
+        cells: Dict[Tuple[int, int], List[Dict[str, float]]] = {}
+        for order in orders:
+            cells.setdefault(_grid_cell(order, cell_size_km), []).append(order)
+        batches = [cells[cell] for cell in sorted(cells)]
+
+    order_groups = []
+    bound = 0
+    for batch in batches:
+        packer = _sequential_groups if budget.expired() else pack
+        order_groups.extend(packer(batch, max_capacity))
+        budget.iterations += 1
+        if stats is not None:
+            bound += _group_count_bound(batch, max_capacity)
+
+    if stats is not None:
+        stats.update(budget.report(len(order_groups), bound))
+    return order_groups
+
+def calculate_route_matrix(locations: List[Tuple[float, float]], ellipsoidal: bool = False,
+                           dtype=np.float64) -> np.ndarray:
     """
     Creates a distance matrix between all locations.
-    Returns a 2D numpy array with pairwise distances.
+    Returns a 2D numpy array with pairwise great-circle distances in kilometers.
     """
-    coords = np.array(locations)
-    dist_matrix = cdist(coords, coords, metric='euclidean')
-    return dist_matrix
+    return haversine_matrix(locations, ellipsoidal=ellipsoidal, dtype=dtype)
@@ -0,0 +1,229 @@
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.order import Order, OrderStatus
+from app.models.address import Address
+from app.utils.config_loader import get_config
+from app.utils.geo_utils import EARTH_MEAN_RADIUS_KM, haversine_distances
+
+# Index configuration
+SPATIAL_INDEX_CELL_KM = float(get_config("SPATIAL_INDEX_CELL_KM", "2.0"))  # Grid cell edge length
+SPATIAL_INDEX_REFRESH_SECONDS = int(get_config("SPATIAL_INDEX_REFRESH_SECONDS", "300"))  # Full rebuild interval
+
+KM_PER_DEGREE_LAT = math.pi * EARTH_MEAN_RADIUS_KM / 180
+MAX_SEARCH_RADIUS_KM = math.pi * EARTH_MEAN_RADIUS_KM  # Half the circumference covers the globe
+
+# Orders that still need a pickup and are therefore indexed
+INDEXED_ORDER_STATUSES = (OrderStatus.PENDING, OrderStatus.ASSIGNED)
+
+Cell = Tuple[int, int]
+
+class SpatialIndex:
+    """
+    Uniform lat/lon grid over points identified by an integer ID.
+    Inserts and removals touch a single bucket; radius queries only look at the
+    buckets overlapping the search circle's bounding box, and k-nearest queries
+    grow the search radius until k points are found.
+    """
+    def __init__(self, cell_size_km: float = SPATIAL_INDEX_CELL_KM):
+        self.cell_deg = cell_size_km / KM_PER_DEGREE_LAT
+        self._buckets: Dict[Cell, Dict[int, Tuple[float, float]]] = {}
+        self._cells: Dict[int, Cell] = {}  # point ID -> bucket
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._cells
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    def insert(self, item_id: int, lat: float, lon: float):
+        """
+        Add a point, or move it if the ID is already indexed.
+        """
+        self.remove(item_id)
+        cell = self._cell(lat, lon)
+        self._buckets.setdefault(cell, {})[item_id] = (lat, lon)
+        self._cells[item_id] = cell
+
+    def remove(self, item_id: int) -> bool:
+        """
+        Drop a point. Returns False if it was not indexed.
+        """
+        cell = self._cells.pop(item_id, None)
+        if cell is None:
+            return False
+        bucket = self._buckets[cell]
+        del bucket[item_id]
+        if not bucket:
+            del self._buckets[cell]
+        return True
+
+    def location(self, item_id: int) -> Optional[Tuple[float, float]]:
+        cell = self._cells.get(item_id)
+        return self._buckets[cell][item_id] if cell is not None else None
+
+    def clear(self):
+        self._buckets.clear()
+        self._cells.clear()
+
+    def _candidate_buckets(self, lat: float, lon: float, radius_km: float) -> Iterable[Dict[int, Tuple[float, float]]]:
+        """
+        Buckets that may hold points within radius_km of (lat, lon).
+        """
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        lat_min, lat_max = lat - lat_span, lat + lat_span
+        widest = max(abs(lat_min), abs(lat_max))
+        if widest >= 90:
+            return self._buckets.values()
+        lon_span = lat_span / math.cos(math.radians(widest))
+        lon_min, lon_max = lon - lon_span, lon + lon_span
+        if lon_min < -180 or lon_max > 180:
+            return self._buckets.values()
+
+        row_min, col_min = self._cell(lat_min, lon_min)
+        row_max, col_max = self._cell(lat_max, lon_max)
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(self._buckets):
+            # Scanning the occupied buckets is cheaper than walking the whole box
+            return [bucket for (row, col), bucket in self._buckets.items()
+                    if row_min <= row <= row_max and col_min <= col <= col_max]
+        buckets = []
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                bucket = self._buckets.get((row, col))
+                if bucket:
+                    buckets.append(bucket)
+        return buckets
+
+    def radius(self, lat: float, lon: float, radius_km: float, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Points within radius_km of (lat, lon), nearest first.
+        Returns (point ID, distance in km) pairs.
+        """
+        ids, lats, lons = [], [], []
+        for bucket in self._candidate_buckets(lat, lon, radius_km):
+            for item_id, (item_lat, item_lon) in bucket.items():
+                ids.append(item_id)
+                lats.append(item_lat)
+                lons.append(item_lon)
+        if not ids:
+            return []
+
+        distances = haversine_distances(lat, lon, np.array(lats), np.array(lons))
+        inside = np.flatnonzero(distances <= radius_km)
+        order = inside[np.argsort(distances[inside], kind="stable")]
+        if limit is not None:
+            order = order[:limit]
+        return [(ids[i], float(distances[i])) for i in order]
+
+    def knn(self, lat: float, lon: float, k: int) -> List[Tuple[int, float]]:
+        """
+        The k points nearest to (lat, lon), nearest first.
+        Returns (point ID, distance in km) pairs.
+        """
+        if k <= 0 or not self._cells:
+            return []
+        search_km = self.cell_deg * KM_PER_DEGREE_LAT
+        while True:
+            found = self.radius(lat, lon, search_km, limit=k)
+            if len(found) >= k or search_km >= MAX_SEARCH_RADIUS_KM:
+                return found
+            search_km = min(search_km * 2, MAX_SEARCH_RADIUS_KM)
+
+class OrderSpatialIndex:
+    """
+    Pickup locations of open orders, kept in one grid per indexed status.
+    The index is built lazily from the database, updated in place by the order
+    services on status changes, and fully rebuilt every SPATIAL_INDEX_REFRESH_SECONDS
+    to pick up changes made by other processes.
+    """
+    def __init__(self, cell_size_km: float = SPATIAL_INDEX_CELL_KM,
+                 refresh_seconds: int = SPATIAL_INDEX_REFRESH_SECONDS):
+        self.cell_size_km = cell_size_km
+        self.refresh_seconds = refresh_seconds
+        self._indexes = {order_status: SpatialIndex(cell_size_km) for order_status in INDEXED_ORDER_STATUSES}
+        self._built_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    def rebuild(self, db: Session):
+        """
+        Reload every open order with its address coordinates in one query.
+        """
+        rows = db.query(Order.id, Order.status, Address.latitude, Address.longitude) \
+            .join(Address, Order.address_id == Address.id) \
+            .filter(Order.status.in_(INDEXED_ORDER_STATUSES)) \
+            .all()
+        indexes = {order_status: SpatialIndex(self.cell_size_km) for order_status in INDEXED_ORDER_STATUSES}
+        for order_id, order_status, latitude, longitude in rows:
+            if latitude is not None and longitude is not None:
+                indexes[order_status].insert(order_id, latitude, longitude)
+        with self._lock:
+            self._indexes = indexes
+            self._built_at = time.monotonic()
+
+    def ensure_built(self, db: Session):
+        if self._built_at is None or time.monotonic() - self._built_at > self.refresh_seconds:
+            self.rebuild(db)
+
+    def sync_order(self, order: Order):
+        """
+        Reflect an order's current status and address in the index.
+        Does nothing until the index has been built; the first query loads it.
+        """
+        if self._built_at is None:
+            return
+        with self._lock:
+            for index in self._indexes.values():
+                index.remove(order.id)
+            address = order.address
+            if order.status in self._indexes and address is not None:
+                self._indexes[order.status].insert(order.id, address.latitude, address.longitude)
+
+    def invalidate(self):
+        with self._lock:
+            self._built_at = None
+
+    def _query(self, statuses: Optional[List[OrderStatus]], search) -> List[dict]:
+        statuses = [OrderStatus(order_status) for order_status in statuses] if statuses else list(INDEXED_ORDER_STATUSES)
+        results = []
+        with self._lock:
+            for order_status in statuses:
+                index = self._indexes.get(order_status)
+                if index is None:
+                    continue
+                for order_id, distance in search(index):
+                    latitude, longitude = index.location(order_id)
+                    results.append({
+                        "order_id": order_id,
+                        "status": order_status.value,
+                        "latitude": latitude,
+                        "longitude": longitude,
+                        "distance_km": distance
+                    })
+        results.sort(key=lambda result: result["distance_km"])
+        return results
+
+    def nearby(self, db: Session, lat: float, lon: float, radius_km: float,
+               statuses: Optional[List[OrderStatus]] = None, limit: Optional[int] = None) -> List[dict]:
+        """
+        Open orders within radius_km of a point, nearest first.
+        """
+        self.ensure_built(db)
+        results = self._query(statuses, lambda index: index.radius(lat, lon, radius_km, limit))
+        return results[:limit] if limit is not None else results
+
+    def nearest(self, db: Session, lat: float, lon: float, k: int,
+                statuses: Optional[List[OrderStatus]] = None) -> List[dict]:
+        """
+        The k open orders closest to a point, nearest first.
+        """
+        self.ensure_built(db)
+        return self._query(statuses, lambda index: index.knn(lat, lon, k))[:k]
+
+# Shared index of open orders
+order_spatial_index = OrderSpatialIndex()
@@ -0,0 +1,57 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+# Pickup clusters (lat, lon, spread in degrees) around the two main service areas
+CITY_CLUSTERS = {
+    "riyadh": [
+        (24.7136, 46.6753, 0.05),  # Olaya
+        (24.7743, 46.7386, 0.04),  # King Abdullah Financial District
+        (24.6333, 46.7167, 0.06),  # Al Aziziyah
+        (24.5670, 46.8520, 0.05),  # Second Industrial City
+        (24.8300, 46.6200, 0.04)   # Al Malqa
+    ],
+    "jeddah": [
+        (21.5433, 39.1728, 0.04),  # Al Balad
+        (21.6100, 39.1100, 0.04),  # Al Rawdah
+        (21.4250, 39.2200, 0.05),  # Industrial City
+        (21.7000, 39.1200, 0.03)   # Obhur
+    ]
+}
+
+# Problem sizes covered by the suite
+DATASET_SIZES = (10, 100, 1000, 5000)
+
+def clustered_pickups(n: int, seed: int = 0, cities: Tuple[str, ...] = ("riyadh", "jeddah")) -> List[Tuple[float, float]]:
+    """
+    n pickup locations drawn around the city clusters (Gaussian spread), with
+    about two thirds of them in Riyadh. The same seed always gives the same points.
+    """
+    rng = np.random.default_rng(seed)
+    centers = [center for city in cities for center in CITY_CLUSTERS[city]]
+    weights = np.array([2.0 if city == "riyadh" else 1.0
+                        for city in cities for _ in CITY_CLUSTERS[city]])
+    picks = rng.choice(len(centers), size=n, p=weights / weights.sum())
+    points = []
+    for pick in picks:
+        lat, lon, spread = centers[pick]
+        points.append((float(lat + rng.normal(0, spread)), float(lon + rng.normal(0, spread))))
+    return points
+
+def pickup_orders(n: int, seed: int = 0) -> List[Dict[str, float]]:
+    """
+    Orders for grouping benchmarks: clustered pickups with a tire weight of 5-120 kg.
+    """
+    rng = np.random.default_rng(seed + 1)
+    return [
+        {"order_id": float(i), "latitude": lat, "longitude": lon, "weight": float(rng.uniform(5, 120))}
+        for i, (lat, lon) in enumerate(clustered_pickups(n, seed))
+    ]
+
+def load_items(n: int, seed: int = 0) -> List[Dict[str, float]]:
+    """
+    Items for load benchmarks, with values loosely correlated to their weight.
+    """
+    rng = np.random.default_rng(seed + 2)
+    weights = rng.uniform(5, 120, n)
+    values = weights * rng.uniform(0.5, 1.5, n)
+    return [{"weight": float(weight), "value": float(value)} for weight, value in zip(weights, values)]
@@ -0,0 +1,200 @@
+"""
+Micro-benchmarks for the routing and optimization utilities.
+
+Runs every case over seeded, clustered pickups around Riyadh and Jeddah and
+records wall time (best of --repeat runs), peak traced memory and solution
+quality. Results are written to JSON; pass a previous results file as
+--baseline to compare quality (and time) against it.
+
+    python -m benchmarks.routing --sizes 10 100 1000 --output benchmark_results.json
+    python -m benchmarks.routing --baseline benchmarks/baseline.json
+
+Everything runs offline: the Google Maps client is disabled before the app
+modules are imported and patched out while the cases run.
+"""
+import os
+
+# Never talk to Google from a benchmark run (load_dotenv does not override this)
+os.environ["GOOGLE_MAPS_API_KEY"] = ""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+import numpy as np
+from app.utils import geo_utils
+from app.utils.geo_utils import calculate_distance, calculate_distances, path_distance
+from app.utils.routing import (
+    a_star_algorithm,
+    optimize_tour,
+    knapsack_capacity,
+    combine_orders,
+    calculate_route_matrix
+)
+from benchmarks.datasets import DATASET_SIZES, clustered_pickups, pickup_orders, load_items
+
+# Relative quality loss against the baseline that counts as a regression
+QUALITY_TOLERANCE = 0.01
+
+class BenchmarkCase:
+    """
+    One benchmarked call: `setup(n, seed)` builds the input outside the timed
+    region, `run(data)` is timed, and `quality(data, result)` scores the result.
+    """
+    def __init__(self, name: str, setup: Callable, run: Callable, quality: Callable,
+                 unit: str, higher_is_better: bool = False, max_n: Optional[int] = None):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.quality = quality
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+        self.max_n = max_n
+
+def _legs(n: int, seed: int) -> np.ndarray:
+    points = np.array(clustered_pickups(n, seed))
+    return np.stack([points[:-1], points[1:]], axis=1)
+
+def _sum_of_distances(method: str) -> Callable:
+    def run(legs: np.ndarray) -> float:
+        return sum(calculate_distance(a[0], a[1], b[0], b[1], method=method) for a, b in legs)
+    return run
+
+def _knapsack_setup(n: int, seed: int) -> dict:
+    items = load_items(n, seed)
+    return {"items": items, "max_weight": 0.3 * sum(item["weight"] for item in items)}
+
+CASES = [
+    BenchmarkCase("calculate_distance[geodesic]", _legs, _sum_of_distances("geodesic"),
+                  lambda legs, total: total, "km"),
+    BenchmarkCase("calculate_distance[haversine]", _legs, _sum_of_distances("haversine"),
+                  lambda legs, total: total, "km"),
+    BenchmarkCase("calculate_distances[vincenty]", _legs,
+                  lambda legs: calculate_distances(legs[:, 0], legs[:, 1], method="vincenty"),
+                  lambda legs, distances: float(distances.sum()), "km"),
+    BenchmarkCase("calculate_route_matrix", clustered_pickups, calculate_route_matrix,
+                  lambda points, matrix: float(matrix.sum()), "km"),
+    BenchmarkCase("a_star_algorithm", clustered_pickups, a_star_algorithm,
+                  lambda points, path: path_distance([points[i] for i in path]), "km"),
+    BenchmarkCase("optimize_tour", clustered_pickups, optimize_tour,
+                  lambda points, tour: path_distance([points[i] for i in tour]), "km", max_n=1000),
+    BenchmarkCase("combine_orders[best_fit]", pickup_orders,
+                  lambda orders: combine_orders(orders, 500, strategy="best_fit", cell_size_km=5),
+                  lambda orders, groups: float(len(groups)), "groups"),
+    BenchmarkCase("knapsack_capacity[auto]", _knapsack_setup,
+                  lambda data: knapsack_capacity(data["items"], data["max_weight"], mode="auto"),
+                  lambda data, load: sum(item["value"] for item in load), "value", higher_is_better=True)
+]
+
+def measure(case: BenchmarkCase, n: int, seed: int, repeat: int) -> dict:
+    """
+    Best wall time over `repeat` runs, then one traced run for the memory peak.
+    """
+    data = case.setup(n, seed)
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = case.run(data)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        case.run(data)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "case": case.name,
+        "n": n,
+        "wall_ms": min(timings),
+        "mean_ms": sum(timings) / len(timings),
+        "peak_kib": peak_bytes / 1024,
+        "quality": case.quality(data, result),
+        "quality_unit": case.unit
+    }
+
+def compare(results: List[dict], baseline: dict) -> List[dict]:
+    """
+    Annotate results with their ratio to the matching baseline entry and flag
+    quality regressions beyond QUALITY_TOLERANCE.
+    """
+    reference = {(entry["case"], entry["n"]): entry for entry in baseline.get("results", [])}
+    higher_is_better = {case.name: case.higher_is_better for case in CASES}
+    for result in results:
+        entry = reference.get((result["case"], result["n"]))
+        if entry is None:
+            continue
+        result["baseline_quality"] = entry["quality"]
+        result["baseline_wall_ms"] = entry["wall_ms"]
+        result["time_ratio"] = result["wall_ms"] / entry["wall_ms"] if entry["wall_ms"] else None
+        if entry["quality"]:
+            ratio = result["quality"] / entry["quality"]
+            result["quality_ratio"] = ratio
+            loss = 1 - ratio if higher_is_better[result["case"]] else ratio - 1
+            result["regressed"] = loss > QUALITY_TOLERANCE
+    return results
+
+def run_suite(sizes: List[int], case_names: Optional[List[str]] = None, seed: int = 0, repeat: int = 3) -> dict:
+    """
+    Run the selected cases at every size (skipping sizes above a case's max_n).
+    """
+    selected = [case for case in CASES if not case_names or case.name in case_names]
+    results = []
+    with mock.patch.object(geo_utils, "gmaps", None):
+        for n in sizes:
+            for case in selected:
+                if case.max_n is not None and n > case.max_n:
+                    continue
+                result = measure(case, n, seed, repeat)
+                results.append(result)
+                print(f"{case.name:32} n={n:<5} {result['wall_ms']:10.2f} ms "
+                      f"{result['peak_kib']:10.1f} KiB  {result['quality']:.3f} {case.unit}", flush=True)
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the routing and optimization utilities.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DATASET_SIZES))
+    parser.add_argument("--cases", nargs="+", choices=[case.name for case in CASES])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.cases, seed=args.seed, repeat=args.repeat)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("seed") != args.seed:
+            print(f"Warning: baseline was recorded with seed {baseline.get('seed')}, not {args.seed}")
+        compare(report["results"], baseline)
+        report["baseline"] = args.baseline
+        regressions = [result for result in report["results"] if result.get("regressed")]
+        for result in regressions:
+            print(f"REGRESSION {result['case']} n={result['n']}: quality {result['quality']:.3f} "
+                  f"vs baseline {result['baseline_quality']:.3f} {result['quality_unit']}")
+
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())